@@ -0,0 +1,238 @@
+import random
+from io import BytesIO
+
+import pandas as pd
+from PIL import Image, ImageDraw
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import (
+    SimpleDocTemplate,
+    Paragraph,
+    Table,
+    TableStyle,
+    PageBreak,
+)
+
+from services.accounting_dictionary import ACCOUNTING_KEYWORDS
+from services.banking_service import analyze_banking
+from services.wc_service import calculate_wc_logic
+
+
+# ==========================================================
+# DETERMINISTIC SYNTHETIC DOCUMENTS
+# Every generator takes a seed; the same arguments always
+# produce byte-identical output, so timings are comparable
+# across runs and machines.
+# ==========================================================
+
+GRID = TableStyle([("GRID", (0, 0), (-1, -1), 0.5, "black")])
+
+NARRATIONS = [
+    "UPI/PHONEPE/{ref}/GROCERY",
+    "NEFT CR FROM ACME PVT LTD {ref}",
+    "SALARY CREDIT ACME {ref}",
+    "ATM WDL {ref}",
+    "EMI HOME LOAN {ref}",
+    "NACH DR BAJAJ FINANCE {ref}",
+    "CASH DEPOSIT BRANCH {ref}",
+    "POS AMAZON {ref}",
+    "CHEQUE RETURN {ref}",
+    "IMPS P2A {ref}",
+]
+
+# Line items that land on the WC required fields
+STATEMENT_LINES = [
+    ("Inventories", 125000),
+    ("Trade receivables", 80000),
+    ("Cash and cash equivalents", 15000),
+    ("Short-term loans and advances", 9000),
+    ("Other current assets", 4000),
+    ("Trade payables", 60000),
+    ("Short-term borrowings", 30000),
+    ("Other current liabilities", 7000),
+    ("Short-term provisions", 2500),
+    ("Equity share capital", 50000),
+    ("Reserves and surplus", 65000),
+    ("Long-term borrowings", 40000),
+    ("Revenue from operations", 900000),
+    ("Other income", 12000),
+    ("Other expenses", 610000),
+    ("Finance costs", 3200),
+    ("Depreciation and amortisation expense", 8000),
+    ("Current tax", 21000),
+]
+
+
+def _date(i: int) -> str:
+    day = (i % 28) + 1
+    month = (i // 28) % 12 + 1
+    year = 22 + (i // (28 * 12)) % 3
+    return f"{day:02d}/{month:02d}/{year:02d}"
+
+
+# ==========================================================
+# BANKING
+# ==========================================================
+
+def transactions(count: int, seed: int = 0) -> list:
+    """Transaction dicts in the shape parse_banking_file returns."""
+    rnd = random.Random(seed)
+    balance = 50000.0
+    out = []
+
+    for i in range(count):
+        amount = round(rnd.uniform(100, 25000), 2)
+        is_credit = rnd.random() < 0.4
+        balance += amount if is_credit else -amount
+
+        out.append({
+            "date": _date(i),
+            "description": rnd.choice(NARRATIONS).format(ref=rnd.randint(10000, 99999)),
+            "credit": amount if is_credit else 0,
+            "debit": 0 if is_credit else amount,
+            "balance": round(balance, 2),
+        })
+
+    return out
+
+
+def bank_statement_pdf(pages: int, txns_per_page: int = 25, seed: int = 0) -> bytes:
+    """Ruled-table statement: Date | Narration | Amount | Dr/Cr | Balance."""
+    txns = transactions(pages * txns_per_page, seed)
+    elements = []
+
+    for p in range(pages):
+        rows = [["Date", "Narration", "Amount", "Type", "Balance"]]
+        for t in txns[p * txns_per_page:(p + 1) * txns_per_page]:
+            amount = t["credit"] or t["debit"]
+            rows.append([
+                t["date"],
+                t["description"][:32],
+                f"{amount:,.2f}",
+                "Cr" if t["credit"] else "Dr",
+                f"{t['balance']:.2f}",
+            ])
+        elements.append(Table(rows, style=GRID))
+        elements.append(PageBreak())
+
+    buf = BytesIO()
+    SimpleDocTemplate(buf, pagesize=A4, invariant=1).build(elements)
+    return buf.getvalue()
+
+
+# ==========================================================
+# FINANCIAL STATEMENTS
+# ==========================================================
+
+def _statement_rows(seed: int) -> list:
+    rnd = random.Random(seed)
+    rows = [["Particulars", "Note", "2024", "2023"]]
+    for i, (label, base) in enumerate(STATEMENT_LINES, start=1):
+        latest = int(base * rnd.uniform(0.9, 1.1))
+        prior = int(latest * rnd.uniform(0.8, 1.0))
+        rows.append([label, str(i), str(latest), str(prior)])
+    return rows
+
+
+def financial_statement_pdf(note_pages: int = 0, seed: int = 0) -> bytes:
+    """Balance sheet + P&L table on page 1, followed by filler notes pages."""
+    styles = getSampleStyleSheet()
+    rnd = random.Random(seed)
+
+    elements = [
+        Paragraph("Balance Sheet and Statement of Profit and Loss (Rs. in thousands)", styles["Normal"]),
+        Table(_statement_rows(seed), style=GRID),
+    ]
+
+    for n in range(note_pages):
+        elements.append(PageBreak())
+        elements.append(Paragraph(f"Note {n + 1} - Significant accounting policies", styles["Heading2"]))
+        for _ in range(30):
+            elements.append(Paragraph(
+                " ".join(rnd.choice(["the", "company", "policy", "basis", "revenue", "recognised",
+                                     "measured", "fair", "value", "asset"]) for _ in range(14)),
+                styles["Normal"],
+            ))
+
+    buf = BytesIO()
+    SimpleDocTemplate(buf, pagesize=A4, invariant=1).build(elements)
+    return buf.getvalue()
+
+
+def trial_balance_rows(rows: int, seed: int = 0) -> list:
+    """Trial-balance style rows; roughly one in ten hits a dictionary keyword."""
+    rnd = random.Random(seed)
+    keywords = [kw for kws in ACCOUNTING_KEYWORDS.values() for kw in kws]
+    filler = ["misc expenses", "travel", "party a/c", "office rent", "staff welfare", "printing"]
+
+    out = [["Particulars", "2024", "2023"]]
+    for i in range(rows):
+        label = rnd.choice(keywords) if rnd.random() < 0.1 else rnd.choice(filler)
+        out.append([f"Ledger {i} {label}", rnd.randint(100, 999999), rnd.randint(100, 999999)])
+    return out
+
+
+def financial_excel(rows: int, extra_sheets: int = 2, seed: int = 0) -> bytes:
+    buf = BytesIO()
+    with pd.ExcelWriter(buf, engine="openpyxl") as writer:
+        for s in range(extra_sheets):
+            pd.DataFrame([["Cover sheet", s], ["Prepared by", "Accounts"]]).to_excel(
+                writer, sheet_name=f"Cover{s}", header=False, index=False
+            )
+        pd.DataFrame(trial_balance_rows(rows, seed)).to_excel(
+            writer, sheet_name="Trial Balance", header=False, index=False
+        )
+    return buf.getvalue()
+
+
+def financial_csv(rows: int, seed: int = 0) -> bytes:
+    return pd.DataFrame(trial_balance_rows(rows, seed)).to_csv(header=False, index=False).encode()
+
+
+def scanned_statement_png(seed: int = 0, scale: int = 1) -> bytes:
+    """Statement lines drawn onto a white page, standing in for a phone scan."""
+    width, height = 1240 * scale, 1754 * scale
+    img = Image.new("L", (width, height), 255)
+    draw = ImageDraw.Draw(img)
+
+    y = 60 * scale
+    draw.text((60 * scale, y), "Balance Sheet (Rs. in thousands)", fill=0)
+    for label, _n, latest, prior in _statement_rows(seed)[1:]:
+        y += 40 * scale
+        draw.text((60 * scale, y), f"{label}    {latest}    {prior}", fill=0)
+
+    buf = BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+# ==========================================================
+# CALCULATION INPUTS
+# ==========================================================
+
+def wc_inputs(seed: int = 0) -> dict:
+    rnd = random.Random(seed)
+    inputs = {
+        "inventory": rnd.randint(50000, 200000),
+        "receivables": rnd.randint(50000, 200000),
+        "payables": rnd.randint(20000, 100000),
+        "cash_bank": rnd.randint(1000, 50000),
+        "bank_credit": rnd.randint(10000, 80000),
+        "annual_sales": rnd.randint(500000, 2000000),
+    }
+    return {"inputs": inputs, "calculations": {"networth": 150000, "total_debt": 90000}}
+
+
+def cam_report(seed: int = 0) -> dict:
+    """Dict in the shape download_pdf passes to generate_cam_pdf."""
+    return {
+        "customer_name": "Benchmark Traders",
+        "loan_amount": 2500000,
+        "status": "Draft",
+        "wc_data": calculate_wc_logic(wc_inputs(seed)),
+        "banking_data": analyze_banking(transactions(500, seed)),
+        "agri_data": {},
+        "credit_grade": "B",
+        "recommended_limit": 2000000,
+        "remarks": "Synthetic benchmark report",
+    }
@@ -0,0 +1,234 @@
+"""
+Benchmark runner for the parsing and analysis entry points.
+
+    python -m benchmarks.run                      # small + medium
+    python -m benchmarks.run --sizes large --only banking
+    python -m benchmarks.run --save-baseline      # record current timings
+    python -m benchmarks.run --tolerance 0.2      # fail on >20% slowdown
+
+Every repetition runs in a fresh forked child, so in-process memo
+caches start cold each time and peak RSS is measured per case. When a
+baseline JSON exists, cases slower than baseline by more than the
+tolerance are reported and the exit code is 1.
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import resource
+import shutil
+import statistics
+import sys
+import time
+
+from benchmarks import generators as gen
+from services.banking_parser import parse_banking_file
+from services.banking_service import analyze_banking
+from services.pdf_generator import generate_cam_pdf
+from services.wc_parser import parse_financial_file
+from services.wc_service import calculate_wc_logic
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# (pages, txns per page) / rows / transactions per size
+SIZES = {
+    "small": {"pages": 2, "txns": 1000, "rows": 200, "notes": 2},
+    "medium": {"pages": 20, "txns": 50000, "rows": 2000, "notes": 20},
+    "large": {"pages": 200, "txns": 1000000, "rows": 20000, "notes": 150},
+}
+
+
+# ==========================================================
+# CASES
+# Each case: name -> (setup(size) -> (args, units, unit_name), fn)
+# setup runs in the parent; only fn is timed.
+# ==========================================================
+
+def _generate_cam(data):
+    path = generate_cam_pdf(data, f"bench_cam_{os.getpid()}.pdf")
+    os.remove(path)
+
+
+CASES = {
+    "parse_banking_file[pdf]": (
+        lambda s: ((gen.bank_statement_pdf(s["pages"]),), s["pages"], "pages"),
+        parse_banking_file,
+    ),
+    "parse_financial_file[pdf]": (
+        lambda s: ((gen.financial_statement_pdf(s["notes"]), "fs.pdf"), s["notes"] + 1, "pages"),
+        parse_financial_file,
+    ),
+    "parse_financial_file[xlsx]": (
+        lambda s: ((gen.financial_excel(s["rows"]), "tb.xlsx"), s["rows"], "rows"),
+        parse_financial_file,
+    ),
+    "parse_financial_file[csv]": (
+        lambda s: ((gen.financial_csv(s["rows"]), "tb.csv"), s["rows"], "rows"),
+        parse_financial_file,
+    ),
+    "parse_financial_file[png]": (
+        lambda s: ((gen.scanned_statement_png(), "scan.png"), 1, "images"),
+        parse_financial_file,
+    ),
+    "analyze_banking": (
+        lambda s: ((gen.transactions(s["txns"]),), s["txns"], "txns"),
+        analyze_banking,
+    ),
+    "calculate_wc_logic": (
+        lambda s: ((gen.wc_inputs(),), 1, "calls"),
+        calculate_wc_logic,
+    ),
+    "generate_cam_pdf": (
+        lambda s: ((gen.cam_report(),), 1, "reports"),
+        _generate_cam,
+    ),
+}
+
+# Cases that need binaries not always installed
+REQUIRES = {
+    "parse_financial_file[png]": "tesseract",
+}
+
+
+# ==========================================================
+# MEASUREMENT
+# ==========================================================
+
+def _child(conn, fn, args):
+    try:
+        start = time.perf_counter()
+        fn(*args)
+        seconds = time.perf_counter() - start
+        # ru_maxrss is KiB on Linux
+        peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        conn.send({"seconds": seconds, "peak_rss_mb": peak_mb})
+    except Exception as e:
+        conn.send({"error": f"{type(e).__name__}: {e}"})
+    finally:
+        conn.close()
+
+
+def measure(fn, args, repeat):
+    ctx = mp.get_context("fork")
+    times = []
+    peak_mb = 0.0
+
+    for _ in range(repeat):
+        parent, child = ctx.Pipe(duplex=False)
+        proc = ctx.Process(target=_child, args=(child, fn, args))
+        proc.start()
+        child.close()
+        result = parent.recv()
+        proc.join()
+
+        if "error" in result:
+            return result
+
+        times.append(result["seconds"])
+        peak_mb = max(peak_mb, result["peak_rss_mb"])
+
+    return {"times": times, "peak_rss_mb": round(peak_mb, 1)}
+
+
+def run(sizes, only, repeat):
+    results = {}
+
+    for size in sizes:
+        for name, (setup, fn) in CASES.items():
+            if only and only not in name:
+                continue
+
+            key = f"{name}@{size}"
+            binary = REQUIRES.get(name)
+            if binary and not shutil.which(binary):
+                print(f"{key:<42} skipped ({binary} not installed)")
+                continue
+
+            args, units, unit_name = setup(SIZES[size])
+            m = measure(fn, args, repeat)
+
+            if "error" in m:
+                print(f"{key:<42} ERROR {m['error']}")
+                continue
+
+            seconds = statistics.median(m["times"])
+            results[key] = {
+                "seconds": round(seconds, 4),
+                "throughput": round(units / seconds, 2) if seconds else None,
+                "unit": f"{unit_name}/s",
+                "peak_rss_mb": m["peak_rss_mb"],
+            }
+            r = results[key]
+            print(f"{key:<42} {r['seconds']:>9.4f}s {r['throughput']:>12} {r['unit']:<10} {r['peak_rss_mb']:>8} MB")
+
+    return results
+
+
+# ==========================================================
+# BASELINE COMPARISON
+# ==========================================================
+
+def compare(results, baseline, tolerance):
+    regressions = []
+
+    for key, r in results.items():
+        base = baseline.get(key)
+        if not base or not base.get("seconds"):
+            continue
+        change = r["seconds"] / base["seconds"] - 1
+        if change > tolerance:
+            regressions.append((key, base["seconds"], r["seconds"], change))
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Credit engine benchmarks")
+    parser.add_argument("--sizes", default="small,medium", help="comma list of: " + ",".join(SIZES))
+    parser.add_argument("--only", default="", help="run cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--output", help="write this run's results to a JSON file")
+    opts = parser.parse_args(argv)
+
+    sizes = [s.strip() for s in opts.sizes.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"unknown size(s): {', '.join(unknown)}")
+
+    results = run(sizes, opts.only, opts.repeat)
+
+    if opts.output:
+        with open(opts.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if opts.save_baseline:
+        baseline = {}
+        if os.path.exists(opts.baseline):
+            with open(opts.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(opts.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {opts.baseline}")
+        return 0
+
+    if not os.path.exists(opts.baseline):
+        print("No baseline found; run with --save-baseline to record one.")
+        return 0
+
+    with open(opts.baseline) as f:
+        baseline = json.load(f)
+
+    regressions = compare(results, baseline, opts.tolerance)
+
+    for key, before, after, change in regressions:
+        print(f"REGRESSION {key}: {before:.4f}s -> {after:.4f}s (+{change:.0%})")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
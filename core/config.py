@@ -1,6 +1,179 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+
+# =======================================================
+# ASYNC DATABASE POOL (CAM routes)
+# DB_POOL_SIZE             persistent connections
+# DB_MAX_OVERFLOW          extra connections under burst
+# DB_POOL_TIMEOUT          seconds to wait for a connection
+# DB_STATEMENT_TIMEOUT_MS  per-statement limit on PostgreSQL
+#                          (0 disables it)
+# =======================================================
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "15000"))
+
+# =======================================================
+# PARSER PROCESS POOL
+# PARSER_POOL_SIZE     worker processes (default: CPU count)
+# PARSER_TASK_TIMEOUT  seconds a single parse may run
+# =======================================================
+
+PARSER_POOL_SIZE = int(os.getenv("PARSER_POOL_SIZE", "0")) or (os.cpu_count() or 1)
+
+PARSER_TASK_TIMEOUT = float(os.getenv("PARSER_TASK_TIMEOUT", "90"))
+
+# =======================================================
+# BACKGROUND PARSE JOBS
+# JOB_WORKERS       concurrent jobs (default: pool size)
+# JOB_TASK_TIMEOUT  seconds a single job may run
+# JOB_HEARTBEAT_INTERVAL  seconds between heartbeats on running jobs
+# JOB_STALE_AFTER   seconds without a heartbeat before another
+#                   instance may requeue a running job
+# =======================================================
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "0")) or PARSER_POOL_SIZE
+
+JOB_TASK_TIMEOUT = float(os.getenv("JOB_TASK_TIMEOUT", "900"))
+
+JOB_HEARTBEAT_INTERVAL = float(os.getenv("JOB_HEARTBEAT_INTERVAL", "15"))
+
+JOB_STALE_AFTER = float(os.getenv("JOB_STALE_AFTER", "60"))
+
+# =======================================================
+# UPLOAD STAGING
+# Uploads up to UPLOAD_SPOOL_MB stay in memory; larger ones
+# are streamed to UPLOAD_DIR and handed to parser workers
+# by path (point it at /dev/shm to keep the staged files in
+# RAM on hosts where /tmp is a disk).
+# MAX_UPLOAD_MB   per-file limit (413 beyond it)
+# MAX_REQUEST_MB  whole request body, checked from
+#                 Content-Length before the body is read
+# =======================================================
+
+UPLOAD_DIR = os.getenv(
+    "UPLOAD_DIR",
+    os.path.join(tempfile.gettempdir(), "credit_engine_uploads"),
+)
+
+UPLOAD_SPOOL_MB = float(os.getenv("UPLOAD_SPOOL_MB", "2"))
+
+MAX_UPLOAD_MB = float(os.getenv("MAX_UPLOAD_MB", "50"))
+
+# Room for the two files of /wc/upload-dual plus form overhead
+MAX_REQUEST_MB = float(os.getenv("MAX_REQUEST_MB", "0")) or (MAX_UPLOAD_MB * 2 + 1)
+
+# =======================================================
+# PARSE RESULT CACHE
+# PARSE_CACHE_MEMORY_MB  in-process LRU budget
+# PARSE_CACHE_DIR        on-disk tier ("" disables it)
+# PARSE_CACHE_DISK_MB    on-disk tier budget
+# =======================================================
+
+PARSE_CACHE_MEMORY_MB = float(os.getenv("PARSE_CACHE_MEMORY_MB", "64"))
+
+PARSE_CACHE_DIR = os.getenv(
+    "PARSE_CACHE_DIR",
+    os.path.join(tempfile.gettempdir(), "credit_engine_parse_cache"),
+)
+
+PARSE_CACHE_DISK_MB = float(os.getenv("PARSE_CACHE_DISK_MB", "512"))
+
+# =======================================================
+# WC EXTRACTION EARLY EXIT
+# PDF pages, Excel sheets and table rows stop being read
+# once every target field has a value.
+# WC_EXTRACTION_TARGETS  comma-separated fields (empty: the
+#                        required WC fields the dictionary
+#                        can produce)
+# WC_EARLY_EXIT          false always reads the whole file
+# WC_PAGE_FILTER         score PDF pages cheaply first and read
+#                        tables only on statement pages, then
+#                        the rest if coverage is still low
+# WC_FALLBACK_MIN_COVERAGE  share of the found statements'
+#                        targets below which the other PDF
+#                        pages are read (1 = until all found)
+# =======================================================
+
+WC_EXTRACTION_TARGETS = [
+    f.strip() for f in os.getenv("WC_EXTRACTION_TARGETS", "").split(",") if f.strip()
+]
+
+WC_EARLY_EXIT = os.getenv("WC_EARLY_EXIT", "true").lower() in ("1", "true", "yes")
+
+WC_PAGE_FILTER = os.getenv("WC_PAGE_FILTER", "true").lower() in ("1", "true", "yes")
+
+WC_FALLBACK_MIN_COVERAGE = float(os.getenv("WC_FALLBACK_MIN_COVERAGE", "0.75"))
+
+# =======================================================
+# BANK STATEMENT PAGE SHARDING
+# Statements longer than BANKING_SHARD_SIZE pages are split
+# into shards of that many pages and parsed in parallel
+# across the parser pool (0 disables sharding).
+# =======================================================
+
+BANKING_SHARD_SIZE = int(os.getenv("BANKING_SHARD_SIZE", "20"))
+
+# =======================================================
+# OCR PIPELINE (scanned PDFs)
+# OCR_WORKERS       tesseract processes per document
+# OCR_DPI           rasterization DPI for scanned pages
+# OCR_PAGE_TIMEOUT  seconds tesseract may spend on a page
+# =======================================================
+
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", "2"))
+
+OCR_DPI = int(os.getenv("OCR_DPI", "250"))
+
+OCR_PAGE_TIMEOUT = float(os.getenv("OCR_PAGE_TIMEOUT", "60"))
+
+OCR_LANG = os.getenv("OCR_LANG", "eng")
+
+# =======================================================
+# OCR PAGE CACHE
+# Tesseract output per preprocessed page image, shared by
+# every worker through the disk tier.
+# OCR_CACHE_MEMORY_MB  in-process LRU budget
+# OCR_CACHE_DIR        on-disk tier ("" disables it)
+# OCR_CACHE_DISK_MB    on-disk tier budget
+# =======================================================
+
+OCR_CACHE_MEMORY_MB = float(os.getenv("OCR_CACHE_MEMORY_MB", "16"))
+
+OCR_CACHE_DIR = os.getenv(
+    "OCR_CACHE_DIR",
+    os.path.join(tempfile.gettempdir(), "credit_engine_ocr_cache"),
+)
+
+OCR_CACHE_DISK_MB = float(os.getenv("OCR_CACHE_DISK_MB", "256"))
+
+# =======================================================
+# OCR PREPROCESSING
+# Pages are rescaled so a text line is about
+# OCR_TARGET_LINE_PX tall, instead of always being upscaled
+# 2x. OCR_BINARIZE adds an Otsu threshold before OCR.
+# =======================================================
+
+OCR_TARGET_LINE_PX = int(os.getenv("OCR_TARGET_LINE_PX", "40"))
+
+OCR_BINARIZE = os.getenv("OCR_BINARIZE", "false").lower() in ("1", "true", "yes")
+
+# =======================================================
+# CAM AUTOSAVE BUFFER
+# PUT /cam/autosave saves are held in memory and the latest
+# state per report is written in one batch every
+# AUTOSAVE_FLUSH_MS (0 writes every save immediately).
+# Pending saves are also written on submit and shutdown.
+# =======================================================
+
+AUTOSAVE_FLUSH_MS = int(os.getenv("AUTOSAVE_FLUSH_MS", "2000"))
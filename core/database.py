@@ -1,8 +1,20 @@
+import logging
 import os
 
+from fastapi import HTTPException
 from sqlalchemy import create_engine, JSON
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
+from core.config import (
+    DB_MAX_OVERFLOW,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_STATEMENT_TIMEOUT_MS,
+)
+
+logger = logging.getLogger("credit_engine.database")
+
 # =======================================================
 # DATABASE URL
 # Reads from environment variable.
@@ -64,3 +76,68 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# =======================================================
+# ASYNC ENGINE
+# Same database through asyncpg / aiosqlite, for routes that
+# should not hold a threadpool thread while waiting on it.
+# The driver is optional: without it AsyncSessionLocal is
+# None and get_async_db answers 503.
+# =======================================================
+
+def _async_url(url: str) -> str:
+
+    for prefix in ("postgresql+psycopg2://", "postgresql://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+
+    return url
+
+
+ASYNC_DATABASE_URL = _async_url(DATABASE_URL)
+
+try:
+    if _is_postgres:
+        connect_args = {}
+        if DB_STATEMENT_TIMEOUT_MS > 0:
+            connect_args["server_settings"] = {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}
+
+        async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_pre_ping=True,
+            connect_args=connect_args,
+        )
+    else:
+        async_engine = create_async_engine(ASYNC_DATABASE_URL)
+
+except ImportError as e:
+    logger.warning(f"Async database driver not available ({e}); CAM routes will answer 503")
+    async_engine = None
+
+AsyncSessionLocal = (
+    async_sessionmaker(async_engine, expire_on_commit=False)
+    if async_engine is not None
+    else None
+)
+
+
+async def get_async_db():
+
+    if AsyncSessionLocal is None:
+        raise HTTPException(status_code=503, detail="Async database driver not installed")
+
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def dispose_async_engine():
+
+    if async_engine is not None:
+        await async_engine.dispose()
@@ -0,0 +1,263 @@
+import asyncio
+import logging
+import os
+import signal
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+from core.config import PARSER_POOL_SIZE, PARSER_TASK_TIMEOUT
+
+logger = logging.getLogger("credit_engine.executor")
+
+# =======================================================
+# PARSER PROCESS POOL
+# CPU-bound parsing (pdfplumber, pandas, tesseract) must
+# not run on the event loop – a single long statement
+# would stall every other request, including /health.
+#
+# Timeouts bound execution, not queueing: a task is only
+# handed to the pool when a worker slot is free, and the
+# worker arms a SIGALRM timer when it starts the task, so
+# the parse itself is interrupted and the slot freed. A
+# worker stuck in native code that ignores the alarm is
+# killed (the pool is recycled) HUNG_WORKER_GRACE seconds
+# later.
+# =======================================================
+
+_pool = None
+
+# One slot per worker; created with the pool
+_slots = None
+
+HUNG_WORKER_GRACE = 10.0
+
+
+class ParserTimeoutError(Exception):
+    """Raised when a pooled task exceeds its timeout."""
+
+
+class _WorkerTimeout(BaseException):
+    """
+    Raised by the alarm inside a worker. A BaseException so the
+    parsers' broad except Exception fallbacks cannot swallow it.
+    """
+
+
+def _on_alarm(signum, frame):
+    raise _WorkerTimeout()
+
+
+def _init_worker():
+    # Forked workers must not reuse the parent's pooled DB
+    # connections (job progress is written from the worker)
+    from core.database import engine
+    engine.dispose(close=False)
+
+
+def start_pool(max_workers: int = None) -> ProcessPoolExecutor:
+
+    global _pool, _slots
+
+    if _pool is None:
+        size = max_workers or PARSER_POOL_SIZE
+        _pool = ProcessPoolExecutor(max_workers=size, initializer=_init_worker)
+        _slots = asyncio.Semaphore(size)
+        logger.info(f"Parser pool started with {size} worker(s)")
+
+    return _pool
+
+
+def _stop(pool: ProcessPoolExecutor, wait: bool):
+
+    # ProcessPoolExecutor cannot kill a running task; terminate
+    # its worker processes directly. Tasks still on this pool
+    # fail with BrokenProcessPool.
+    processes = list((pool._processes or {}).values())
+
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    for process in processes:
+        process.terminate()
+
+    if wait:
+        for process in processes:
+            process.join()
+
+
+def _recycle_pool(pool: ProcessPoolExecutor):
+
+    global _pool, _slots
+
+    # New tasks get a fresh pool at once
+    if _pool is pool:
+        _pool = None
+        _slots = None
+
+    _stop(pool, wait=False)
+
+
+def shutdown_pool(wait: bool = True):
+
+    global _pool, _slots
+
+    if _pool is None:
+        return
+
+    # Drop anything queued and kill what is still running rather
+    # than wait on it: HTTP requests have drained by shutdown and
+    # the job workers have requeued their jobs
+    _stop(_pool, wait)
+    _pool = None
+    _slots = None
+
+    logger.info("Parser pool shut down")
+
+
+def get_pool() -> ProcessPoolExecutor:
+    return _pool or start_pool()
+
+
+# =======================================================
+# WORKER STATS
+# Counters kept inside pool workers (e.g. OCR throughput)
+# never reach the parent on their own. Every task result
+# carries a snapshot of the registered counters of the
+# worker that ran it, kept here per worker pid.
+# =======================================================
+
+_stats_providers = {}
+
+_worker_stats = {}
+_worker_stats_lock = threading.Lock()
+
+
+def register_worker_stats(name: str, provider):
+    """provider() -> picklable snapshot of this process's counters."""
+    _stats_providers[name] = provider
+
+
+def worker_stats(name: str) -> dict:
+    """Latest snapshot from each pool worker that reported under name, by pid."""
+    with _worker_stats_lock:
+        return {pid: stats[name] for pid, stats in _worker_stats.items() if name in stats}
+
+
+# =======================================================
+# INCOMPLETE RESULTS
+# A task that degrades instead of failing (e.g. OCR pages
+# that timed out come back empty) calls mark_incomplete()
+# in the worker. The flag travels back with the result and
+# is set on the caller's track_incomplete() holder, so a
+# result with missing pages is never cached.
+# =======================================================
+
+_task_incomplete = False
+
+_incomplete_holder = ContextVar("incomplete_holder", default=None)
+
+
+def mark_incomplete():
+    """Flag the running task's result as partial (any thread)."""
+    global _task_incomplete
+    _task_incomplete = True
+
+    holder = _incomplete_holder.get()
+    if holder is not None:
+        holder["incomplete"] = True
+
+
+@contextmanager
+def track_incomplete():
+    """
+    Yields {"incomplete": bool}, set when any pool task awaited
+    inside the block (including from tasks it spawns) reported
+    a partial result.
+    """
+    holder = {"incomplete": False}
+    token = _incomplete_holder.set(holder)
+    try:
+        yield holder
+    finally:
+        _incomplete_holder.reset(token)
+
+
+def _timeout_error(func, timeout) -> ParserTimeoutError:
+    return ParserTimeoutError(f"{getattr(func, '__name__', 'task')} exceeded {timeout:g}s")
+
+
+def _call_with_stats(func, args, kwargs, timeout):
+    global _task_incomplete
+    _task_incomplete = False
+
+    # Runs in the worker's main thread, where signals land
+    armed = hasattr(signal, "setitimer")
+    if armed:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    try:
+        result = func(*args, **kwargs)
+    except _WorkerTimeout:
+        raise _timeout_error(func, timeout) from None
+    finally:
+        if armed:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+    stats = {name: provider() for name, provider in _stats_providers.items()}
+    return result, os.getpid(), stats, _task_incomplete
+
+
+async def run_in_pool(func, *args, timeout: float = None, **kwargs):
+    """
+    Run func(*args, **kwargs) in the parser pool and await the result.
+    func and its arguments must be picklable (module-level callables).
+    timeout counts from when a worker starts the task.
+    """
+    loop = asyncio.get_running_loop()
+    timeout = timeout or PARSER_TASK_TIMEOUT
+
+    while True:
+        pool = get_pool()
+        slots = _slots
+
+        async with slots:
+            if pool is not _pool:
+                # Recycled while this task waited for a slot
+                continue
+
+            try:
+                future = loop.run_in_executor(pool, partial(_call_with_stats, func, args, kwargs, timeout))
+                result, pid, stats, incomplete = await asyncio.wait_for(future, timeout + HUNG_WORKER_GRACE)
+
+            except asyncio.TimeoutError:
+                # The alarm did not stop it (stuck in native code)
+                logger.error(f"Parser worker hung past {timeout:g}s, recycling the pool")
+                _recycle_pool(pool)
+                raise _timeout_error(func, timeout)
+
+            except _WorkerTimeout:
+                # Alarm fired as the task was returning
+                raise _timeout_error(func, timeout)
+
+            except BrokenProcessPool:
+                # A worker died (OOM / segfault in a native lib) – recycle the pool
+                logger.error("Parser pool broken, restarting")
+                _recycle_pool(pool)
+                raise
+
+            break
+
+    if stats:
+        with _worker_stats_lock:
+            _worker_stats[pid] = stats
+
+    if incomplete:
+        holder = _incomplete_holder.get()
+        if holder is not None:
+            holder["incomplete"] = True
+
+    return result
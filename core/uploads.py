@@ -0,0 +1,205 @@
+import hashlib
+import mmap
+import os
+import uuid
+from contextlib import contextmanager
+from io import BytesIO
+
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+
+from core.config import UPLOAD_DIR, UPLOAD_SPOOL_MB, MAX_UPLOAD_MB, MAX_REQUEST_MB
+
+MB = 1024 * 1024
+
+CHUNK_SIZE = MB
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds MAX_UPLOAD_MB."""
+
+
+# =======================================================
+# UPLOAD HANDOFF
+# A large upload is written once to a file under UPLOAD_DIR
+# and only its UploadHandle (path, size, sha256) is pickled
+# to pool workers. Each worker maps the file read-only, so
+# every process reads the same page-cache pages instead of
+# receiving its own pickled copy of the document.
+# Parsers accept either raw bytes or an UploadHandle and
+# open both through open_document().
+# =======================================================
+
+class MappedFile(mmap.mmap):
+    """Read-only mmap that also passes io checks (zipfile asks seekable())."""
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def writable(self):
+        return False
+
+
+class UploadHandle:
+    """Picklable reference to a staged upload."""
+
+    __slots__ = ("path", "size", "sha256")
+
+    def __init__(self, path: str, size: int, sha256: str):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+
+    def __repr__(self):
+        return f"UploadHandle({self.path!r}, size={self.size})"
+
+    def read_bytes(self) -> bytes:
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def remove(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def _new_path() -> str:
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    return os.path.join(UPLOAD_DIR, uuid.uuid4().hex)
+
+
+def stage_bytes(data: bytes) -> UploadHandle:
+
+    path = _new_path()
+
+    with open(path, "wb") as f:
+        f.write(data)
+
+    return UploadHandle(path, len(data), hashlib.sha256(data).hexdigest())
+
+
+def _too_large(upload):
+    return UploadTooLargeError(f"{upload.filename or 'Upload'} exceeds the {MAX_UPLOAD_MB:g} MB limit")
+
+
+async def stage_upload(upload):
+    """
+    Read a Starlette UploadFile in chunks, hashing as it goes. Up to
+    UPLOAD_SPOOL_MB it stays in memory and comes back as bytes; past
+    that it rolls over to a file under UPLOAD_DIR and comes back as
+    an UploadHandle. Raises UploadTooLargeError past MAX_UPLOAD_MB.
+    Pass the result to release() when done.
+    """
+    max_bytes = int(MAX_UPLOAD_MB * MB)
+    spool_bytes = int(UPLOAD_SPOOL_MB * MB)
+
+    if upload.size is not None and upload.size > max_bytes:
+        raise _too_large(upload)
+
+    digest = hashlib.sha256()
+    size = 0
+    chunks = []
+    path = f = None
+
+    try:
+        while True:
+            chunk = await upload.read(CHUNK_SIZE)
+            if not chunk:
+                break
+
+            size += len(chunk)
+            if size > max_bytes:
+                raise _too_large(upload)
+            digest.update(chunk)
+
+            if f is None and size <= spool_bytes:
+                chunks.append(chunk)
+                continue
+
+            if f is None:
+                path = _new_path()
+                f = open(path, "wb")
+                chunks.append(chunk)
+                chunk = b"".join(chunks)
+                chunks = []
+
+            await run_in_threadpool(f.write, chunk)
+
+    except BaseException:
+        if f is not None:
+            f.close()
+            UploadHandle(path, size, "").remove()
+        raise
+
+    if f is None:
+        return b"".join(chunks)
+
+    f.close()
+    return UploadHandle(path, size, digest.hexdigest())
+
+
+def release(source):
+    """Remove a staged upload; in-memory uploads need nothing."""
+    if isinstance(source, UploadHandle):
+        source.remove()
+
+
+@contextmanager
+def open_document(source):
+    """Binary file object over bytes or an UploadHandle (mapped, not copied)."""
+
+    if not isinstance(source, UploadHandle):
+        yield BytesIO(source)
+        return
+
+    if not source.size:
+        # mmap can't map an empty file
+        yield BytesIO(b"")
+        return
+
+    with open(source.path, "rb") as f, MappedFile(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        yield m
+
+
+def document_bytes(source) -> bytes:
+    return source.read_bytes() if isinstance(source, UploadHandle) else source
+
+
+def document_digest(source) -> str:
+    if isinstance(source, UploadHandle):
+        return source.sha256
+    return hashlib.sha256(source).hexdigest()
+
+
+# =======================================================
+# REQUEST SIZE LIMIT
+# Rejects a body whose Content-Length is over MAX_REQUEST_MB
+# with 413 before any of it is read. Chunked bodies carry
+# no length; stage_upload's per-file limit covers those.
+# =======================================================
+
+class UploadLimitMiddleware:
+
+    def __init__(self, app, max_bytes: int = None):
+        self.app = app
+        self.max_bytes = max_bytes or int(MAX_REQUEST_MB * MB)
+
+    async def __call__(self, scope, receive, send):
+
+        if scope["type"] == "http":
+            for name, value in scope["headers"]:
+                if name == b"content-length":
+                    if value.isdigit() and int(value) > self.max_bytes:
+                        response = JSONResponse(
+                            {"detail": f"Request body exceeds the {self.max_bytes / MB:g} MB limit"},
+                            status_code=413,
+                        )
+                        await response(scope, receive, send)
+                        return
+                    break
+
+        await self.app(scope, receive, send)
@@ -13,10 +13,19 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from core.database import dispose_async_engine
+from core.executor import start_pool, shutdown_pool
+from core.uploads import UploadLimitMiddleware
 from routers.cam_router import router as cam_router
 from routers.wc_router import wc_router
 from routers.agriculture_router import agri_router
 from routers.banking_router import bank_router
+from routers.job_router import job_router
+from services.autosave_buffer import start_autosave_flusher, stop_autosave_flusher
+from services.cam_service import ensure_cam_schema
+from services.job_service import start_job_workers, stop_job_workers
+from services.ocr_engine import pool_ocr_stats
+from services.parse_cache import parse_cache
 
 
 # ======================================================
@@ -37,9 +46,17 @@ logger = logging.getLogger("credit_engine")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    ensure_cam_schema()
+    start_pool()
+    start_job_workers()
+    start_autosave_flusher()
     logger.info("Credit Intelligence Engine started successfully")
     yield
     logger.info("Credit Intelligence Engine shutting down")
+    await stop_autosave_flusher()
+    await stop_job_workers()
+    shutdown_pool()
+    await dispose_async_engine()
 
 
 # ======================================================
@@ -71,6 +88,15 @@ app = FastAPI(
 )
 
 
+# ======================================================
+# UPLOAD SIZE LIMIT
+# Oversized request bodies get 413 before they are read.
+# Added before CORS so the 413 still carries CORS headers.
+# ======================================================
+
+app.add_middleware(UploadLimitMiddleware)
+
+
 # ======================================================
 # CORS CONFIGURATION
 # Allow configuring origins via ALLOWED_ORIGINS env var
@@ -126,6 +152,8 @@ app.include_router(agri_router)
 
 app.include_router(bank_router)
 
+app.include_router(job_router)
+
 
 # ======================================================
 # ROOT ENDPOINT
@@ -166,6 +194,31 @@ def health():
     )
 
 
+# ======================================================
+# PARSE CACHE STATS
+# Hit / miss counters per cache tier
+# ======================================================
+
+@app.get("/cache/stats", tags=["System"])
+
+def cache_stats():
+
+    return parse_cache.stats()
+
+
+# ======================================================
+# OCR WORKER STATS
+# Pages and throughput per OCR thread across the parser
+# pool workers, as last reported by each worker
+# ======================================================
+
+@app.get("/ocr/stats", tags=["System"])
+
+def ocr_stats():
+
+    return pool_ocr_stats()
+
+
 # ======================================================
 # GLOBAL ERROR HANDLER
 # Prevents server crashes
@@ -151,6 +151,16 @@ class CAMReport(Base):
         nullable=True,
     )
 
+    # Optimistic concurrency: the ORM increments it on every
+    # flush and adds "WHERE version = <loaded value>", raising
+    # StaleDataError when another writer got there first.
+    version = Column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default="1",
+    )
+
     # ==================================================
     # SOFT DELETE SUPPORT
     # ==================================================
@@ -166,15 +176,23 @@ class CAMReport(Base):
         nullable=True,
     )
 
+    __mapper_args__ = {
+        "version_id_col": version,
+    }
+
 
 # ==================================================
 # INDEXES (IMPORTANT FOR PERFORMANCE)
 # ==================================================
 
+# text_pattern_ops lets Postgres use the index for the
+# customer_name LIKE 'prefix%' listing filter under any
+# collation; equality lookups still use it too
 Index(
     "idx_cam_customer_status",
     CAMReport.customer_name,
     CAMReport.status,
+    postgresql_ops={"customer_name": "text_pattern_ops"},
 )
 
 Index(
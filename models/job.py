@@ -0,0 +1,138 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    DateTime,
+    LargeBinary,
+    Index,
+)
+from sqlalchemy.sql import func
+
+from core.database import Base, JSONType
+
+
+class ParseJob(Base):
+
+    __tablename__ = "parse_jobs"
+
+    # ==================================================
+    # PRIMARY KEY
+    # ==================================================
+
+    id = Column(
+        String(32),
+        primary_key=True,
+    )
+
+    # ==================================================
+    # JOB DEFINITION
+    # ==================================================
+
+    # Job kinds
+    # banking  -> bank statement upload
+    # wc       -> balance sheet / P&L upload
+
+    kind = Column(
+        String(20),
+        nullable=False,
+    )
+
+    filename = Column(
+        String(255),
+        nullable=True,
+    )
+
+    # SHA-256 of the uploaded bytes – lets a retried upload
+    # pick up an existing result instead of re-parsing
+    file_hash = Column(
+        String(64),
+        nullable=False,
+    )
+
+    # Raw upload, cleared once the job finishes
+    payload = Column(
+        LargeBinary,
+        nullable=True,
+    )
+
+    # ==================================================
+    # STATE
+    # ==================================================
+
+    status = Column(
+        String(20),
+        default="queued",
+        nullable=False,
+    )
+
+    # Possible statuses
+    # queued
+    # running
+    # done
+    # failed
+
+    # Process running the job, and when it last reported in.
+    # Several instances may share the table; only a job whose
+    # heartbeat went stale is taken back by another process.
+    worker_id = Column(
+        String(64),
+        nullable=True,
+    )
+
+    heartbeat_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+    pages_done = Column(
+        Integer,
+        default=0,
+    )
+
+    pages_total = Column(
+        Integer,
+        nullable=True,
+    )
+
+    result = Column(
+        JSONType,
+        nullable=True,
+    )
+
+    error = Column(
+        String(1000),
+        nullable=True,
+    )
+
+    # ==================================================
+    # AUDIT / METADATA
+    # ==================================================
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+
+# ==================================================
+# INDEXES
+# ==================================================
+
+Index(
+    "idx_job_status_created",
+    ParseJob.status,
+    ParseJob.created_at,
+)
+
+Index(
+    "idx_job_kind_hash",
+    ParseJob.kind,
+    ParseJob.file_hash,
+)
@@ -1,9 +1,21 @@
+import json
+
 from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel, Field
 from typing import List
 
+from core.executor import run_in_pool, ParserTimeoutError
+from core.uploads import UploadTooLargeError, release, stage_upload
 from services.banking_service import analyze_banking
-from services.banking_parser import parse_banking_file
+from services.banking_parser import (
+    parse_banking_file_sharded,
+    stream_banking_transactions,
+    count_pdf_pages,
+    PARSER_VERSION,
+)
+from services.parse_cache import cached_parse
 
 
 # ======================================================
@@ -56,6 +68,27 @@ bank_router = APIRouter(
 )
 
 
+# ======================================================
+# UPLOAD VALIDATION
+# Statements are parsed as PDFs; anything else is refused
+# before it is staged or queued.
+# ======================================================
+
+def validate_pdf(file: UploadFile):
+
+    is_pdf = (
+        (file.filename or "").lower().endswith(".pdf")
+        or file.content_type == "application/pdf"
+    )
+
+    if not is_pdf:
+
+        raise HTTPException(
+            status_code=400,
+            detail="Only PDF bank statements are supported"
+        )
+
+
 # ======================================================
 # MANUAL JSON ANALYSIS
 # ======================================================
@@ -93,11 +126,16 @@ async def banking_manual_analysis(data: BankingInput):
 
 async def banking_file_analysis(file: UploadFile = File(...)):
 
+    upload = None
+
     try:
 
-        file_bytes = await file.read()
+        upload = await stage_upload(file)
 
-        transactions = parse_banking_file(file_bytes)
+        transactions = await cached_parse(
+            parse_banking_file_sharded, upload,
+            parser="banking", version=PARSER_VERSION,
+        )
 
         if not transactions:
 
@@ -119,6 +157,20 @@ async def banking_file_analysis(file: UploadFile = File(...)):
     except HTTPException:
         raise
 
+    except UploadTooLargeError as e:
+
+        raise HTTPException(
+            status_code=413,
+            detail=str(e)
+        )
+
+    except ParserTimeoutError as e:
+
+        raise HTTPException(
+            status_code=504,
+            detail=f"Bank statement processing timed out: {str(e)}"
+        )
+
     except Exception as e:
 
         raise HTTPException(
@@ -126,6 +178,67 @@ async def banking_file_analysis(file: UploadFile = File(...)):
             detail=f"Bank statement processing error: {str(e)}"
         )
 
+    finally:
+
+        if upload is not None:
+            release(upload)
+
+
+# ======================================================
+# STREAMING TRANSACTION EXTRACTION (NDJSON)
+# One transaction per line, emitted as page shards are
+# parsed in the parser pool (statement order, not date-
+# sorted). A parse failure or timeout mid-stream ends
+# with an {"error": ...} line.
+# ======================================================
+
+@bank_router.post("/stream-statement")
+
+async def banking_stream_statement(file: UploadFile = File(...)):
+
+    try:
+        upload = await stage_upload(file)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    try:
+        pages = await run_in_pool(count_pdf_pages, upload)
+    except BaseException:
+        release(upload)
+        raise
+
+    if not pages:
+
+        release(upload)
+
+        raise HTTPException(
+            status_code=400,
+            detail="Unreadable or empty PDF"
+        )
+
+    async def ndjson():
+
+        try:
+
+            async for txn in stream_banking_transactions(upload, total_pages=pages):
+                yield json.dumps(txn) + "\n"
+
+        except ParserTimeoutError as e:
+
+            yield json.dumps({"error": f"Bank statement processing timed out: {str(e)}"}) + "\n"
+
+        except Exception as e:
+
+            yield json.dumps({"error": str(e)}) + "\n"
+
+    # The staged file is removed once the response ends,
+    # including when the client disconnects mid-stream.
+    return StreamingResponse(
+        ndjson(),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(release, upload),
+    )
+
 
 # ======================================================
 # HEALTH CHECK
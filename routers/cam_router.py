@@ -1,124 +1,215 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database import get_db
-from models.cam import CAMReport
+from core.database import get_async_db
 from datetime import datetime
+from services.autosave_buffer import (
+    discard_autosave,
+    flush_report,
+    is_buffering,
+    queue_autosave,
+)
+from services.cam_service import (
+    VersionConflict,
+    autosave_cam_report,
+    autosave_values,
+    conditional_update,
+    create_cam_report,
+    current_version,
+    delete_cam_report,
+    get_all_cam_reports,
+    get_cam_report,
+    list_cam_reports,
+    patch_cam_report,
+    serialize_summary,
+    submit_cam_report,
+)
+from utils.json_patch import PatchError, PatchTestFailed
 from services.pdf_generator import generate_cam_pdf
 
 router = APIRouter(prefix="/cam", tags=["CAM Dashboard"])
 
 
+# ---------------- VERSIONS ----------------
+# Writes may carry "version": the report version the client
+# last saw. A stale version gets 409 with the current one so
+# the client can reload and retry instead of overwriting.
+def _expected_version(data: dict):
+
+    version = data.pop("version", None)
+
+    if version is not None and (isinstance(version, bool) or not isinstance(version, int)):
+        raise HTTPException(status_code=400, detail="version must be an integer")
+
+    return version
+
+
+def _conflict(e: VersionConflict):
+
+    return HTTPException(
+        status_code=409,
+        detail={"message": "Report was modified by another session", "version": e.current_version},
+    )
+
+
 # ---------------- GET ALL ----------------
-# Must be declared BEFORE /{report_id} so FastAPI does not try
-# to parse the literal "all" as an integer report_id.
+# /all and /list must be declared BEFORE /{report_id} so FastAPI
+# does not try to parse the literal path as an integer report_id.
 @router.get("/all")
-def get_all_reports(db: Session = Depends(get_db)):
+async def get_all_reports(db: AsyncSession = Depends(get_async_db)):
+
+    # Summary columns only; /cam/list pages through the same rows
+    reports = await get_all_cam_reports(db)
+
+    return [serialize_summary(r) for r in reports]
+
+
+# ---------------- LIST (PAGINATED) ----------------
+# Pass next_cursor back as cursor to fetch the following page.
+@router.get("/list")
+async def list_reports(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    customer_name: Optional[str] = Query(None, description="Customer name prefix"),
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+
+    try:
+        rows, next_cursor = await list_cam_reports(
+            db,
+            limit=limit,
+            cursor=cursor,
+            status=status,
+            customer_prefix=customer_name,
+            created_from=created_from,
+            created_to=created_to,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    reports = db.query(CAMReport).filter(
-        CAMReport.is_deleted.is_(False)
-    ).order_by(CAMReport.id.desc()).all()
-
-    return [
-        {
-            "id": r.id,
-            "customer_name": r.customer_name,
-            "status": r.status,
-            "created_at": r.created_at
-        }
-        for r in reports
-    ]
+    return {
+        "items": [serialize_summary(r) for r in rows],
+        "next_cursor": next_cursor,
+    }
 
 
 # ---------------- CREATE CAM ----------------
 @router.post("/create")
-def create_cam(data: dict, db: Session = Depends(get_db)):
+async def create_cam(data: dict, db: AsyncSession = Depends(get_async_db)):
 
     if not data.get("customer_name"):
         raise HTTPException(status_code=400, detail="Customer Name Required")
 
-    report = CAMReport(
-        customer_name=data["customer_name"],
-        analyst_name=data.get("analyst_name", "System"),
-        loan_amount=data.get("loan_amount", 0),
-        wc_data=data.get("wc_data", {}),
-        agri_data=data.get("agri_data", {}),
-        banking_data=data.get("banking_data", {}),
-        status="Draft",
-        created_at=datetime.utcnow(),
-    )
-
-    db.add(report)
-    db.commit()
-    db.refresh(report)
+    report = await create_cam_report(data, db)
 
-    return {"report_id": report.id}
+    return {"report_id": report.id, "version": report.version}
 
 
 # ---------------- AUTOSAVE CAM ----------------
+# With "version" the save is a single conditional UPDATE and
+# bypasses the buffer so a conflict can be reported. Without
+# it, and with the autosave buffer running, the save is queued
+# and written in the next batch ("pending": true, no version yet).
+# The report is checked first (a primary key lookup) so a missing
+# or deleted report still gets 404 instead of a silent drop.
 @router.put("/autosave/{report_id}")
-def autosave_cam(report_id: int, data: dict, db: Session = Depends(get_db)):
+async def autosave_cam(report_id: int, data: dict, db: AsyncSession = Depends(get_async_db)):
+
+    expected = _expected_version(data)
+
+    if expected is not None:
+        await flush_report(report_id)
+        try:
+            version = await conditional_update(report_id, expected, autosave_values(data), db)
+        except VersionConflict as e:
+            raise _conflict(e)
+
+    elif is_buffering():
+        if await current_version(report_id, db) is None:
+            raise HTTPException(status_code=404, detail="Report Not Found")
+        queue_autosave(report_id, autosave_values(data))
+        return {"message": "Autosaved", "pending": True}
+
+    else:
+        try:
+            version = await autosave_cam_report(report_id, data, db)
+        except VersionConflict as e:
+            raise _conflict(e)
+
+    if version is None:
+        raise HTTPException(status_code=404, detail="Report Not Found")
 
-    report = db.query(CAMReport).filter(
-        CAMReport.id == report_id,
-        CAMReport.is_deleted.is_(False),
-    ).first()
+    return {"message": "Autosaved", "version": version}
 
-    if not report:
-        raise HTTPException(status_code=404, detail="Report Not Found")
 
-    report.customer_name = data.get("customer_name", report.customer_name)
-    report.analyst_name = data.get("analyst_name", report.analyst_name)
-    report.loan_amount = data.get("loan_amount", report.loan_amount)
-    report.wc_data = data.get("wc_data", report.wc_data)
-    report.agri_data = data.get("agri_data", report.agri_data)
-    report.banking_data = data.get("banking_data", report.banking_data)
-    report.credit_grade = data.get("credit_grade", report.credit_grade)
-    report.remarks = data.get("remarks", report.remarks)
+# ---------------- PATCH AUTOSAVE ----------------
+# Body: any of wc_data / agri_data / banking_data as a JSON Patch
+# (list of ops) or Merge Patch (object), plus plain fields.
+# Only the columns that actually change are written.
+@router.patch("/autosave/{report_id}")
+async def patch_autosave_cam(report_id: int, data: dict, db: AsyncSession = Depends(get_async_db)):
+
+    expected = _expected_version(data)
+
+    await flush_report(report_id)
 
-    db.commit()
+    try:
+        version, changed = await patch_cam_report(report_id, data, db, expected_version=expected)
+    except VersionConflict as e:
+        raise _conflict(e)
+    except PatchTestFailed as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except PatchError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    return {"message": "Autosaved"}
+    if version is None:
+        raise HTTPException(status_code=404, detail="Report Not Found")
+
+    return {"message": "Autosaved", "version": version, "changed": changed}
 
 
 # ---------------- SUBMIT CAM ----------------
 @router.post("/submit/{report_id}")
-def submit_cam(report_id: int, data: dict, db: Session = Depends(get_db)):
+async def submit_cam(report_id: int, data: dict, db: AsyncSession = Depends(get_async_db)):
 
-    report = db.query(CAMReport).filter(
-        CAMReport.id == report_id,
-        CAMReport.is_deleted.is_(False),
-    ).first()
+    expected = _expected_version(data)
 
-    if not report:
-        raise HTTPException(status_code=404, detail="Report Not Found")
+    await flush_report(report_id)
 
-    report.status = "Submitted"
-    report.credit_grade = data.get("credit_grade", report.credit_grade)
-    report.remarks = data.get("remarks", report.remarks)
-    if data.get("approved_limit"):
-        report.recommended_limit = data["approved_limit"]
+    try:
+        version = await submit_cam_report(report_id, data, db, expected_version=expected)
+    except VersionConflict as e:
+        raise _conflict(e)
 
-    db.commit()
+    if version is None:
+        raise HTTPException(status_code=404, detail="Report Not Found")
 
-    return {"message": "CAM Submitted"}
+    return {"message": "CAM Submitted", "version": version}
 
 
 # ---------------- DOWNLOAD PDF ----------------
 # Generates PDF in /tmp (compatible with Cloud Run)
 @router.get("/pdf/{report_id}")
-def download_pdf(report_id: int, db: Session = Depends(get_db)):
+async def download_pdf(report_id: int, db: AsyncSession = Depends(get_async_db)):
+
+    await flush_report(report_id)
 
-    report = db.query(CAMReport).filter(
-        CAMReport.id == report_id,
-        CAMReport.is_deleted.is_(False),
-    ).first()
+    report = await get_cam_report(report_id, db)
 
     if not report:
         raise HTTPException(status_code=404, detail="Not Found")
 
-    output_path = generate_cam_pdf(report.__dict__, f"CAM_{report_id}.pdf")
+    # reportlab is CPU-bound; keep it off the event loop
+    output_path = await asyncio.to_thread(
+        generate_cam_pdf, report.__dict__, f"CAM_{report_id}.pdf"
+    )
 
     return FileResponse(
         path=output_path,
@@ -129,12 +220,11 @@ def download_pdf(report_id: int, db: Session = Depends(get_db)):
 
 # ---------------- GET CAM ----------------
 @router.get("/{report_id}")
-def get_cam(report_id: int, db: Session = Depends(get_db)):
+async def get_cam(report_id: int, db: AsyncSession = Depends(get_async_db)):
+
+    await flush_report(report_id)
 
-    report = db.query(CAMReport).filter(
-        CAMReport.id == report_id,
-        CAMReport.is_deleted.is_(False),
-    ).first()
+    report = await get_cam_report(report_id, db)
 
     if not report:
         raise HTTPException(status_code=404, detail="Not Found")
@@ -151,24 +241,23 @@ def get_cam(report_id: int, db: Session = Depends(get_db)):
         "recommended_limit": report.recommended_limit,
         "remarks": report.remarks,
         "status": report.status,
+        "version": report.version,
         "created_at": report.created_at,
     }
 
 
 # ---------------- DELETE CAM ----------------
 @router.delete("/{report_id}")
-def delete_cam(report_id: int, db: Session = Depends(get_db)):
+async def delete_cam(report_id: int, db: AsyncSession = Depends(get_async_db)):
 
-    report = db.query(CAMReport).filter(
-        CAMReport.id == report_id,
-        CAMReport.is_deleted.is_(False),
-    ).first()
+    discard_autosave(report_id)
 
-    if not report:
-        raise HTTPException(status_code=404, detail="Not Found")
+    try:
+        version = await delete_cam_report(report_id, db)
+    except VersionConflict as e:
+        raise _conflict(e)
 
-    report.is_deleted = True
-    db.commit()
+    if version is None:
+        raise HTTPException(status_code=404, detail="Not Found")
 
     return {"message": "Report Deleted"}
-
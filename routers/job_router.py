@@ -0,0 +1,140 @@
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from core.database import SessionLocal, get_db
+from core.uploads import UploadTooLargeError, document_bytes, release, stage_upload
+from routers.banking_router import validate_pdf
+from routers.wc_router import validate_file
+from services.job_service import (
+    TERMINAL_STATUSES,
+    get_job,
+    serialize_job,
+    submit_job,
+)
+
+job_router = APIRouter(prefix="/jobs", tags=["Background Parse Jobs"])
+
+# Seconds between progress checks on the event stream
+EVENT_POLL_INTERVAL = 0.5
+
+
+def _accepted(job):
+
+    return {
+        "status": "accepted",
+        "job_id": job.id,
+        "job_status": job.status,
+    }
+
+
+async def _read_payload(file: UploadFile) -> bytes:
+
+    # Size-limited read; the job queue stores the payload itself
+    try:
+        source = await stage_upload(file)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    try:
+        return document_bytes(source)
+    finally:
+        release(source)
+
+
+# ---------------- SUBMIT BANK STATEMENT ----------------
+@job_router.post("/banking", status_code=202)
+async def submit_banking_job(file: UploadFile = File(...), db: Session = Depends(get_db)):
+
+    validate_pdf(file)
+
+    file_bytes = await _read_payload(file)
+
+    if not file_bytes:
+        raise HTTPException(status_code=400, detail="Empty file")
+
+    # Hashing and the payload INSERT are blocking; keep them off the loop
+    job = await asyncio.to_thread(submit_job, "banking", file.filename, file_bytes, db)
+
+    return _accepted(job)
+
+
+# ---------------- SUBMIT FINANCIAL FILE ----------------
+@job_router.post("/wc", status_code=202)
+async def submit_wc_job(file: UploadFile = File(...), db: Session = Depends(get_db)):
+
+    validate_file(file.filename)
+
+    file_bytes = await _read_payload(file)
+
+    if not file_bytes:
+        raise HTTPException(status_code=400, detail="Empty file")
+
+    # Hashing and the payload INSERT are blocking; keep them off the loop
+    job = await asyncio.to_thread(submit_job, "wc", file.filename, file_bytes, db)
+
+    return _accepted(job)
+
+
+# ---------------- JOB STATUS ----------------
+@job_router.get("/{job_id}")
+def job_status(job_id: str, db: Session = Depends(get_db)):
+
+    job = get_job(job_id, db)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Job Not Found")
+
+    return serialize_job(job)
+
+
+# ---------------- JOB PROGRESS STREAM ----------------
+# NDJSON: one line per page-progress or status change,
+# ending with the final job state (including result).
+def _read_job(job_id: str):
+
+    db = SessionLocal()
+
+    try:
+        job = get_job(job_id, db)
+        return serialize_job(job) if job else None
+    finally:
+        db.close()
+
+
+@job_router.get("/{job_id}/events")
+async def job_events(job_id: str):
+
+    first = await asyncio.to_thread(_read_job, job_id)
+
+    if first is None:
+        raise HTTPException(status_code=404, detail="Job Not Found")
+
+    async def stream():
+
+        state = first
+        last_seen = None
+
+        while True:
+
+            seen = (state["status"], state["pages_done"], state["pages_total"])
+
+            if seen != last_seen:
+                last_seen = seen
+                yield json.dumps(jsonable_encoder(state)) + "\n"
+
+            if state["status"] in TERMINAL_STATUSES:
+                return
+
+            await asyncio.sleep(EVENT_POLL_INTERVAL)
+
+            state = await asyncio.to_thread(_read_job, job_id)
+
+            if state is None:
+                return
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
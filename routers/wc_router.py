@@ -1,7 +1,12 @@
+import asyncio
+
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from typing import Dict
 
-from services.wc_parser import parse_financial_file
+from core.executor import ParserTimeoutError
+from core.uploads import UploadTooLargeError, release, stage_upload
+from services.parse_cache import cached_parse
+from services.wc_parser import parse_financial_file, PARSER_VERSION
 from services.wc_service import calculate_wc_logic
 from services.wc_required_fields import WC_REQUIRED_INPUT_FIELDS
 from services.wc_missing import find_missing_fields_present_only
@@ -18,20 +23,30 @@ def validate_file(filename: str):
         raise HTTPException(status_code=400, detail=f"Unsupported file type: {ext}")
 
 
+async def _parse(upload, filename: str) -> dict:
+    return await cached_parse(
+        parse_financial_file, upload, filename,
+        parser="wc", version=PARSER_VERSION, filename=filename,
+    )
+
+
 @wc_router.post("/upload-dual")
 async def wc_upload_dual(
     balance_sheet: UploadFile = File(...),
     profit_loss: UploadFile = File(...),
 ):
+    bs_upload = pl_upload = None
     try:
         validate_file(balance_sheet.filename)
         validate_file(profit_loss.filename)
 
-        bs_bytes = await balance_sheet.read()
-        pl_bytes = await profit_loss.read()
+        bs_upload = await stage_upload(balance_sheet)
+        pl_upload = await stage_upload(profit_loss)
 
-        bs_data = parse_financial_file(bs_bytes, balance_sheet.filename)
-        pl_data = parse_financial_file(pl_bytes, profit_loss.filename)
+        bs_data, pl_data = await asyncio.gather(
+            _parse(bs_upload, balance_sheet.filename),
+            _parse(pl_upload, profit_loss.filename),
+        )
 
         merged_inputs = {**(bs_data.get("inputs", {}) or {}), **(pl_data.get("inputs", {}) or {})}
         merged_calc = {**(bs_data.get("calculations", {}) or {}), **(pl_data.get("calculations", {}) or {})}
@@ -50,18 +65,33 @@ async def wc_upload_dual(
             "missing_fields_count": len(missing_fields),
             "present_fields": present_fields,
             "manual_template": {k: 0 for k in missing_fields},
+            "skipped_pages": {
+                "balance_sheet": bs_data.get("skipped_pages", []),
+                "profit_loss": pl_data.get("skipped_pages", []),
+            },
         }
+    except HTTPException:
+        raise
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ParserTimeoutError as e:
+        raise HTTPException(status_code=504, detail=f"Processing timed out: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Processing error: {str(e)}")
+    finally:
+        for upload in (bs_upload, pl_upload):
+            if upload is not None:
+                release(upload)
 
 
 @wc_router.post("/upload-single")
 async def wc_upload_single(file: UploadFile = File(...)):
+    upload = None
     try:
         validate_file(file.filename)
 
-        file_bytes = await file.read()
-        parsed_data = parse_financial_file(file_bytes, file.filename)
+        upload = await stage_upload(file)
+        parsed_data = await _parse(upload, file.filename)
         result = calculate_wc_logic(parsed_data)
 
         inputs = parsed_data.get("inputs", {}) or {}
@@ -76,9 +106,19 @@ async def wc_upload_single(file: UploadFile = File(...)):
             "missing_fields_count": len(missing_fields),
             "present_fields": present_fields,
             "manual_template": {k: 0 for k in missing_fields},
+            "skipped_pages": parsed_data.get("skipped_pages", []),
         }
+    except HTTPException:
+        raise
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ParserTimeoutError as e:
+        raise HTTPException(status_code=504, detail=f"Processing timed out: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Processing error: {str(e)}")
+    finally:
+        if upload is not None:
+            release(upload)
 
 
 @wc_router.post("/manual-calc")
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from services.accounting_dictionary import ACCOUNTING_KEYWORDS
+
+
+# ==========================================================
+# KEYWORD INDEX
+# Answers "which dictionary keys does this row match?" with
+# the same rule wc_parser always used: a keyword matches if
+# it is a substring of the row, or SequenceMatcher(kw, row)
+# .ratio() >= threshold. SequenceMatcher only runs on a
+# shortlist that survives two exact upper bounds on ratio:
+#   1. length:  2*min(la, lb) / (la + lb)
+#   2. chars:   2*shared_char_count / (la + lb)
+# (bound 2 is difflib's quick_ratio, computed for every
+# keyword at once from a precomputed char-count matrix).
+# A keyword failing either bound can never reach the
+# threshold, so the result is identical to the full scan.
+# ==========================================================
+
+class KeywordIndex:
+
+    def __init__(self, keywords_by_key: Dict[str, List[str]], threshold: float = 0.82):
+        self.threshold = threshold
+        self.keys = list(keywords_by_key)
+
+        self.keywords: List[str] = []
+        key_ids = []
+        for key_id, key in enumerate(self.keys):
+            for kw in keywords_by_key[key]:
+                self.keywords.append(kw)
+                key_ids.append(key_id)
+
+        self.key_ids = np.array(key_ids, dtype=np.int64)
+        self.lengths = np.array([len(kw) for kw in self.keywords], dtype=np.int64)
+
+        alphabet = sorted({ch for kw in self.keywords for ch in kw})
+        self.char_pos = {ch: i for i, ch in enumerate(alphabet)}
+
+        self.char_counts = np.zeros((len(self.keywords), len(alphabet)), dtype=np.int64)
+        for i, kw in enumerate(self.keywords):
+            for ch in kw:
+                self.char_counts[i, self.char_pos[ch]] += 1
+
+        # Per-instance memo: the same row text recurs across
+        # tables, pages and the text fallback
+        self.match_keys = lru_cache(maxsize=8192)(self._match_keys)
+
+    def _candidates(self, text: str) -> np.ndarray:
+        lb = len(text)
+        totals = self.lengths + lb
+
+        length_bound = 2.0 * np.minimum(self.lengths, lb) / totals
+        candidates = np.flatnonzero(length_bound >= self.threshold)
+
+        if not len(candidates):
+            return candidates
+
+        row_counts = np.zeros(len(self.char_pos), dtype=np.int64)
+        for ch in text:
+            pos = self.char_pos.get(ch)
+            if pos is not None:
+                row_counts[pos] += 1
+
+        shared = np.minimum(self.char_counts[candidates], row_counts).sum(axis=1)
+        char_bound = 2.0 * shared / totals[candidates]
+
+        return candidates[char_bound >= self.threshold]
+
+    def _match_keys(self, text: str) -> Tuple[str, ...]:
+        matched = set()
+
+        for i, kw in enumerate(self.keywords):
+            if kw in text:
+                matched.add(int(self.key_ids[i]))
+
+        for i in self._candidates(text):
+            key_id = int(self.key_ids[i])
+            if key_id in matched:
+                continue
+            if SequenceMatcher(None, self.keywords[i], text).ratio() >= self.threshold:
+                matched.add(key_id)
+
+        return tuple(self.keys[k] for k in sorted(matched))
+
+    def present_keys(self, text: str) -> Tuple[str, ...]:
+        """
+        Keys with a keyword that is a substring of text. No fuzzy
+        pass and no memo, so it is cheap on whole-document text.
+        """
+        matched = {int(self.key_ids[i]) for i, kw in enumerate(self.keywords) if kw in text}
+        return tuple(self.keys[k] for k in sorted(matched))
+
+
+ACCOUNTING_INDEX = KeywordIndex(ACCOUNTING_KEYWORDS)
@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import threading
+
+from core.config import AUTOSAVE_FLUSH_MS
+from core.database import SessionLocal
+from models.cam import CAMReport
+from services.cam_service import apply_autosave
+
+logger = logging.getLogger("credit_engine.autosave")
+
+
+# ==========================================================
+# WRITE-BEHIND AUTOSAVE BUFFER
+# The dashboard autosaves each open CAM every few seconds.
+# Saves are merged per report_id in memory (later fields
+# win, like applying them in order) and a background task
+# writes the batch every AUTOSAVE_FLUSH_MS: one SELECT ... IN
+# and one commit for all reports, instead of a round trip
+# per save. Reads that must see the latest state (get, pdf,
+# submit, patch) flush their report first; the lifespan
+# flushes everything on shutdown. Writes use the sync
+# engine in a worker thread, off the event loop.
+# ==========================================================
+
+_pending = {}
+
+# report_ids taken by a flush that has not committed yet
+_flushing = set()
+
+# _lock guards _pending; _flush_lock keeps a report's read
+# from overtaking a flush that already took its save
+_lock = threading.Lock()
+_flush_lock = threading.Lock()
+
+_flusher = None
+
+_stats = {"saves": 0, "flushes": 0, "rows_written": 0}
+
+
+def is_buffering() -> bool:
+    """True while the flush task runs; otherwise saves are written directly."""
+    return _flusher is not None
+
+
+def queue_autosave(report_id: int, data: dict):
+
+    with _lock:
+        _pending.setdefault(report_id, {}).update(data)
+        _stats["saves"] += 1
+
+
+def discard_autosave(report_id: int):
+
+    with _lock:
+        _pending.pop(report_id, None)
+
+
+def flush_autosaves(report_ids=None) -> int:
+    """
+    Write pending saves - all of them, or only report_ids - in
+    one transaction. Returns the number of reports written. On
+    failure the saves go back in the buffer under any newer ones.
+    """
+
+    with _flush_lock:
+        with _lock:
+            ids = list(_pending) if report_ids is None else [r for r in report_ids if r in _pending]
+            batch = {report_id: _pending.pop(report_id) for report_id in ids}
+            _flushing.update(batch)
+
+        if not batch:
+            return 0
+
+        db = SessionLocal()
+        try:
+            reports = db.query(CAMReport).filter(
+                CAMReport.id.in_(batch),
+                CAMReport.is_deleted.is_(False),
+            ).all()
+
+            for report in reports:
+                apply_autosave(report, batch[report.id])
+
+            db.commit()
+
+        except Exception as e:
+            db.rollback()
+            with _lock:
+                for report_id, data in batch.items():
+                    _pending[report_id] = {**data, **_pending.get(report_id, {})}
+            logger.error(f"Autosave flush failed, {len(batch)} report(s) kept pending: {e}")
+            return 0
+
+        finally:
+            db.close()
+            with _lock:
+                _flushing.difference_update(batch)
+
+    missing = len(batch) - len(reports)
+    if missing:
+        logger.warning(f"Dropped autosaves for {missing} missing or deleted report(s)")
+
+    with _lock:
+        _stats["flushes"] += 1
+        _stats["rows_written"] += len(reports)
+
+    return len(reports)
+
+
+async def flush_report(report_id: int):
+    """
+    flush_autosaves for one report from async code. Returns at
+    once when the report has nothing pending or in flight.
+    """
+
+    with _lock:
+        busy = report_id in _pending or report_id in _flushing
+
+    if busy:
+        await asyncio.to_thread(flush_autosaves, [report_id])
+
+
+def autosave_stats() -> dict:
+
+    with _lock:
+        return {**_stats, "pending": len(_pending)}
+
+
+# ==========================================================
+# FLUSH TASK
+# ==========================================================
+
+async def _flush_loop():
+
+    while True:
+        await asyncio.sleep(AUTOSAVE_FLUSH_MS / 1000)
+        try:
+            await asyncio.to_thread(flush_autosaves)
+        except Exception as e:
+            logger.error(f"Autosave flush loop error: {e}")
+
+
+def start_autosave_flusher():
+
+    global _flusher
+
+    if _flusher is not None or AUTOSAVE_FLUSH_MS <= 0:
+        return
+
+    _flusher = asyncio.create_task(_flush_loop())
+
+    logger.info(f"Autosave buffer flushing every {AUTOSAVE_FLUSH_MS} ms")
+
+
+async def stop_autosave_flusher():
+
+    global _flusher
+
+    if _flusher is None:
+        return
+
+    _flusher.cancel()
+    await asyncio.gather(_flusher, return_exceptions=True)
+    _flusher = None
+
+    # Saves arriving from now on are written directly
+    await asyncio.to_thread(flush_autosaves)
+
+    logger.info(f"Autosave buffer flushed: {autosave_stats()}")
@@ -0,0 +1,104 @@
+import re
+from functools import lru_cache
+
+from services.banking_dictionary import (
+    CREDIT_KEYWORDS,
+    DEBIT_KEYWORDS,
+    EMI_KEYWORDS,
+    SALARY_KEYWORDS,
+    BOUNCE_KEYWORDS,
+    UPI_KEYWORDS,
+    CASH_DEPOSIT_KEYWORDS,
+)
+
+
+# ==========================================================
+# NARRATION CATEGORIES
+# Every keyword list in banking_dictionary, by category.
+# A narration carries a category when any of its keywords
+# occurs in it as a substring (case-insensitive).
+# ==========================================================
+
+CATEGORY_KEYWORDS = {
+    "credit": CREDIT_KEYWORDS,
+    "debit": DEBIT_KEYWORDS,
+    "emi": EMI_KEYWORDS,
+    "salary": SALARY_KEYWORDS,
+    "bounce": BOUNCE_KEYWORDS,
+    "upi": UPI_KEYWORDS,
+    "cash_deposit": CASH_DEPOSIT_KEYWORDS,
+}
+
+
+# ==========================================================
+# COMPILED MATCHER
+# All keywords are folded into one trie-shaped regex inside
+# a lookahead, so a single scan tries every start position
+# and returns the longest keyword found there. Each keyword
+# maps to the categories of every keyword it contains, so
+# shorter keywords hidden inside a longer match (e.g. "neft"
+# in "neft cr") still tag the narration.
+# ==========================================================
+
+def _trie_regex(words):
+
+    trie = {}
+
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node):
+        terminal = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+
+        if not branches:
+            return ""
+
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+        # Greedy optional keeps the longest keyword on this path
+        return "(?:" + body + ")?" if terminal else body
+
+    return build(trie)
+
+
+def _compile(category_keywords):
+
+    keyword_categories = {}
+
+    for category, keywords in category_keywords.items():
+        for kw in keywords:
+            keyword_categories.setdefault(kw.lower(), set()).add(category)
+
+    closure = {
+        kw: frozenset().union(*(cats for other, cats in keyword_categories.items() if other in kw))
+        for kw in keyword_categories
+    }
+
+    pattern = re.compile("(?=(" + _trie_regex(keyword_categories) + "))")
+
+    return pattern, closure
+
+
+_PATTERN, _CLOSURE = _compile(CATEGORY_KEYWORDS)
+
+
+# ==========================================================
+# PUBLIC API
+# ==========================================================
+
+@lru_cache(maxsize=65536)
+def classify_narration(text: str) -> frozenset:
+    """
+    Return every category whose keywords appear in the narration.
+    Repeated narrations are served from the cache.
+    """
+    found = frozenset()
+
+    for kw in _PATTERN.findall(str(text).lower()):
+        found |= _CLOSURE[kw]
+
+    return found
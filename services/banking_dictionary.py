@@ -173,6 +173,7 @@ DEBIT_KEYWORDS = [
 EMI_KEYWORDS = [
 
     "emi",
+    "loan",
     "loan emi",
     "nach",
     "ach debit",
@@ -214,3 +215,29 @@ BOUNCE_KEYWORDS = [
     "return charges",
     "payment returned"
 ]
+
+
+# ==========================================================
+# UPI / WALLET SPENDS
+# ==========================================================
+
+UPI_KEYWORDS = [
+
+    "upi",
+    "gpay",
+    "google pay",
+    "phonepe",
+    "paytm",
+    "amazon pay"
+]
+
+
+# ==========================================================
+# CASH DEPOSITS
+# ==========================================================
+
+CASH_DEPOSIT_KEYWORDS = [
+
+    "cash deposit",
+    "cash dep"
+]
@@ -1,8 +1,21 @@
+import asyncio
 import pdfplumber
 import re
-from io import BytesIO
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 
+from core.config import BANKING_SHARD_SIZE
+from core.executor import run_in_pool, ParserTimeoutError
+from core.uploads import open_document
+from services.pdf_page_extractor import extract_page
+from services.document_extractor import is_probably_scanned_pdf
+from services.ocr_pipeline import ocr_pdf_pages
+
+
+# Bump whenever a change alters parse output – it is part
+# of the parse-cache key, so stale results are never served.
+PARSER_VERSION = "3"
+
 
 # =====================================================
 # DATE PATTERNS
@@ -18,57 +31,147 @@ DATE_PATTERNS = [
 DATE_REGEX = re.compile("|".join(DATE_PATTERNS))
 
 
+# =====================================================
+# FAILURES
+# An unreadable PDF parses to [] ("no transactions").
+# Failures of the machinery - the pool, the staged file,
+# poppler / tesseract in the OCR fallback - say nothing
+# about the document, so they propagate instead: the
+# route reports an error and nothing is cached.
+# =====================================================
+
+INFRASTRUCTURE_ERRORS = (ParserTimeoutError, BrokenProcessPool, OSError, MemoryError)
+
+
 # =====================================================
 # MAIN ENTRY
 # =====================================================
 
-def parse_banking_file(file_bytes):
+def parse_banking_file(source, progress=None):
+
+    # progress: optional callable(pages_done, pages_total)
 
     transactions = []
 
     try:
 
-        with pdfplumber.open(BytesIO(file_bytes)) as pdf:
+        with open_document(source) as stream, pdfplumber.open(stream) as pdf:
 
-            for page in pdf.pages:
+            total_pages = len(pdf.pages)
 
-                # ======================================
-                # TABLE PARSING
-                # ======================================
+            for page_no, page in enumerate(pdf.pages, start=1):
 
-                tables = page.extract_tables()
+                merge_page_transactions(transactions, parse_page(page))
+                page.flush_cache()
 
-                if tables:
+                if progress:
+                    progress(page_no, total_pages)
 
-                    for table in tables:
+    except INFRASTRUCTURE_ERRORS:
+        raise
 
-                        for row in table:
+    except Exception:
+        return []
 
-                            txn = parse_table_row(row)
+    if not transactions:
+        return parse_scanned_banking_file(source, progress)
 
-                            if txn:
-                                transactions.append(txn)
+    return finalize_transactions(transactions)
 
-                # ======================================
-                # TEXT FALLBACK PARSING
-                # ======================================
 
-                text = page.extract_text()
+# =====================================================
+# SCANNED STATEMENTS
+# A PDF with no text layer yields no transactions from
+# pdfplumber; its pages are OCR'd and each page's text
+# goes through the same line parser as the text fallback.
+# =====================================================
 
-                if not text:
-                    continue
+def parse_scanned_banking_file(source, progress=None):
 
-                lines = text.split("\n")
+    if not is_probably_scanned_pdf(source):
+        return []
 
-                for line in lines:
+    transactions = []
 
-                    txn = parse_text_line(line, transactions)
+    for text in ocr_pdf_pages(source, progress=progress):
+        merge_page_transactions(transactions, parse_page_text(text))
 
-                    if txn:
-                        transactions.append(txn)
+    return finalize_transactions(transactions)
 
-    except Exception:
-        return []
+
+# =====================================================
+# PAGE PARSER
+# Page results are independent of other pages: a text
+# line with no DR/CR marker is left pending and its
+# direction resolved from the previous balance when the
+# page is merged, so pages can be parsed in any order.
+# =====================================================
+
+PENDING_AMOUNT = "_pending_amount"
+
+
+def parse_page(page):
+
+    page_txns = []
+
+    content = extract_page(page)
+
+    # ======================================
+    # TABLE PARSING
+    # ======================================
+
+    for table in content["tables"]:
+
+        for row in table:
+
+            txn = parse_table_row(row)
+
+            if txn:
+                page_txns.append(txn)
+
+    # ======================================
+    # TEXT FALLBACK PARSING
+    # ======================================
+
+    page_txns.extend(parse_page_text(content["text"]))
+
+    return page_txns
+
+
+def parse_page_text(text):
+
+    page_txns = []
+
+    for line in text.split("\n"):
+
+        txn = parse_text_line(line, None)
+
+        if txn:
+            page_txns.append(txn)
+
+    return page_txns
+
+
+def merge_page_transactions(transactions, page_txns):
+
+    for txn in page_txns:
+
+        if PENDING_AMOUNT in txn:
+
+            amount = txn.pop(PENDING_AMOUNT)
+
+            # Balance movement fallback
+            if transactions and txn["balance"] <= transactions[-1]["balance"]:
+                txn["debit"] = amount
+            else:
+                txn["credit"] = amount
+
+        transactions.append(txn)
+
+    return transactions
+
+
+def finalize_transactions(transactions):
 
     # ======================================
     # REMOVE DUPLICATES
@@ -85,6 +188,173 @@ def parse_banking_file(file_bytes):
     return transactions
 
 
+# =====================================================
+# PAGE-SHARDED MODE
+# Each shard opens the PDF independently in a pool
+# worker; shards are merged back in page order, so the
+# output is identical to parse_banking_file.
+# =====================================================
+
+def count_pdf_pages(source):
+
+    try:
+        with open_document(source) as stream, pdfplumber.open(stream) as pdf:
+            return len(pdf.pages)
+    except Exception:
+        return 0
+
+
+def parse_page_range(source, start, stop):
+
+    pages = []
+
+    with open_document(source) as stream, pdfplumber.open(stream) as pdf:
+
+        for page in pdf.pages[start:stop]:
+            pages.append(parse_page(page))
+            page.flush_cache()
+
+    return pages
+
+
+async def parse_banking_file_sharded(source, shard_size=None):
+
+    shard_size = BANKING_SHARD_SIZE if shard_size is None else shard_size
+
+    total_pages = await run_in_pool(count_pdf_pages, source)
+
+    if not shard_size or total_pages <= shard_size:
+        return await run_in_pool(parse_banking_file, source)
+
+    shards = [
+        run_in_pool(parse_page_range, source, start, min(start + shard_size, total_pages))
+        for start in range(0, total_pages, shard_size)
+    ]
+
+    try:
+        results = await asyncio.gather(*shards)
+    except INFRASTRUCTURE_ERRORS:
+        raise
+    except Exception:
+        return []
+
+    transactions = []
+
+    for shard_pages in results:
+        for page_txns in shard_pages:
+            merge_page_transactions(transactions, page_txns)
+
+    if not transactions:
+        return await run_in_pool(parse_scanned_banking_file, source)
+
+    return finalize_transactions(transactions)
+
+
+# =====================================================
+# STREAMING MODE
+# Yields transactions in statement order (not date-
+# sorted) as page shards come back from the parser pool,
+# a few shards ahead of the one being relayed. Duplicates
+# resolve like finalize_transactions - first position,
+# last copy - so each page is held back until the next
+# one is merged. A copy more than a page after the first
+# comes too late and is dropped.
+# =====================================================
+
+STREAM_SHARD_SIZE = 5
+
+STREAM_SHARDS_AHEAD = 2
+
+
+def new_stream_state():
+
+    return {"tail": [], "held": {}, "emitted": set()}
+
+
+def merge_stream_page(state, page_txns):
+    """
+    Merge one page into the stream and return the transactions
+    that can no longer be replaced (the previous page's).
+    """
+
+    start = len(state["tail"])
+    merged = merge_page_transactions(state["tail"], page_txns)
+    held = state["held"]
+    page = {}
+
+    for txn in merged[start:]:
+
+        key = (txn["date"], txn["balance"])
+
+        if key in state["emitted"]:
+            continue
+
+        if key in held:
+            held[key] = txn
+        else:
+            page[key] = txn
+
+    state["tail"] = merged[-1:]
+    state["emitted"].update(held)
+    state["held"] = page
+
+    return list(held.values())
+
+
+def flush_stream(state):
+
+    rest = list(state["held"].values())
+    state["emitted"].update(state["held"])
+    state["held"] = {}
+
+    return rest
+
+
+async def stream_banking_transactions(source, total_pages=None, shard_size=STREAM_SHARD_SIZE):
+
+    if total_pages is None:
+        total_pages = await run_in_pool(count_pdf_pages, source)
+
+    starts = iter(range(0, total_pages, shard_size))
+    in_flight = []
+
+    def submit_next():
+        start = next(starts, None)
+        if start is not None:
+            in_flight.append(asyncio.ensure_future(
+                run_in_pool(parse_page_range, source, start, min(start + shard_size, total_pages))
+            ))
+
+    for _ in range(STREAM_SHARDS_AHEAD):
+        submit_next()
+
+    state = new_stream_state()
+
+    try:
+
+        while in_flight:
+
+            shard_pages = await in_flight.pop(0)
+            submit_next()
+
+            for page_txns in shard_pages:
+                for txn in merge_stream_page(state, page_txns):
+                    yield txn
+
+    finally:
+
+        # Client went away or a shard failed
+        for task in in_flight:
+            task.cancel()
+
+    for txn in flush_stream(state):
+        yield txn
+
+    if not state["emitted"]:
+        for txn in await run_in_pool(parse_scanned_banking_file, source):
+            yield txn
+
+
 # =====================================================
 # TABLE ROW PARSER
 # =====================================================
@@ -162,12 +432,20 @@ def parse_text_line(line, transactions):
     # DR / CR DETECTION
     # ======================================
 
+    pending = False
+
     if "dr" in line_lower:
         debit = amount
 
     elif "cr" in line_lower:
         credit = amount
 
+    elif transactions is None:
+
+        # Direction depends on the previous balance – resolved
+        # later by merge_page_transactions
+        pending = True
+
     else:
 
         # Balance movement fallback
@@ -187,7 +465,7 @@ def parse_text_line(line, transactions):
 
     narration = clean_narration(line.replace(date, ""))
 
-    return {
+    txn = {
         "date": date,
         "description": narration,
         "debit": debit,
@@ -195,6 +473,11 @@ def parse_text_line(line, transactions):
         "balance": balance
     }
 
+    if pending:
+        txn[PENDING_AMOUNT] = amount
+
+    return txn
+
 
 # =====================================================
 # DATE HELPERS
@@ -1,7 +1,11 @@
-from collections import defaultdict
 from datetime import datetime
 import statistics
 
+import numpy as np
+import pandas as pd
+
+from services.banking_classifier import classify_narration
+
 
 # =========================================================
 # SAFE FLOAT
@@ -16,97 +20,130 @@ def safe_float(v):
 
 
 # =========================================================
-# MAIN BANKING ANALYZER
+# COLUMN HELPERS
 # =========================================================
 
-def analyze_banking(transactions):
+def to_float_array(values):
 
-    if not transactions:
-        return empty_response()
+    # Numeric columns convert in one shot; anything else
+    # (None, strings) goes through safe_float per value
+    arr = np.asarray(values)
+
+    if arr.dtype.kind in "biuf":
+        return arr.astype(float)
 
-    total_credit = 0
-    total_debit = 0
+    return np.fromiter((safe_float(v) for v in values), dtype=float, count=len(values))
 
-    credit_txn = 0
-    debit_txn = 0
 
-    salary_income = 0
-    emi_total = 0
-    upi_spend = 0
-    cash_deposit = 0
+def running_sum(arr):
 
-    bounce = 0
-    negative_balance = 0
+    # cumsum adds left to right like the old per-transaction
+    # loop (np.sum's pairwise order can differ in the last bit)
+    return float(np.cumsum(arr)[-1]) if len(arr) else 0
 
-    monthly_credit = defaultdict(float)
-    monthly_debit = defaultdict(float)
-    balances = []
 
-    dates = []
+def category_masks(narrations, categories):
+
+    # Classify each distinct narration once, then broadcast
+    # the per-narration tags back to every transaction
+    codes, unique_narrations = pd.factorize(narrations)
+
+    tags = [classify_narration(n) for n in unique_narrations]
+
+    return {
+        cat: np.array([cat in t for t in tags], dtype=bool)[codes]
+        for cat in categories
+    }
+
+
+# =========================================================
+# MAIN BANKING ANALYZER
+# =========================================================
+
+def analyze_banking(transactions):
+
+    if not transactions:
+        return empty_response()
 
     # =====================================================
-    # LOOP TRANSACTIONS
+    # COLUMNAR BUILD
+    # One pass to pull each field into an array; every
+    # metric below is a vectorized op over these columns.
     # =====================================================
 
-    for txn in transactions:
+    tagged = category_masks(
+        pd.Series([str(txn.get("description", "")) for txn in transactions], dtype=object),
+        ("salary", "cash_deposit", "emi", "upi", "bounce"),
+    )
+
+    credit = to_float_array([txn.get("credit") for txn in transactions])
+    debit = to_float_array([txn.get("debit") for txn in transactions])
+    balances = to_float_array([txn.get("balance") for txn in transactions])
+
+    date_values = [txn.get("date") for txn in transactions]
+
+    dates = [d for d in date_values if d]
 
-        desc = str(txn.get("description", "")).lower()
+    # --------------------------------------------------
+    # MONTHLY BUCKETS
+    # Dates repeat heavily, so parse each distinct value once
+    # --------------------------------------------------
 
-        credit = safe_float(txn.get("credit"))
-        debit = safe_float(txn.get("debit"))
-        balance = safe_float(txn.get("balance"))
+    date_codes, unique_dates = pd.factorize(pd.Series(date_values, dtype=object))
 
-        date_value = txn.get("date")
+    unique_months = [extract_month(d) for d in unique_dates]
 
-        month = extract_month(date_value)
+    month_codes, months = pd.factorize(
+        pd.Series(
+            [unique_months[c] if c >= 0 else None for c in date_codes],
+            dtype=object,
+        )
+    )
 
-        if month:
-            monthly_credit[month] += credit
-            monthly_debit[month] += debit
+    has_month = month_codes >= 0
 
-        if date_value:
-            dates.append(date_value)
+    # bincount accumulates in row order, same as a running sum
+    monthly_credit = dict(zip(months, np.bincount(
+        month_codes[has_month], weights=credit[has_month], minlength=len(months)
+    ).tolist()))
 
-        balances.append(balance)
+    monthly_debit = dict(zip(months, np.bincount(
+        month_codes[has_month], weights=debit[has_month], minlength=len(months)
+    ).tolist()))
 
-        total_credit += credit
-        total_debit += debit
+    # --------------------------------------------------
+    # TOTALS / COUNTS
+    # --------------------------------------------------
 
-        if credit > 0:
-            credit_txn += 1
+    total_credit = running_sum(credit)
+    total_debit = running_sum(debit)
 
-        if debit > 0:
-            debit_txn += 1
+    credit_txn = int(np.count_nonzero(credit > 0))
+    debit_txn = int(np.count_nonzero(debit > 0))
 
-        # --------------------------------------------------
-        # INCOME CLASSIFICATION
-        # --------------------------------------------------
+    # --------------------------------------------------
+    # INCOME CLASSIFICATION
+    # --------------------------------------------------
 
-        if "salary" in desc:
-            salary_income += credit
+    salary_income = running_sum(credit[tagged["salary"]])
 
-        if "cash deposit" in desc:
-            cash_deposit += credit
+    cash_deposit = running_sum(credit[tagged["cash_deposit"]])
 
-        # --------------------------------------------------
-        # EXPENSE CLASSIFICATION
-        # --------------------------------------------------
+    # --------------------------------------------------
+    # EXPENSE CLASSIFICATION
+    # --------------------------------------------------
 
-        if "emi" in desc or "loan" in desc:
-            emi_total += debit
+    emi_total = running_sum(debit[tagged["emi"]])
 
-        if "upi" in desc or "gpay" in desc or "phonepe" in desc:
-            upi_spend += debit
+    upi_spend = running_sum(debit[tagged["upi"]])
 
-        # --------------------------------------------------
-        # BEHAVIOR FLAGS
-        # --------------------------------------------------
+    # --------------------------------------------------
+    # BEHAVIOR FLAGS
+    # --------------------------------------------------
 
-        if "return" in desc or "bounce" in desc:
-            bounce += 1
+    bounce = int(np.count_nonzero(tagged["bounce"]))
 
-        if balance < 0:
-            negative_balance += 1
+    negative_balance = int(np.count_nonzero(balances < 0))
 
     # =====================================================
     # SUMMARY METRICS
@@ -118,9 +155,11 @@ def analyze_banking(transactions):
 
     salary_dependency = safe_divide(salary_income, total_credit) * 100
 
-    avg_balance = statistics.mean(balances) if balances else 0
+    # statistics.mean sums exactly; fmean (or np.mean) can
+    # differ from the per-transaction version in the last cent
+    avg_balance = statistics.mean(balances.tolist()) if len(balances) else 0
 
-    median_balance = statistics.median(balances) if balances else 0
+    median_balance = float(np.median(balances)) if len(balances) else 0
 
     # =====================================================
     # CASH FLOW STABILITY
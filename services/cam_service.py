@@ -1,169 +1,439 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+import base64
+import json
+import logging
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy import and_, desc, inspect, or_, select, text, update
+from core.database import engine
 from models.cam import CAMReport
+from utils.json_patch import PatchError, apply_patch
+
+logger = logging.getLogger("credit_engine.cam")
+
+# ======================================================
+# All CRUD here is async and runs on core.database's
+# AsyncSession; only ensure_cam_schema (startup) uses the
+# sync engine.
+# ======================================================
+
+# Columns the dashboard listing needs – the JSON analysis
+# blobs are never selected
+SUMMARY_COLUMNS = (
+    CAMReport.id,
+    CAMReport.customer_name,
+    CAMReport.status,
+    CAMReport.created_at,
+)
 
 
 # ======================================================
 # CREATE CAM REPORT
 # ======================================================
 
-def create_cam_report(data, db: Session):
+async def create_cam_report(data: dict, db: AsyncSession) -> CAMReport:
 
     report = CAMReport(
-        customer_name=data.customer_name,
-        wc_data=data.wc_data,
-        agri_data=data.agri_data,
-        banking_data=data.banking_data,
-        loan_amount=data.loan_amount,
-        analyst_name=data.analyst_name
+        customer_name=data["customer_name"],
+        analyst_name=data.get("analyst_name", "System"),
+        loan_amount=data.get("loan_amount", 0),
+        wc_data=data.get("wc_data", {}),
+        agri_data=data.get("agri_data", {}),
+        banking_data=data.get("banking_data", {}),
+        status="Draft",
+        created_at=datetime.utcnow(),
     )
 
     db.add(report)
-    db.commit()
-    db.refresh(report)
+    await db.commit()
+    await db.refresh(report)
 
     return report
 
 
 # ======================================================
-# AUTOSAVE CAM REPORT
+# OPTIMISTIC CONCURRENCY
+# CAMReport.version is the mapper's version_id_col. Writes
+# that carry the version the client last saw go out as one
+# conditional UPDATE ... WHERE id = :id AND version = :v; no
+# row is read or locked first. Zero rows updated means the
+# report is gone (404) or was changed by someone else (409).
 # ======================================================
 
-def autosave_cam_report(report_id: int, data, db: Session):
+class VersionConflict(Exception):
+    """The report was modified after the version the client sent."""
+
+    def __init__(self, current_version: int):
+        super().__init__(f"Report was modified (current version {current_version})")
+        self.current_version = current_version
+
 
-    report = (
-        db.query(CAMReport)
-        .filter(CAMReport.id == report_id, CAMReport.is_deleted is False)
-        .first()
+async def current_version(report_id: int, db: AsyncSession):
+
+    return await db.scalar(
+        select(CAMReport.version)
+        .where(CAMReport.id == report_id, CAMReport.is_deleted.is_(False))
+    )
+
+
+async def conditional_update(report_id: int, expected_version: int, values: dict, db: AsyncSession):
+    """
+    Returns the new version, or None when the report does not
+    exist. Raises VersionConflict when expected_version is stale.
+    """
+
+    result = await db.execute(
+        update(CAMReport)
+        .where(
+            CAMReport.id == report_id,
+            CAMReport.version == expected_version,
+            CAMReport.is_deleted.is_(False),
+        )
+        .values(**values, version=expected_version + 1)
+        .execution_options(synchronize_session=False)
     )
 
+    if result.rowcount == 1:
+        await db.commit()
+        return expected_version + 1
+
+    await db.rollback()
+
+    # Only the failure path reads the row, to tell 404 from 409
+    version = await current_version(report_id, db)
+    if version is None:
+        return None
+
+    raise VersionConflict(version)
+
+
+async def commit_versioned(report: CAMReport, db: AsyncSession) -> int:
+    """
+    Commit ORM changes to a report and return its new version.
+    The version check happens in the flush; losing the race to
+    another writer raises VersionConflict.
+    """
+
+    report_id = report.id
+
+    try:
+        await db.flush()
+    except StaleDataError:
+        await db.rollback()
+        raise VersionConflict(await current_version(report_id, db))
+
+    version = report.version
+    await db.commit()
+
+    return version
+
+
+# ======================================================
+# FULL-STATE AUTOSAVE
+# Fields present in the payload replace the stored values.
+# Shared by the direct write and the autosave buffer flush.
+# ======================================================
+
+AUTOSAVE_FIELDS = (
+    "customer_name",
+    "analyst_name",
+    "loan_amount",
+    "wc_data",
+    "agri_data",
+    "banking_data",
+    "credit_grade",
+    "remarks",
+)
+
+
+def autosave_values(data: dict) -> dict:
+
+    return {field: data[field] for field in AUTOSAVE_FIELDS if field in data}
+
+
+def apply_autosave(report: CAMReport, data: dict):
+    """Assign the payload's fields; the flush bumps version."""
+
+    for field, value in autosave_values(data).items():
+        setattr(report, field, value)
+
+
+async def autosave_cam_report(report_id: int, data: dict, db: AsyncSession):
+    """Returns the new version, or None when the report does not exist."""
+
+    report = await get_cam_report(report_id, db)
+
     if not report:
         return None
 
-    if data.wc_data is not None:
-        report.wc_data = data.wc_data
+    apply_autosave(report, data)
+
+    return await commit_versioned(report, db)
+
 
-    if data.agri_data is not None:
-        report.agri_data = data.agri_data
+# ======================================================
+# PATCH AUTOSAVE
+# JSON sections take a JSON Patch (list of operations) or a
+# Merge Patch (object) and are patched in Python against the
+# loaded row. A column is only assigned when its value really
+# changed, so the UPDATE carries just the dirty columns - an
+# edit to remarks never rewrites the JSON blobs. version only
+# moves when something was written.
+# ======================================================
 
-    if data.banking_data is not None:
-        report.banking_data = data.banking_data
+PATCHABLE_JSON = ("wc_data", "agri_data", "banking_data")
 
-    if data.loan_amount is not None:
-        report.loan_amount = data.loan_amount
+PATCHABLE_FIELDS = ("customer_name", "analyst_name", "loan_amount", "credit_grade", "remarks")
 
-    if hasattr(data, "credit_grade") and data.credit_grade is not None:
-        report.credit_grade = data.credit_grade
 
-    if hasattr(data, "remarks") and data.remarks is not None:
-        report.remarks = data.remarks
+async def patch_cam_report(report_id: int, patch: dict, db: AsyncSession, expected_version: int = None):
+    """
+    Returns (version, changed_columns), or (None, []) when the
+    report does not exist. Raises utils.json_patch.PatchError
+    for a malformed patch or unknown field, and VersionConflict
+    when expected_version is given and stale.
+    """
 
-    if hasattr(data, "status") and data.status is not None:
-        report.status = data.status
+    unknown = set(patch) - set(PATCHABLE_JSON) - set(PATCHABLE_FIELDS)
+    if unknown:
+        raise PatchError(f"Unknown field(s): {', '.join(sorted(unknown))}")
 
-    db.commit()
+    report = await get_cam_report(report_id, db)
 
-    return report
+    if not report:
+        return None, []
+
+    if expected_version is not None and report.version != expected_version:
+        raise VersionConflict(report.version)
+
+    updates = {}
+
+    for column in PATCHABLE_JSON:
+        if column in patch:
+            updates[column] = apply_patch(getattr(report, column) or {}, patch[column])
+
+    for column in PATCHABLE_FIELDS:
+        if column in patch:
+            updates[column] = patch[column]
+
+    changed = [c for c, v in updates.items() if getattr(report, c) != v]
+
+    if not changed:
+        return report.version, changed
+
+    for column in changed:
+        setattr(report, column, updates[column])
+
+    return await commit_versioned(report, db), changed
+
+
+# ======================================================
+# SCHEMA
+# cam_reports predates the version column; add it in place
+# on startup (there are no migrations in this service).
+# ======================================================
+
+def ensure_cam_schema():
+
+    if not inspect(engine).has_table(CAMReport.__tablename__):
+        CAMReport.__table__.create(bind=engine, checkfirst=True)
+        return
+
+    columns = {c["name"] for c in inspect(engine).get_columns(CAMReport.__tablename__)}
+
+    if "version" not in columns:
+        with engine.begin() as conn:
+            conn.execute(text(
+                "ALTER TABLE cam_reports ADD COLUMN version INTEGER NOT NULL DEFAULT 1"
+            ))
+        logger.info("Added version column to cam_reports")
 
 
 # ======================================================
 # SUBMIT CAM REPORT
 # ======================================================
 
-def submit_cam_report(report_id: int, data, db: Session):
+async def submit_cam_report(report_id: int, data: dict, db: AsyncSession, expected_version: int = None):
+    """
+    Returns the new version, or None when the report does not
+    exist. Raises VersionConflict when expected_version is stale.
+    """
 
-    report = (
-        db.query(CAMReport)
-        .filter(CAMReport.id == report_id, CAMReport.is_deleted is False)
-        .first()
-    )
+    report = await get_cam_report(report_id, db)
 
     if not report:
         return None
 
-    report.credit_grade = data.credit_grade
-    report.remarks = data.remarks
-    report.status = "Submitted"
+    if expected_version is not None and report.version != expected_version:
+        raise VersionConflict(report.version)
 
-    if hasattr(data, "approved_limit") and data.approved_limit:
-        report.recommended_limit = data.approved_limit
+    report.status = "Submitted"
+    report.credit_grade = data.get("credit_grade", report.credit_grade)
+    report.remarks = data.get("remarks", report.remarks)
 
-    db.commit()
+    if data.get("approved_limit"):
+        report.recommended_limit = data["approved_limit"]
 
-    return report
+    return await commit_versioned(report, db)
 
 
 # ======================================================
 # GET SINGLE CAM REPORT
 # ======================================================
 
-def get_cam_report(report_id: int, db: Session):
+async def get_cam_report(report_id: int, db: AsyncSession):
 
-    return (
-        db.query(CAMReport)
-        .filter(CAMReport.id == report_id, CAMReport.is_deleted is False)
-        .first()
+    return await db.scalar(
+        select(CAMReport)
+        .where(CAMReport.id == report_id, CAMReport.is_deleted.is_(False))
     )
 
 
 # ======================================================
 # GET ALL CAM REPORTS
+# Summary columns only, newest id first; list_cam_reports
+# pages through the same rows.
 # ======================================================
 
-def get_all_cam_reports(skip: int, limit: int, search: str, db: Session):
+async def get_all_cam_reports(db: AsyncSession, search: str = None):
 
-    query = db.query(CAMReport).filter(CAMReport.is_deleted is False)
+    query = select(*SUMMARY_COLUMNS).where(CAMReport.is_deleted.is_(False))
 
     if search:
-        query = query.filter(
-            CAMReport.customer_name.ilike(f"%{search}%")
-        )
+        query = query.where(CAMReport.customer_name.ilike(f"%{search}%"))
+
+    result = await db.execute(query.order_by(desc(CAMReport.id)))
+
+    return result.all()
+
+
+# ======================================================
+# LIST CAM REPORTS (KEYSET PAGINATION)
+# Newest first by (created_at, id). The cursor is the last
+# row's (created_at, id), so each page is one index range
+# scan on idx_cam_created_at however deep the listing goes.
+# The customer_name prefix is escaped and bound as a single
+# 'prefix%' value, so the planner sees a constant prefix and
+# can turn the LIKE into a range scan on
+# idx_cam_customer_status. On Postgres that needs a C-collated
+# column or the index's text_pattern_ops (set in models.cam
+# for new tables; add it by hand to an existing index).
+# ======================================================
+
+def encode_cursor(created_at, report_id: int) -> str:
+
+    raw = json.dumps([created_at.isoformat(), report_id]).encode()
 
-    total = query.count()
+    return base64.urlsafe_b64encode(raw).decode()
 
-    reports = (
+
+def decode_cursor(cursor: str):
+    """Raises ValueError for a cursor this service did not issue."""
+
+    try:
+        created_at, report_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), int(report_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def like_prefix(prefix: str) -> str:
+    """prefix with its LIKE wildcards escaped by "/", plus a trailing %."""
+
+    escaped = prefix.replace("/", "//").replace("%", "/%").replace("_", "/_")
+
+    return escaped + "%"
+
+
+def serialize_summary(row) -> dict:
+
+    return {
+        "id": row.id,
+        "customer_name": row.customer_name,
+        "status": row.status,
+        "created_at": row.created_at,
+    }
+
+
+async def list_cam_reports(
+    db: AsyncSession,
+    limit: int = 50,
+    cursor: str = None,
+    status: str = None,
+    customer_prefix: str = None,
+    created_from: datetime = None,
+    created_to: datetime = None,
+):
+    """
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    created_from is inclusive, created_to exclusive.
+    """
+
+    query = select(*SUMMARY_COLUMNS).where(CAMReport.is_deleted.is_(False))
+
+    if status:
+        query = query.where(CAMReport.status == status)
+
+    if customer_prefix:
+        query = query.where(CAMReport.customer_name.like(like_prefix(customer_prefix), escape="/"))
+
+    if created_from:
+        query = query.where(CAMReport.created_at >= created_from)
+
+    if created_to:
+        query = query.where(CAMReport.created_at < created_to)
+
+    if cursor:
+        created_at, report_id = decode_cursor(cursor)
+        query = query.where(or_(
+            CAMReport.created_at < created_at,
+            and_(CAMReport.created_at == created_at, CAMReport.id < report_id),
+        ))
+
+    # One extra row tells whether another page exists
+    result = await db.execute(
         query
-        .order_by(desc(CAMReport.created_at))
-        .offset(skip)
-        .limit(limit)
-        .all()
+        .order_by(desc(CAMReport.created_at), desc(CAMReport.id))
+        .limit(limit + 1)
     )
+    rows = result.all()
 
-    return total, reports
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    return rows, next_cursor
 
 
 # ======================================================
 # SOFT DELETE CAM REPORT
 # ======================================================
 
-def delete_cam_report(report_id: int, db: Session):
+async def delete_cam_report(report_id: int, db: AsyncSession):
+    """Returns the new version, or None when the report does not exist."""
 
-    report = (
-        db.query(CAMReport)
-        .filter(CAMReport.id == report_id, CAMReport.is_deleted is False)
-        .first()
-    )
+    report = await get_cam_report(report_id, db)
 
     if not report:
         return None
 
     report.is_deleted = True
 
-    db.commit()
-
-    return report
+    return await commit_versioned(report, db)
 
 
 # ======================================================
 # RESTORE CAM REPORT
 # ======================================================
 
-def restore_cam_report(report_id: int, db: Session):
+async def restore_cam_report(report_id: int, db: AsyncSession):
+    """Returns the new version, or None when no deleted report matches."""
 
-    report = (
-        db.query(CAMReport)
-        .filter(CAMReport.id == report_id, CAMReport.is_deleted is True)
-        .first()
+    report = await db.scalar(
+        select(CAMReport)
+        .where(CAMReport.id == report_id, CAMReport.is_deleted.is_(True))
     )
 
     if not report:
@@ -171,6 +441,4 @@ def restore_cam_report(report_id: int, db: Session):
 
     report.is_deleted = False
 
-    db.commit()
-
-    return report
+    return await commit_versioned(report, db)
@@ -1,23 +1,24 @@
 from __future__ import annotations
 
-from io import BytesIO
 from typing import List
 
 import pdfplumber
 from PIL import Image
 
+from core.uploads import UploadHandle, open_document
+
 try:
-    from pdf2image import convert_from_bytes
+    from pdf2image import convert_from_bytes, convert_from_path
 except Exception:
-    convert_from_bytes = None
+    convert_from_bytes = convert_from_path = None
 
 
-def extract_text_from_pdf_bytes(pdf_bytes: bytes) -> str:
+def extract_text_from_pdf_bytes(pdf_bytes) -> str:
     """
     Extract selectable text from PDF (non-scanned).
     """
     texts: List[str] = []
-    with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
+    with open_document(pdf_bytes) as stream, pdfplumber.open(stream) as pdf:
         for page in pdf.pages:
             t = page.extract_text() or ""
             if t.strip():
@@ -25,13 +26,27 @@ def extract_text_from_pdf_bytes(pdf_bytes: bytes) -> str:
     return "\n".join(texts).strip()
 
 
-def is_probably_scanned_pdf(pdf_bytes: bytes, min_chars: int = 50) -> bool:
+def is_probably_scanned_pdf(pdf_bytes, min_chars: int = 50) -> bool:
     """
     Heuristic: if the PDF has very little selectable text, treat it as scanned.
     """
     return len(extract_text_from_pdf_bytes(pdf_bytes) or "") < min_chars
 
 
+def is_probably_scanned_text(page_texts: List[str], min_chars: int = 50) -> bool:
+    """
+    Same heuristic as is_probably_scanned_pdf, for callers that already
+    extracted each page's text.
+    """
+    text = "\n".join(t for t in page_texts if (t or "").strip()).strip()
+    return len(text) < min_chars
+
+
+def pdf_page_count(pdf_bytes) -> int:
+    with open_document(pdf_bytes) as stream, pdfplumber.open(stream) as pdf:
+        return len(pdf.pages)
+
+
 def pdf_to_images(pdf_bytes: bytes, dpi: int = 250) -> List[Image.Image]:
     """
     Convert PDF bytes to a list of PIL Images (one per page).
@@ -40,3 +55,15 @@ def pdf_to_images(pdf_bytes: bytes, dpi: int = 250) -> List[Image.Image]:
     if convert_from_bytes is None:
         raise RuntimeError("pdf2image not available (install pdf2image + poppler-utils).")
     return convert_from_bytes(pdf_bytes, dpi=dpi)
+
+
+def pdf_page_to_image(pdf_bytes, page_no: int, dpi: int = 250) -> Image.Image:
+    """
+    Rasterize a single 1-based page, so only one page is held in memory.
+    An UploadHandle is read by poppler straight from its staged file.
+    """
+    if convert_from_bytes is None:
+        raise RuntimeError("pdf2image not available (install pdf2image + poppler-utils).")
+    if isinstance(pdf_bytes, UploadHandle):
+        return convert_from_path(pdf_bytes.path, dpi=dpi, first_page=page_no, last_page=page_no)[0]
+    return convert_from_bytes(pdf_bytes, dpi=dpi, first_page=page_no, last_page=page_no)[0]
@@ -0,0 +1,84 @@
+from itertools import islice
+from typing import List
+
+import pandas as pd
+from openpyxl import load_workbook
+
+
+# ==========================================================
+# EXCEL SHEET READERS
+# .xlsx is streamed with openpyxl in read-only mode, so a
+# sheet's head can be sampled without loading the sheet and
+# only the sheets that are parsed get a DataFrame. Legacy
+# .xls goes through pandas/xlrd (nrows for the head).
+# Both produce the same frames as pd.ExcelFile.parse(sheet,
+# header=None).
+# ==========================================================
+
+# ZIP (xlsx) and OLE2 (xls) signatures
+_ZIP_MAGIC = b"PK\x03\x04"
+
+
+def _convert_cell(value):
+    # Same normalisation pandas applies to openpyxl cells
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _trim(rows: List[list]) -> List[list]:
+    # pandas drops trailing empty rows and trailing empty cells
+    out = []
+    for row in rows:
+        while row and row[-1] is None:
+            row.pop()
+        out.append(row)
+    while out and not out[-1]:
+        out.pop()
+    return out
+
+
+class OpenpyxlSheets:
+
+    def __init__(self, stream):
+        self.book = load_workbook(stream, read_only=True, data_only=True)
+        self.sheet_names = self.book.sheetnames
+
+    def _rows(self, sheet, limit=None):
+        rows = self.book[sheet].iter_rows(values_only=True)
+        for row in islice(rows, limit):
+            yield [_convert_cell(v) for v in row]
+
+    def head(self, sheet: str, n: int) -> List[list]:
+        return list(self._rows(sheet, n))
+
+    def frame(self, sheet: str) -> pd.DataFrame:
+        return pd.DataFrame(_trim(list(self._rows(sheet))))
+
+    def close(self):
+        self.book.close()
+
+
+class PandasSheets:
+
+    def __init__(self, stream):
+        self.book = pd.ExcelFile(stream)
+        self.sheet_names = self.book.sheet_names
+
+    def head(self, sheet: str, n: int) -> List[list]:
+        df = self.book.parse(sheet, header=None, nrows=n)
+        return df.astype(object).where(df.notna(), None).values.tolist()
+
+    def frame(self, sheet: str) -> pd.DataFrame:
+        return self.book.parse(sheet, header=None)
+
+    def close(self):
+        self.book.close()
+
+
+def open_sheets(stream):
+    magic = stream.read(4)
+    stream.seek(0)
+    if magic == _ZIP_MAGIC:
+        return OpenpyxlSheets(stream)
+    return PandasSheets(stream)
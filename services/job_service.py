@@ -0,0 +1,444 @@
+import asyncio
+import hashlib
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from functools import partial
+
+from sqlalchemy import inspect, or_, text, update
+
+from core.config import JOB_HEARTBEAT_INTERVAL, JOB_STALE_AFTER, JOB_TASK_TIMEOUT, JOB_WORKERS
+from core.database import SessionLocal, engine
+from core.executor import run_in_pool
+from core.uploads import stage_bytes
+from models.job import ParseJob
+from services.banking_parser import parse_banking_file
+from services.banking_service import analyze_banking
+from services.wc_parser import parse_financial_file
+from services.wc_service import calculate_wc_logic
+from services.wc_required_fields import WC_REQUIRED_INPUT_FIELDS
+from services.wc_missing import find_missing_fields_present_only
+
+logger = logging.getLogger("credit_engine.jobs")
+
+TERMINAL_STATUSES = ("done", "failed")
+
+# Idle workers re-check the queue at least this often (seconds)
+JOB_POLL_INTERVAL = 2.0
+
+# Identifies this process on the jobs it claims
+WORKER_ID = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"[-64:]
+
+
+def _now():
+
+    return datetime.now(timezone.utc)
+
+
+# ======================================================
+# JOB RUNNERS
+# Executed inside the parser pool worker processes, so
+# they must stay module-level (picklable).
+# ======================================================
+
+def update_job_progress(job_id: str, pages_done: int, pages_total: int):
+
+    db = SessionLocal()
+
+    try:
+        db.execute(
+            update(ParseJob)
+            .where(ParseJob.id == job_id)
+            .values(pages_done=pages_done, pages_total=pages_total)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def run_banking_job(job_id: str, source, filename: str):
+
+    transactions = parse_banking_file(
+        source,
+        progress=partial(update_job_progress, job_id),
+    )
+
+    if not transactions:
+        raise ValueError("No transactions detected in file")
+
+    return {
+        "source": "file_upload",
+        "file_name": filename,
+        "transactions_extracted": len(transactions),
+        "data": analyze_banking(transactions),
+    }
+
+
+def run_wc_job(job_id: str, source, filename: str):
+
+    parsed_data = parse_financial_file(
+        source,
+        filename,
+        progress=partial(update_job_progress, job_id),
+    )
+
+    result = calculate_wc_logic(parsed_data)
+
+    inputs = parsed_data.get("inputs", {}) or {}
+    missing_fields, present_fields = find_missing_fields_present_only(
+        inputs, WC_REQUIRED_INPUT_FIELDS
+    )
+
+    return {
+        "file_name": filename,
+        "data": result,
+        "missing_fields": missing_fields,
+        "missing_fields_count": len(missing_fields),
+        "present_fields": present_fields,
+        "manual_template": {k: 0 for k in missing_fields},
+        "skipped_pages": parsed_data.get("skipped_pages", []),
+    }
+
+
+JOB_RUNNERS = {
+    "banking": run_banking_job,
+    "wc": run_wc_job,
+}
+
+
+# ======================================================
+# SUBMIT / READ
+# ======================================================
+
+def _extension(filename) -> str:
+
+    return os.path.splitext(filename or "")[1].lower()
+
+
+def submit_job(kind: str, filename: str, file_bytes: bytes, db):
+    """
+    Queue a parse job. If the same file was already parsed (or is
+    being parsed) for this kind and extension, the existing job is
+    returned so a retried upload never parses twice. The extension
+    is part of the key because it picks the parser: the same bytes
+    uploaded as .csv and as .txt are different jobs.
+    """
+    file_hash = hashlib.sha256(file_bytes).hexdigest()
+    extension = _extension(filename)
+
+    # id/filename only - the candidates may still hold their payload
+    candidates = (
+        db.query(ParseJob.id, ParseJob.filename)
+        .filter(
+            ParseJob.kind == kind,
+            ParseJob.file_hash == file_hash,
+            ParseJob.status != "failed",
+        )
+        .order_by(ParseJob.created_at.desc())
+        .all()
+    )
+
+    for candidate in candidates:
+        if _extension(candidate.filename) == extension:
+            return get_job(candidate.id, db)
+
+    job = ParseJob(
+        id=uuid.uuid4().hex,
+        kind=kind,
+        filename=filename,
+        file_hash=file_hash,
+        payload=file_bytes,
+        status="queued",
+        pages_done=0,
+    )
+
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+
+    wake_job_workers()
+
+    return job
+
+
+def get_job(job_id: str, db):
+
+    return db.query(ParseJob).filter(ParseJob.id == job_id).first()
+
+
+def serialize_job(job: ParseJob) -> dict:
+
+    return {
+        "job_id": job.id,
+        "kind": job.kind,
+        "file_name": job.filename,
+        "status": job.status,
+        "pages_done": job.pages_done or 0,
+        "pages_total": job.pages_total,
+        "result": job.result,
+        "error": job.error,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+    }
+
+
+# ======================================================
+# QUEUE STATE TRANSITIONS
+# Each opens its own short-lived session; called from
+# worker tasks via asyncio.to_thread.
+# ======================================================
+
+def claim_next_job():
+
+    db = SessionLocal()
+
+    try:
+        candidate = (
+            db.query(ParseJob.id)
+            .filter(ParseJob.status == "queued")
+            .order_by(ParseJob.created_at)
+            .first()
+        )
+
+        if not candidate:
+            return None
+
+        # Conditional update so two workers never claim the same job
+        claimed = db.execute(
+            update(ParseJob)
+            .where(ParseJob.id == candidate.id, ParseJob.status == "queued")
+            .values(status="running", worker_id=WORKER_ID, heartbeat_at=_now())
+        ).rowcount
+        db.commit()
+
+        if not claimed:
+            return None
+
+        job = get_job(candidate.id, db)
+
+        return job.id, job.kind, job.filename, job.payload
+    finally:
+        db.close()
+
+
+def finish_job(job_id: str, result=None, error: str = None):
+
+    db = SessionLocal()
+
+    try:
+        db.execute(
+            update(ParseJob)
+            .where(ParseJob.id == job_id)
+            .values(
+                status="failed" if error else "done",
+                result=result,
+                error=error,
+                payload=None,
+            )
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def requeue_running_jobs():
+    """
+    Hand this process's running jobs back to the queue. Jobs
+    claimed by other instances are left alone.
+    """
+
+    db = SessionLocal()
+
+    try:
+        db.execute(
+            update(ParseJob)
+            .where(ParseJob.status == "running", ParseJob.worker_id == WORKER_ID)
+            .values(status="queued", pages_done=0, worker_id=None)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def heartbeat_running_jobs():
+
+    db = SessionLocal()
+
+    try:
+        db.execute(
+            update(ParseJob)
+            .where(ParseJob.status == "running", ParseJob.worker_id == WORKER_ID)
+            .values(heartbeat_at=_now())
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def requeue_stale_jobs() -> int:
+    """
+    Requeue running jobs whose owner stopped sending heartbeats
+    (a crashed or killed instance, or a row from before the
+    heartbeat columns). Returns the number of jobs requeued.
+    """
+
+    db = SessionLocal()
+
+    try:
+        cutoff = _now() - timedelta(seconds=JOB_STALE_AFTER)
+
+        requeued = db.execute(
+            update(ParseJob)
+            .where(
+                ParseJob.status == "running",
+                or_(ParseJob.heartbeat_at.is_(None), ParseJob.heartbeat_at < cutoff),
+            )
+            .values(status="queued", pages_done=0, worker_id=None)
+        ).rowcount
+        db.commit()
+    finally:
+        db.close()
+
+    if requeued:
+        logger.warning(f"Requeued {requeued} job(s) with a stale heartbeat")
+
+    return requeued
+
+
+# ======================================================
+# SCHEMA
+# parse_jobs predates the heartbeat columns; add them in
+# place on startup (there are no migrations in this service).
+# ======================================================
+
+def ensure_job_schema():
+
+    if not inspect(engine).has_table(ParseJob.__tablename__):
+        ParseJob.__table__.create(bind=engine, checkfirst=True)
+        return
+
+    columns = {c["name"] for c in inspect(engine).get_columns(ParseJob.__tablename__)}
+
+    with engine.begin() as conn:
+        if "worker_id" not in columns:
+            conn.execute(text("ALTER TABLE parse_jobs ADD COLUMN worker_id VARCHAR(64)"))
+        if "heartbeat_at" not in columns:
+            conn.execute(text(
+                "ALTER TABLE parse_jobs ADD COLUMN heartbeat_at "
+                + ("TIMESTAMP WITH TIME ZONE" if engine.dialect.name == "postgresql" else "DATETIME")
+            ))
+
+
+# ======================================================
+# BACKGROUND WORKERS
+# ======================================================
+
+_wakeup = None
+_workers = []
+_heartbeat = None
+
+
+def wake_job_workers():
+
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+async def _job_worker():
+
+    while True:
+
+        _wakeup.clear()
+
+        job = await asyncio.to_thread(claim_next_job)
+
+        if job is None:
+            try:
+                await asyncio.wait_for(_wakeup.wait(), JOB_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        job_id, kind, filename, payload = job
+        upload = None
+
+        try:
+            # Workers get a path to the staged payload, not a pickled copy
+            upload = await asyncio.to_thread(stage_bytes, payload)
+            payload = None
+
+            result = await run_in_pool(
+                JOB_RUNNERS[kind],
+                job_id,
+                upload,
+                filename,
+                timeout=JOB_TASK_TIMEOUT,
+            )
+            await asyncio.to_thread(finish_job, job_id, result)
+
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {str(e)}")
+            await asyncio.to_thread(finish_job, job_id, None, str(e)[:1000])
+
+        finally:
+            if upload is not None:
+                upload.remove()
+
+
+async def _heartbeat_loop():
+
+    # Keeps this process's jobs fresh and picks up jobs
+    # abandoned by instances that died mid-parse
+    while True:
+        await asyncio.sleep(JOB_HEARTBEAT_INTERVAL)
+        try:
+            await asyncio.to_thread(heartbeat_running_jobs)
+            if await asyncio.to_thread(requeue_stale_jobs):
+                wake_job_workers()
+        except Exception as e:
+            logger.error(f"Job heartbeat error: {e}")
+
+
+def start_job_workers(count: int = None):
+
+    global _wakeup, _heartbeat
+
+    if _workers:
+        return
+
+    ensure_job_schema()
+
+    # Jobs left "running" by a process that is gone. Jobs other
+    # live instances are running keep a fresh heartbeat.
+    requeue_stale_jobs()
+
+    _wakeup = asyncio.Event()
+
+    for _ in range(count or JOB_WORKERS):
+        _workers.append(asyncio.create_task(_job_worker()))
+
+    _heartbeat = asyncio.create_task(_heartbeat_loop())
+
+    logger.info(f"Started {len(_workers)} job worker(s)")
+
+
+async def stop_job_workers():
+
+    global _heartbeat
+
+    tasks = _workers + ([_heartbeat] if _heartbeat else [])
+
+    for task in tasks:
+        task.cancel()
+
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _workers.clear()
+    _heartbeat = None
+
+    # Jobs the cancelled workers were running go back to the
+    # queue for the next instance
+    await asyncio.to_thread(requeue_running_jobs)
+
+    logger.info("Job workers stopped")
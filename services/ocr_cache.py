@@ -0,0 +1,45 @@
+import hashlib
+import logging
+
+from PIL import Image
+
+from core.config import OCR_CACHE_MEMORY_MB, OCR_CACHE_DIR, OCR_CACHE_DISK_MB
+from services.parse_cache import MemoryLRUCache, DiskCache, TieredCache
+
+logger = logging.getLogger("credit_engine.cache")
+
+# Bump when a tesseract upgrade or preprocessing change
+# should invalidate every cached page.
+OCR_CACHE_VERSION = "1"
+
+
+# ==========================================================
+# PAGE KEY
+# sha256 of the preprocessed pixels (plus size and mode),
+# the source DPI, the tesseract config and the language.
+# Hashing after preprocessing means two uploads that render
+# to the same page share an entry, so a re-uploaded or
+# partially edited document only OCRs the changed pages.
+# ==========================================================
+
+def ocr_page_key(img: Image.Image, dpi, config: str, lang: str) -> str:
+    h = hashlib.sha256()
+    h.update(f"{img.mode}|{img.size[0]}x{img.size[1]}|{dpi}|{config}|{lang}|".encode("utf-8"))
+    h.update(img.tobytes())
+    return f"ocr-{OCR_CACHE_VERSION}-{h.hexdigest()}"
+
+
+def _build_ocr_cache():
+
+    backends = [MemoryLRUCache(int(OCR_CACHE_MEMORY_MB * 1024 * 1024))]
+
+    if OCR_CACHE_DIR:
+        try:
+            backends.append(DiskCache(OCR_CACHE_DIR, int(OCR_CACHE_DISK_MB * 1024 * 1024)))
+        except OSError as e:
+            logger.warning(f"OCR cache disk tier disabled: {str(e)}")
+
+    return TieredCache(backends)
+
+
+ocr_cache = _build_ocr_cache()
@@ -0,0 +1,203 @@
+import logging
+import os
+import threading
+import time
+from typing import Dict, List
+
+from PIL import Image
+import pytesseract
+
+from core.config import OCR_LANG
+from core.executor import register_worker_stats, worker_stats
+
+# Each engine is one OCR pool slot; stop it from also
+# spreading across every core through OpenMP. Must be set
+# before libtesseract loads (tesserocr) or is spawned.
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+try:
+    import tesserocr
+except Exception:
+    tesserocr = None
+
+logger = logging.getLogger("credit_engine.ocr")
+
+# psm 6: assume a uniform block of text
+OCR_CONFIG = "--oem 3 --psm 6"
+
+
+# ==========================================================
+# TESSERACT ENGINES
+# With tesserocr installed, every thread that runs OCR keeps
+# one initialized TessBaseAPI for its lifetime, so the
+# language model is loaded once per worker instead of once
+# per image, and pages are handed over in memory (no temp
+# file, no pipe). tesserocr releases the GIL while
+# recognizing, so the OCR thread pool runs engines in
+# parallel. Without it, pytesseract spawns a tesseract
+# process per call as before.
+# ==========================================================
+
+_local = threading.local()
+
+
+def backend() -> str:
+    return "tesserocr" if tesserocr is not None else "pytesseract"
+
+
+def _engine():
+    api = getattr(_local, "api", None)
+    if api is None:
+        api = tesserocr.PyTessBaseAPI(
+            lang=OCR_LANG,
+            psm=tesserocr.PSM.SINGLE_BLOCK,
+            oem=tesserocr.OEM.DEFAULT,
+        )
+        _local.api = api
+        logger.info(f"Tesseract engine started in {threading.current_thread().name}")
+    return api
+
+
+def _recognize(img: Image.Image, timeout: float):
+    api = _engine()
+    api.SetImage(img)
+    # Recognize takes milliseconds and returns False when cancelled
+    if not api.Recognize(int(timeout * 1000)):
+        api.Clear()
+        raise RuntimeError("Tesseract process timeout")
+    return api
+
+
+# ==========================================================
+# PER-WORKER STATS
+# Pages, tesseract seconds and pixels per OCR thread, so a
+# slow or idle worker is visible in ocr_worker_stats().
+# OCR runs inside parser pool workers; each one's stats come
+# back with its task results and pool_ocr_stats() gathers
+# them in the parent (GET /ocr/stats).
+# ==========================================================
+
+_stats: Dict[str, Dict] = {}
+_stats_lock = threading.Lock()
+
+
+def _record(img: Image.Image, seconds: float):
+    name = threading.current_thread().name
+    with _stats_lock:
+        s = _stats.setdefault(name, {"pages": 0, "seconds": 0.0, "pixels": 0})
+        s["pages"] += 1
+        s["seconds"] += seconds
+        s["pixels"] += img.size[0] * img.size[1]
+
+
+def ocr_worker_stats() -> Dict:
+    with _stats_lock:
+        workers = {
+            name: {
+                "pages": s["pages"],
+                "seconds": round(s["seconds"], 3),
+                "pages_per_second": round(s["pages"] / s["seconds"], 3) if s["seconds"] else None,
+                "megapixels_per_second": round(s["pixels"] / s["seconds"] / 1e6, 3) if s["seconds"] else None,
+            }
+            for name, s in _stats.items()
+        }
+    return {"backend": backend(), "workers": workers}
+
+
+register_worker_stats("ocr", ocr_worker_stats)
+
+
+def pool_ocr_stats() -> Dict:
+    """ocr_worker_stats of every parser pool worker, threads keyed "pid/thread"."""
+    workers = {
+        f"{pid}/{name}": s
+        for pid, stats in sorted(worker_stats("ocr").items())
+        for name, s in stats["workers"].items()
+    }
+    return {"backend": backend(), "workers": workers}
+
+
+# ==========================================================
+# OCR CALLS
+# ==========================================================
+
+def image_to_string(img: Image.Image, timeout: float = 0) -> str:
+    start = time.perf_counter()
+
+    if tesserocr is not None:
+        text = _recognize(img, timeout).GetUTF8Text()
+    else:
+        text = pytesseract.image_to_string(img, lang=OCR_LANG, config=OCR_CONFIG, timeout=timeout)
+
+    _record(img, time.perf_counter() - start)
+    return text
+
+
+def _word(text, left, top, width, height, line) -> Dict:
+    return {"text": text, "left": left, "top": top, "width": width, "height": height, "line": line}
+
+
+def _tesserocr_words(img: Image.Image, timeout: float) -> List[Dict]:
+    api = _recognize(img, timeout)
+    RIL = tesserocr.RIL
+
+    words = []
+    block = par = line = 0
+    it = api.GetIterator()
+
+    for w in tesserocr.iterate_level(it, RIL.WORD):
+        # line ids numbered like image_to_data's block/par/line
+        if w.IsAtBeginningOf(RIL.BLOCK):
+            block, par, line = block + 1, 0, 0
+        if w.IsAtBeginningOf(RIL.PARA):
+            par, line = par + 1, 0
+        if w.IsAtBeginningOf(RIL.TEXTLINE):
+            line += 1
+
+        text = (w.GetUTF8Text(RIL.WORD) or "").strip()
+        box = w.BoundingBox(RIL.WORD)
+        if not text or box is None:
+            continue
+
+        x0, y0, x1, y1 = box
+        words.append(_word(text, x0, y0, x1 - x0, y1 - y0, [block, par, line]))
+
+    return words
+
+
+def _pytesseract_words(img: Image.Image, timeout: float) -> List[Dict]:
+    data = pytesseract.image_to_data(
+        img, lang=OCR_LANG, config=OCR_CONFIG, timeout=timeout,
+        output_type=pytesseract.Output.DICT,
+    )
+
+    words = []
+    for i, text in enumerate(data["text"]):
+        text = (text or "").strip()
+        if not text or float(data["conf"][i]) < 0:
+            continue
+        words.append(_word(
+            text,
+            int(data["left"][i]),
+            int(data["top"][i]),
+            int(data["width"][i]),
+            int(data["height"][i]),
+            [int(data["block_num"][i]), int(data["par_num"][i]), int(data["line_num"][i])],
+        ))
+    return words
+
+
+def image_to_words(img: Image.Image, timeout: float = 0) -> List[Dict]:
+    """
+    Word boxes: {"text", "left", "top", "width", "height", "line"}
+    where "line" is the (block, paragraph, line) id.
+    """
+    start = time.perf_counter()
+
+    if tesserocr is not None:
+        words = _tesserocr_words(img, timeout)
+    else:
+        words = _pytesseract_words(img, timeout)
+
+    _record(img, time.perf_counter() - start)
+    return words
@@ -1,28 +1,52 @@
+import logging
 import re
+import time
 from io import BytesIO
 
-from PIL import Image, ImageOps, ImageEnhance
-import pytesseract
+from PIL import Image
 
+from core.config import OCR_LANG
+from services.ocr_engine import OCR_CONFIG, image_to_string
+from services.ocr_cache import ocr_cache, ocr_page_key
+from services.ocr_preprocess import preprocess_for_ocr
 
-def _preprocess(img: Image.Image) -> Image.Image:
-    img = img.convert("L")
-    img = ImageOps.autocontrast(img)
-    img = ImageEnhance.Contrast(img).enhance(2.0)
+logger = logging.getLogger("credit_engine.ocr")
 
-    # upscale improves OCR a lot on statements
-    w, h = img.size
-    img = img.resize((int(w * 2), int(h * 2)))
-    return img
 
+def cached_ocr_page(img: Image.Image, run, output: str = "", timeout: float = 0, dpi=None):
+    """
+    Preprocess a page and return (run(img, timeout), metrics). Results
+    are cached per preprocessed image, OCR settings and output kind,
+    so a page seen before never reaches tesseract.
+    """
+    img, metrics = preprocess_for_ocr(img, dpi=dpi)
+
+    config = f"{OCR_CONFIG} {output}".strip()
+    key = ocr_page_key(img, metrics["dpi"], config, OCR_LANG)
+    result = ocr_cache.get(key)
+    metrics["cached"] = result is not None
+
+    start = time.perf_counter()
+    if result is None:
+        result = run(img, timeout)
+        ocr_cache.set(key, result)
+    metrics["ocr_seconds"] = round(time.perf_counter() - start, 3)
+
+    logger.debug(f"OCR page: {metrics}")
+    return result, metrics
 
-def ocr_text_from_image_bytes(image_bytes: bytes) -> str:
-    img = Image.open(BytesIO(image_bytes))
-    img = _preprocess(img)
 
-    # psm 6: assume a uniform block of text
-    config = "--oem 3 --psm 6"
-    return pytesseract.image_to_string(img, config=config)
+def ocr_page(img: Image.Image, timeout: float = 0, dpi=None):
+    """OCR one page; returns (text, metrics)."""
+    return cached_ocr_page(img, image_to_string, timeout=timeout, dpi=dpi)
+
+
+def ocr_text_from_image(img: Image.Image, timeout: float = 0, dpi=None) -> str:
+    return ocr_page(img, timeout=timeout, dpi=dpi)[0]
+
+
+def ocr_text_from_image_bytes(image_bytes: bytes) -> str:
+    return ocr_text_from_image(Image.open(BytesIO(image_bytes)))
 
 _AMOUNT_RE = re.compile(r"-?\d+(?:,\d{2})*(?:,\d{3})*(?:\.\d+)?")
 
@@ -1,50 +1,133 @@
-import re
-from io import BytesIO
-
-from PIL import Image, ImageOps, ImageEnhance
-import pytesseract
-
-
-def _preprocess(img: Image.Image) -> Image.Image:
-    # convert to grayscale + increase contrast
-    img = img.convert("L")
-    img = ImageOps.autocontrast(img)
-    img = ImageEnhance.Contrast(img).enhance(2.0)
-    # enlarge for better OCR
-    w, h = img.size
-    img = img.resize((int(w * 2), int(h * 2)))
-    return img
-
-
-def ocr_text_from_image_bytes(image_bytes: bytes) -> str:
-    img = Image.open(BytesIO(image_bytes))
-    img = _preprocess(img)
-
-    # PSM 6 = assume a block of text; works ok for statements
-    config = "--oem 3 --psm 6"
-    return pytesseract.image_to_string(img, config=config)
-
-
-def extract_amount_from_line(line: str):
-    """
-    Extract the largest numeric token from a line.
-    Supports Indian comma format and (123) negatives.
-    """
-    s = str(line)
-    s = re.sub(r"\(([^)]+)\)", r"-\1", s)
-    matches = re.findall(r"-?\d+(?:,\d{2})*(?:,\d{3})*(?:\.\d+)?", s)
-    if not matches:
-        return None
-
-    vals = []
-    for m in matches:
-        m2 = m.replace(",", "")
-        try:
-            vals.append(float(m2))
-        except Exception:
-            pass
-
-    if not vals:
-        return None
-
-    return max(vals, key=lambda x: abs(x))
+from statistics import median
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+from PIL import Image
+
+from services.ocr_engine import image_to_words
+from services.ocr_image_extractor import cached_ocr_page
+
+
+# ==========================================================
+# WORD BOXES
+# One OCR pass per page. Each word is kept as
+# {"text", "left", "top", "width", "height", "line"} where
+# "line" is tesseract's (block, paragraph, line) id, so the
+# plain text can be rebuilt without a second OCR call.
+# ==========================================================
+
+def ocr_page_words(img: Image.Image, timeout: float = 0, dpi=None):
+    """OCR one page into word boxes; returns (words, metrics)."""
+    return cached_ocr_page(img, image_to_words, output="words", timeout=timeout, dpi=dpi)
+
+
+def words_to_text(words: List[Dict]) -> str:
+    """Rebuild image_to_string-style text from tesseract's own line ids."""
+    lines = []
+    current = None
+    for w in words:
+        if w["line"] != current:
+            lines.append([])
+            current = w["line"]
+        lines[-1].append(w["text"])
+    return "\n".join(" ".join(line) for line in lines)
+
+
+# ==========================================================
+# TABLE RECONSTRUCTION
+# 1. Rows:    words whose vertical centres lie within half a
+#             word height of each other.
+# 2. Cells:   neighbouring words in a row separated by less
+#             than one word height (an ordinary space).
+# 3. Columns: x-ranges covered by the cells of rows that have
+#             two or more cells; the blank gutters between
+#             them separate the columns. Single-cell rows
+#             (titles, notes) are left out so a wide heading
+#             cannot bridge the gutters.
+# ==========================================================
+
+def _center_y(w: Dict) -> float:
+    return w["top"] + w["height"] / 2
+
+
+def cluster_rows(words: List[Dict]) -> List[List[Dict]]:
+    if not words:
+        return []
+
+    tolerance = median(w["height"] for w in words) / 2
+    rows = []
+    row_center = None
+
+    for w in sorted(words, key=_center_y):
+        cy = _center_y(w)
+        if rows and abs(cy - row_center) <= tolerance:
+            rows[-1].append(w)
+            row_center += (cy - row_center) / len(rows[-1])
+        else:
+            rows.append([w])
+            row_center = cy
+
+    return [sorted(row, key=lambda w: w["left"]) for row in rows]
+
+
+def _row_cells(row: List[Dict], max_gap: float) -> List[Dict]:
+    cells = []
+    for w in row:
+        right = w["left"] + w["width"]
+        if cells and w["left"] - cells[-1]["right"] <= max_gap:
+            cells[-1]["text"] += " " + w["text"]
+            cells[-1]["right"] = max(cells[-1]["right"], right)
+        else:
+            cells.append({"text": w["text"], "left": w["left"], "right": right})
+    return cells
+
+
+def _column_spans(rows_cells: List[List[Dict]]) -> List[tuple]:
+    multi = [cells for cells in rows_cells if len(cells) > 1]
+    if not multi:
+        return []
+
+    width = max(c["right"] for cells in multi for c in cells) + 1
+    covered = np.zeros(width, dtype=bool)
+    for cells in multi:
+        for c in cells:
+            covered[c["left"]:c["right"]] = True
+
+    padded = np.concatenate(([False], covered, [False]))
+    edges = np.flatnonzero(np.diff(padded.astype(np.int8)))
+    return list(zip(edges[0::2], edges[1::2]))
+
+
+def _column_of(cell: Dict, spans: List[tuple]) -> int:
+    overlaps = [min(cell["right"], stop) - max(cell["left"], start) for start, stop in spans]
+    best = int(np.argmax(overlaps))
+    if overlaps[best] > 0:
+        return best
+    # outside every span: nearest column by left edge
+    return int(np.argmin([abs(cell["left"] - start) for start, _stop in spans]))
+
+
+def words_to_table(words: List[Dict]) -> pd.DataFrame:
+    """Word boxes -> DataFrame of cell strings, one row per text row (empty if no columns)."""
+    rows = cluster_rows(words)
+    if not rows:
+        return pd.DataFrame()
+
+    max_gap = median(w["height"] for w in words)
+    rows_cells = [_row_cells(row, max_gap) for row in rows]
+    spans = _column_spans(rows_cells)
+
+    # No gutters: not a table, leave it to the line heuristics
+    if not spans:
+        return pd.DataFrame()
+
+    table = []
+    for cells in rows_cells:
+        out = [""] * len(spans)
+        for c in cells:
+            col = _column_of(c, spans)
+            out[col] = f"{out[col]} {c['text']}".strip()
+        table.append(out)
+
+    return pd.DataFrame(table)
@@ -0,0 +1,265 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+from core.config import PARSE_CACHE_MEMORY_MB, PARSE_CACHE_DIR, PARSE_CACHE_DISK_MB
+from core.executor import run_in_pool, track_incomplete
+from core.uploads import document_digest
+
+logger = logging.getLogger("credit_engine.cache")
+
+
+# ==========================================================
+# CACHE KEY
+# sha256(file) + parser name/version (+ extension,
+# since the WC parser picks its path from the filename)
+# ==========================================================
+
+def cache_key(source, parser: str, version: str, filename: str = None) -> str:
+    digest = document_digest(source)
+    ext = os.path.splitext((filename or "").lower())[1].lstrip(".")
+    return f"{parser}-{version}-{ext}-{digest}" if ext else f"{parser}-{version}-{digest}"
+
+
+# ==========================================================
+# BACKENDS
+# Values are stored as JSON bytes: sizes are exact and every
+# hit hands back a fresh object the caller may mutate.
+# A backend implements get(key) -> bytes | None, set(key, bytes)
+# and stats() -> dict; blocking marks backends that do file IO.
+# ==========================================================
+
+class MemoryLRUCache:
+    """In-process LRU bounded by total value size in bytes."""
+
+    blocking = False
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value: bytes):
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.current_bytes -= len(old)
+            self._data[key] = value
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _k, evicted = self._data.popitem(last=False)
+                self.current_bytes -= len(evicted)
+                self.evictions += 1
+
+    def stats(self):
+        return {
+            "entries": len(self._data),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class DiskCache:
+    """One file per key under a directory, oldest files evicted past max_bytes."""
+
+    blocking = True
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = f.read()
+            os.utime(path)  # mtime doubles as last-used time for eviction
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def set(self, key, value: bytes):
+        if len(value) > self.max_bytes:
+            return
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(value)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Parse cache write failed: {str(e)}")
+            return
+        self._evict()
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, name))
+        return entries
+
+    def _evict(self):
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _m, size, _n in entries)
+            for _mtime, size, name in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+                total -= size
+                self.evictions += 1
+
+    def stats(self):
+        entries = self._entries()
+        return {
+            "entries": len(entries),
+            "bytes": sum(size for _m, size, _n in entries),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class TieredCache:
+    """Checks each backend in order; a lower-tier hit is promoted upwards."""
+
+    def __init__(self, backends):
+        self.backends = [b for b in backends if b is not None]
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def blocking(self) -> bool:
+        return any(b.blocking for b in self.backends)
+
+    def get(self, key):
+        for i, backend in enumerate(self.backends):
+            value = backend.get(key)
+            if value is not None:
+                for upper in self.backends[:i]:
+                    upper.set(key, value)
+                self.hits += 1
+                return json.loads(value)
+        self.misses += 1
+        return None
+
+    def set(self, key, obj):
+        value = json.dumps(obj, separators=(",", ":")).encode("utf-8")
+        for backend in self.backends:
+            backend.set(key, value)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "tiers": {type(b).__name__: b.stats() for b in self.backends},
+        }
+
+
+def _build_default_cache():
+
+    backends = [MemoryLRUCache(int(PARSE_CACHE_MEMORY_MB * 1024 * 1024))]
+
+    if PARSE_CACHE_DIR:
+        try:
+            backends.append(DiskCache(PARSE_CACHE_DIR, int(PARSE_CACHE_DISK_MB * 1024 * 1024)))
+        except OSError as e:
+            logger.warning(f"Parse cache disk tier disabled: {str(e)}")
+
+    return TieredCache(backends)
+
+
+parse_cache = _build_default_cache()
+
+
+# ==========================================================
+# CACHED PARSE
+# ==========================================================
+
+async def cached_parse(func, source, *args, parser: str, version: str, filename: str = None):
+    """
+    Return func(source, *args) from the cache, or run it in the
+    parser pool and store the result. source is bytes or an
+    UploadHandle. Coroutine functions (which do their own pool
+    dispatch) are awaited directly. Empty results are not
+    stored: "nothing found" is cheap to recompute, and caching
+    it would pin a transient failure to the file for good. Nor
+    are partial ones (a task called mark_incomplete, e.g. an
+    OCR page timed out).
+    """
+    key = cache_key(source, parser, version, filename)
+
+    # The disk tier reads, writes and evicts files; keep that
+    # (and the JSON round trip) off the event loop
+    offload = parse_cache.blocking
+
+    if offload:
+        value = await asyncio.to_thread(parse_cache.get, key)
+    else:
+        value = parse_cache.get(key)
+
+    if value is not None:
+        return value
+
+    with track_incomplete() as task:
+        if asyncio.iscoroutinefunction(func):
+            value = await func(source, *args)
+        else:
+            value = await run_in_pool(func, source, *args)
+
+    if not value:
+        return value
+
+    if task["incomplete"]:
+        logger.info(f"Not caching partial {parser} result")
+        return value
+
+    if offload:
+        await asyncio.to_thread(parse_cache.set, key, value)
+    else:
+        parse_cache.set(key, value)
+
+    return value
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+from pdfplumber import utils
+
+
+# ==========================================================
+# SINGLE-PASS PAGE EXTRACTION
+# Table cells and text lines are both derived from the
+# page's char layout, which pdfminer builds once per page.
+# Table cells are filled from chars indexed by vertical
+# midpoint instead of pdfplumber's per-row scan over every
+# char on the page, with identical output.
+# ==========================================================
+
+def _char_mids(char) -> tuple:
+    return (char["top"] + char["bottom"]) / 2, (char["x0"] + char["x1"]) / 2
+
+
+def _in_bbox(v_mid: float, h_mid: float, bbox) -> bool:
+    x0, top, x1, bottom = bbox
+    return (h_mid >= x0) and (h_mid < x1) and (v_mid >= top) and (v_mid < bottom)
+
+
+class _CharIndex:
+    """Page chars sorted by vertical midpoint for range lookups."""
+
+    def __init__(self, chars: List[dict]):
+        self.chars = chars
+        self.mids = [_char_mids(c) for c in chars]
+        self.order = sorted(range(len(chars)), key=lambda i: self.mids[i][0])
+        self.v_sorted = [self.mids[i][0] for i in self.order]
+
+    def in_bbox(self, bbox) -> List[int]:
+        """Indices (in page order) of chars whose midpoint lies in bbox."""
+        _x0, top, _x1, bottom = bbox
+        lo = bisect_left(self.v_sorted, top)
+        hi = bisect_left(self.v_sorted, bottom)
+        hits = [
+            i for i in self.order[lo:hi]
+            if _in_bbox(self.mids[i][0], self.mids[i][1], bbox)
+        ]
+        hits.sort()
+        return hits
+
+
+def _extract_table(table, index: _CharIndex) -> List[List[Optional[str]]]:
+    """Same output as pdfplumber's Table.extract() with default text settings."""
+    rows = []
+
+    for row in table.rows:
+        row_idx = index.in_bbox(row.bbox)
+        cells = []
+
+        for cell in row.cells:
+            if cell is None:
+                cells.append(None)
+                continue
+
+            cell_chars = [
+                index.chars[i] for i in row_idx
+                if _in_bbox(index.mids[i][0], index.mids[i][1], cell)
+            ]
+
+            if cell_chars:
+                cells.append(utils.extract_text(cell_chars, x_shift=cell[0], y_shift=cell[1]))
+            else:
+                cells.append("")
+
+        rows.append(cells)
+
+    return rows
+
+
+def extract_page_tables(page) -> List[List[List[Optional[str]]]]:
+    tables = page.find_tables()
+    if not tables:
+        return []
+    index = _CharIndex(page.chars)
+    return [_extract_table(t, index) for t in tables]
+
+
+def extract_page(page) -> Dict:
+    """
+    Return {"text": str, "tables": [...]} for a pdfplumber page,
+    matching page.extract_text() and page.extract_tables().
+    """
+    return {
+        "text": page.extract_text() or "",
+        "tables": extract_page_tables(page),
+    }
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, List
+
+from pdfminer.pdfdevice import PDFDevice
+from pdfminer.pdfinterp import PDFPageInterpreter
+
+from services.accounting_dictionary import UNIT_SCALE_KEYWORDS
+from services.accounting_matcher import ACCOUNTING_INDEX
+
+
+# ==========================================================
+# PAGE RELEVANCE SCORING
+# Table extraction needs pdfminer's full char layout, which
+# is most of the cost of reading a page. Scoring only runs
+# the content stream interpreter and decodes the text-show
+# strings - no glyph positions, no layout - so every page
+# can be ranked for a fraction of the cost of reading one.
+# ==========================================================
+
+BALANCE_SHEET_KEYS = {
+    "current_assets", "current_liabilities", "inventory", "receivables", "payables",
+    "cash_bank", "bank_credit", "other_current_assets", "other_current_liabilities",
+}
+
+PNL_KEYS = {
+    "annual_sales", "other_income", "cogs", "operating_expenses", "gross_profit",
+    "ebitda", "depreciation", "interest_expense", "profit_before_tax", "net_profit",
+}
+
+STATEMENT_TITLES = {
+    "balance_sheet": ["balance sheet", "statement of financial position", "statement of assets and liabilities"],
+    "pnl": ["profit and loss", "profit & loss", "statement of profit", "income statement", "income and expenditure"],
+}
+
+NOTES_TITLES = ["notes to", "notes forming part", "note "]
+
+# Statements are mostly figures; a page whose words are
+# rarely numbers is narrative (policies, directors' report)
+MIN_NUMBER_RATIO = 0.15
+
+UNIT_KEYWORDS = [k for keywords in UNIT_SCALE_KEYWORDS.values() for k in keywords]
+
+STATEMENT_KINDS = ("balance_sheet", "pnl")
+
+NUMBER = re.compile(r"\(?-?\d[\d,]*(?:\.\d+)?\)?")
+
+
+class _TextCollector(PDFDevice):
+    """Collects decoded text-show strings, one part per operator."""
+
+    def __init__(self, rsrcmgr):
+        super().__init__(rsrcmgr)
+        self.parts: List[str] = []
+
+    def render_string(self, textstate, seq, ncs, graphicstate) -> None:
+        font = textstate.font
+        if font is None:
+            return
+
+        chars = []
+        for obj in seq:
+            if not isinstance(obj, bytes):
+                # Large negative TJ offsets are word gaps
+                if obj < -200:
+                    chars.append(" ")
+                continue
+            for cid in font.decode(obj):
+                try:
+                    chars.append(font.to_unichr(cid))
+                except Exception:
+                    continue
+
+        self.parts.append("".join(chars))
+
+
+def raw_page_text(pdf, page) -> str:
+    """Text of a pdfplumber page without building its layout."""
+    device = _TextCollector(pdf.rsrcmgr)
+    PDFPageInterpreter(pdf.rsrcmgr, device).process_page(page.page_obj)
+    return " ".join(device.parts)
+
+
+def score_page_text(text: str) -> Dict:
+    """
+    Returns {"kind", "score", "keys"}. kind is one of
+    balance_sheet, pnl, notes or irrelevant; score counts the
+    statement keys hit, plus a bonus for a statement title and
+    a unit line.
+    """
+    t = " ".join(text.lower().split())
+    keys = set(ACCOUNTING_INDEX.match_keys(t)) if t else set()
+    bs = keys & BALANCE_SHEET_KEYS
+    pnl = keys & PNL_KEYS
+
+    titles = {kind: any(k in t for k in words) for kind, words in STATEMENT_TITLES.items()}
+    has_unit = any(k in t for k in UNIT_KEYWORDS)
+
+    words = t.split()
+    numbers = sum(1 for w in words if NUMBER.fullmatch(w))
+    number_ratio = numbers / len(words) if words else 0.0
+
+    score = len(bs) + len(pnl) + 2 * sum(titles.values()) + (1 if has_unit else 0)
+
+    if not (bs or pnl or any(titles.values())):
+        kind = "irrelevant"
+    elif number_ratio < MIN_NUMBER_RATIO:
+        kind = "notes"
+    elif any(k in t[:80] for k in NOTES_TITLES) and not any(titles.values()):
+        kind = "notes"
+    elif len(bs) + 2 * titles["balance_sheet"] >= len(pnl) + 2 * titles["pnl"]:
+        kind = "balance_sheet"
+    else:
+        kind = "pnl"
+
+    return {"kind": kind, "score": score, "keys": sorted(bs | pnl)}
+
+
+def score_page(pdf, page) -> Dict:
+    """score_page_text for a pdfplumber page; unreadable pages score as irrelevant."""
+    try:
+        return score_page_text(raw_page_text(pdf, page))
+    except Exception:
+        return {"kind": "irrelevant", "score": 0, "keys": []}
@@ -1,17 +1,31 @@
 import re
-from io import BytesIO
-from difflib import SequenceMatcher
 
 import pandas as pd
 import pdfplumber
+from PIL import Image
+
+from core.config import (
+    WC_EXTRACTION_TARGETS, WC_EARLY_EXIT, WC_FALLBACK_MIN_COVERAGE, WC_PAGE_FILTER,
+)
+from core.uploads import UploadHandle, open_document
 
 from services.accounting_dictionary import ACCOUNTING_KEYWORDS, UNIT_SCALE_KEYWORDS
-from services.ocr_image_extractor import ocr_text_from_image_bytes, extract_amount_from_line
+from services.accounting_matcher import ACCOUNTING_INDEX
+from services.excel_reader import open_sheets
+from services.wc_required_fields import WC_REQUIRED_INPUT_FIELDS, WC_SERVICE_INPUT_FIELDS
+from services.pdf_page_extractor import extract_page
+from services.pdf_page_scorer import BALANCE_SHEET_KEYS, PNL_KEYS, STATEMENT_KINDS, score_page
+from services.document_extractor import is_probably_scanned_text
+from services.ocr_pipeline import ocr_pdf_pages
 from services.ocr_image_extractor import (
-    ocr_text_from_image_bytes,
     extract_amount_from_line,
     extract_leftmost_amount_from_line,
 )
+from services.ocr_table_extractor import ocr_page_words, words_to_table, words_to_text
+
+# Bump whenever a change alters parse output – it is part
+# of the parse-cache key, so stale results are never served.
+PARSER_VERSION = "9"
 
 # ==========================================================
 # A) Unit detection (“In Thousands/Lakhs/Crores”) + multiply
@@ -64,8 +78,15 @@ def resolve_multiplier(detected_multiplier: int) -> int:
 # Helpers
 # ==========================================================
 
-def fuzzy_match(keyword: str, text: str, threshold: float = 0.82) -> bool:
-    return SequenceMatcher(None, keyword, text).ratio() >= threshold
+def assign_matches(result: dict, row_text: str, value) -> None:
+    """
+    Set value for every ACCOUNTING_KEYWORDS key the row matches
+    (substring or fuzzy, see ACCOUNTING_INDEX) that is not already
+    in result.
+    """
+    for key in ACCOUNTING_INDEX.match_keys(row_text):
+        if key not in result:
+            result[key] = value
 
 
 def _extract_number(s: str):
@@ -158,12 +179,21 @@ def _pick_value_from_row_by_year_col(row_values, latest_year_col_idx):
     return _extract_number(row_values[latest_year_col_idx])
 
 
-def parse_financial_table(df: pd.DataFrame, multiplier: int) -> dict:
+def parse_financial_table(df: pd.DataFrame, multiplier: int, found=None, targets=None) -> dict:
+    """
+    found: keys already extracted elsewhere. When given, rows stop
+    once found plus this table's results cover targets (default
+    EXTRACTION_TARGETS).
+    """
+    targets = EXTRACTION_TARGETS if targets is None else targets
     result = {}
 
     header_row_idx, _year_cols, latest_year_col = _find_year_header_row_and_cols(df)
 
     for r_idx, row in df.iterrows():
+        if found is not None and is_covered(found, result, targets=targets):
+            break
+
         row_values = [str(v) for v in row.tolist()]
 
         if header_row_idx is not None and r_idx == header_row_idx:
@@ -187,13 +217,7 @@ def parse_financial_table(df: pd.DataFrame, multiplier: int) -> dict:
         if abs(value) < 1:
             continue
 
-        for key, keywords in ACCOUNTING_KEYWORDS.items():
-            if key in result:
-                continue
-            for kw in keywords:
-                if kw in row_text or fuzzy_match(kw, row_text):
-                    result[key] = value
-                    break
+        assign_matches(result, row_text, value)
 
     return result
 
@@ -244,31 +268,174 @@ def normalize_wc_inputs(inputs: dict) -> dict:
     return inputs
 
 
+# ==========================================================
+# Coverage
+# Extraction stops early once every target field has a
+# value. Default targets are every field the WC calculations
+# read (required fields plus the ones wc_service uses) that
+# the dictionary can produce ("tax" has no keywords, so
+# waiting on it would never stop); WC_EXTRACTION_TARGETS
+# overrides.
+# A document only has to cover the targets of the statements
+# it carries: a balance-sheet-only upload (each /wc/upload-dual
+# file is one) never waits on P&L fields. Targets outside both
+# statements always count, and when no statement is
+# recognised every target does.
+# ==========================================================
+
+EXTRACTION_TARGETS = WC_EXTRACTION_TARGETS or [
+    k for k in dict.fromkeys(WC_REQUIRED_INPUT_FIELDS + WC_SERVICE_INPUT_FIELDS)
+    if k in ACCOUNTING_KEYWORDS
+]
+
+STATEMENT_KEYS = {"balance_sheet": BALANCE_SHEET_KEYS, "pnl": PNL_KEYS}
+
+# Distinct keys of one statement a document needs before that
+# statement counts as present; a single hit ("depreciation" in
+# a balance sheet's fixed assets) is not enough
+MIN_STATEMENT_KEYS = 2
+
+# Rows sampled per sheet to rank Excel sheets
+EXCEL_SCAN_ROWS = 40
+
+
+def targets_for(kinds) -> list:
+    """EXTRACTION_TARGETS a document holding the given statement kinds can provide."""
+    if not kinds:
+        return EXTRACTION_TARGETS
+    wanted = set().union(*(STATEMENT_KEYS[kind] for kind in kinds))
+    other = set().union(*STATEMENT_KEYS.values())
+    return [k for k in EXTRACTION_TARGETS if k in wanted or k not in other]
+
+
+def statement_kinds(keys) -> set:
+    """Statement kinds with at least MIN_STATEMENT_KEYS of the given keys."""
+    keys = set(keys)
+    return {
+        kind for kind, kind_keys in STATEMENT_KEYS.items()
+        if len(keys & kind_keys) >= MIN_STATEMENT_KEYS
+    }
+
+
+def table_keys(df: pd.DataFrame) -> set:
+    """Dictionary keys appearing anywhere in a table (substring only)."""
+    text = "\n".join(
+        " ".join(str(v) for v in row if str(v).strip()) for row in df.itertuples(index=False)
+    ).lower()
+    return set(ACCOUNTING_INDEX.present_keys(text))
+
+
+def coverage(*found, targets=EXTRACTION_TARGETS) -> float:
+    """Share of targets that are a key of one of the found containers."""
+    if not targets:
+        return 1.0
+    return sum(1 for k in targets if any(k in f for f in found)) / len(targets)
+
+
+def is_covered(*found, targets=EXTRACTION_TARGETS) -> bool:
+    """True when every target is a key of one of the found containers."""
+    if not WC_EARLY_EXIT:
+        return False
+    return all(any(k in f for f in found) for k in targets)
+
+
+def sample_keys(rows) -> set:
+    """Distinct dictionary keys hit by a sample of rows."""
+    keys = set()
+    for row in rows:
+        row_text = " ".join(str(v) for v in row if v is not None and str(v).strip()).lower()
+        if row_text:
+            keys.update(ACCOUNTING_INDEX.match_keys(row_text))
+    return keys
+
+
 # ==========================================================
 # Parsers
 # ==========================================================
 
-def parse_pdf_tables(file_bytes: bytes) -> dict:
+def _parse_pdf_page(page, found: dict):
+    """(values, text) of one page; found gains the new keys."""
+    content = extract_page(page)
+    page.flush_cache()
+
+    text = content["text"]
+    mult_used = resolve_multiplier(detect_multiplier(text))
+
+    values = {}
+    for table in content["tables"]:
+        if is_covered(found):
+            break
+        df = pd.DataFrame(table).fillna("")
+        table_result = parse_financial_table(df, mult_used, found=found)
+        for k, v in table_result.items():
+            if k not in values:
+                values[k] = v
+            if k not in found:
+                found[k] = v
+    return values, text
+
+
+def parse_pdf_tables(source, progress=None):
+    """
+    Returns (result, page_texts, skipped_pages): page_texts lets
+    the text fallback reuse each page's text without reopening it;
+    skipped_pages are the page numbers whose tables were never
+    read because the targets were already covered.
+
+    With WC_PAGE_FILTER, each page is first scored from its raw
+    text (see pdf_page_scorer) and tables are only read on
+    balance sheet / P&L pages. The remaining pages are read best
+    score first only while less than WC_FALLBACK_MIN_COVERAGE of
+    the targets of the statements found is covered, so a
+    balance-sheet-only file never reads its notes hunting for
+    P&L fields. Page values are merged in document order either
+    way.
+    """
+    parsed = {}
+    texts = {}
+    found = {}
+    with open_document(source) as stream, pdfplumber.open(stream) as pdf:
+        total_pages = len(pdf.pages)
+
+        def read(i):
+            parsed[i], texts[i] = _parse_pdf_page(pdf.pages[i], found)
+            if progress:
+                progress(len(parsed), total_pages)
+
+        deferred = []
+        kinds = set()
+        for i, page in enumerate(pdf.pages):
+            if is_covered(found):
+                break
+            if WC_PAGE_FILTER and WC_EARLY_EXIT:
+                score = score_page(pdf, page)
+                if score["kind"] not in STATEMENT_KINDS:
+                    deferred.append((-score["score"], i))
+                    continue
+                kinds |= {score["kind"]} | statement_kinds(score["keys"])
+            read(i)
+
+        targets = targets_for(kinds)
+        for _neg, i in sorted(deferred):
+            if coverage(found, targets=targets) >= WC_FALLBACK_MIN_COVERAGE:
+                break
+            read(i)
+
+        if len(parsed) < total_pages and progress:
+            progress(total_pages, total_pages)
+
     result = {}
-    with pdfplumber.open(BytesIO(file_bytes)) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text() or ""
-            mult_used = resolve_multiplier(detect_multiplier(text))
-
-            tables = page.extract_tables() or []
-            for table in tables:
-                df = pd.DataFrame(table).fillna("")
-                table_result = parse_financial_table(df, mult_used)
-                for k, v in table_result.items():
-                    if k not in result:
-                        result[k] = v
-    return result
+    for i in sorted(parsed):
+        for k, v in parsed[i].items():
+            if k not in result:
+                result[k] = v
 
+    page_texts = [texts[i] for i in sorted(texts)]
+    skipped_pages = [i + 1 for i in range(total_pages) if i not in parsed]
+    return result, page_texts, skipped_pages
 
-def parse_pdf_text(file_bytes: bytes) -> dict:
-    with pdfplumber.open(BytesIO(file_bytes)) as pdf:
-        all_text = "\n".join([(p.extract_text() or "") for p in pdf.pages])
 
+def parse_pdf_text(all_text: str) -> dict:
     mult_used = resolve_multiplier(detect_multiplier(all_text))
 
     result = {}
@@ -281,40 +448,96 @@ def parse_pdf_text(file_bytes: bytes) -> dict:
         if abs(val) < 1:
             continue
 
-        for key, keywords in ACCOUNTING_KEYWORDS.items():
-            if key in result:
-                continue
-            for kw in keywords:
-                if kw in row_text or fuzzy_match(kw, row_text):
-                    result[key] = val
-                    break
+        assign_matches(result, row_text, val)
     return result
 
 
-def parse_excel(file_bytes: bytes) -> dict:
+def parse_excel(source) -> dict:
+    """
+    Sheets are ranked by how many dictionary keys their first
+    EXCEL_SCAN_ROWS rows hit. Sheets with hits are parsed best
+    first, then the rest, stopping once the targets of the
+    statements seen so far (every parsed sheet, plus the sample
+    of the others) have a value. Sheet results are merged in
+    workbook order, so the earlier sheet still wins when two
+    carry the same key.
+    """
+    parsed = {}
+    found = set()
+
+    with open_document(source) as stream:
+        sheets = open_sheets(stream)
+        try:
+            sampled = {}
+            for sheet in sheets.sheet_names:
+                try:
+                    sampled[sheet] = sample_keys(sheets.head(sheet, EXCEL_SCAN_ROWS))
+                except Exception:
+                    sampled[sheet] = set()
+            doc_keys = set().union(*sampled.values())
+
+            for sheet in sorted(sheets.sheet_names, key=lambda s: -len(sampled[s])):
+                if is_covered(found, targets=targets_for(statement_kinds(doc_keys))):
+                    break
+                try:
+                    df = sheets.frame(sheet).fillna("")
+                    doc_keys |= table_keys(df)
+                    targets = targets_for(statement_kinds(doc_keys))
+                    parsed[sheet] = parse_financial_table(df, multiplier=1, found=found, targets=targets)
+                except Exception:
+                    continue
+                found.update(parsed[sheet])
+        finally:
+            sheets.close()
+
     result = {}
-    xls = pd.ExcelFile(BytesIO(file_bytes))
-    for sheet in xls.sheet_names:
+    for sheet in sheets.sheet_names:
+        for k, v in parsed.get(sheet, {}).items():
+            if k not in result:
+                result[k] = v
+    return result
+
+
+def parse_csv(source) -> dict:
+    with open_document(source) as stream:
         try:
-            df = xls.parse(sheet, header=None).fillna("")
-            sheet_result = parse_financial_table(df, multiplier=1)
-            for k, v in sheet_result.items():
-                if k not in result:
-                    result[k] = v
+            df = pd.read_csv(stream, header=None).fillna("")
         except Exception:
-            continue
-    return result
+            stream.seek(0)
+            df = pd.read_csv(stream, header=None, encoding="latin-1").fillna("")
+    targets = targets_for(statement_kinds(table_keys(df)))
+    return parse_financial_table(df, multiplier=1, found={}, targets=targets)
 
+def parse_image(source) -> dict:
+    with open_document(source) as stream:
+        words, _metrics = ocr_page_words(Image.open(stream))
+    return parse_ocr_pages([words])
+
+
+def parse_ocr_pages(pages_words: list) -> dict:
+    """
+    OCR word boxes per page -> values. Each page is rebuilt as a
+    table and read by year column like a PDF table; the line
+    heuristics only run when no table yields anything.
+    """
+    result = {}
+    page_texts = []
+    for words in pages_words:
+        text = words_to_text(words)
+        page_texts.append(text)
+        mult_used = resolve_multiplier(detect_multiplier(text))
+
+        table_result = parse_financial_table(words_to_table(words), mult_used)
+        for k, v in table_result.items():
+            if k not in result:
+                result[k] = v
+
+    if not result:
+        result = parse_ocr_text("\n".join(page_texts))
+    return result
 
-def parse_csv(file_bytes: bytes) -> dict:
-    try:
-        df = pd.read_csv(BytesIO(file_bytes), header=None).fillna("")
-    except Exception:
-        df = pd.read_csv(BytesIO(file_bytes), header=None, encoding="latin-1").fillna("")
-    return parse_financial_table(df, multiplier=1)
 
-def parse_image(file_bytes: bytes) -> dict:
-    text = ocr_text_from_image_bytes(file_bytes)
+def parse_ocr_text(text: str) -> dict:
     mult_used = resolve_multiplier(detect_multiplier(text))
 
     extracted = {}
@@ -333,13 +556,7 @@ def parse_image(file_bytes: bytes) -> dict:
         if abs(val) < 1:
             continue
 
-        for key, keywords in ACCOUNTING_KEYWORDS.items():
-            if key in extracted:
-                continue
-            for kw in keywords:
-                if kw in row_text or fuzzy_match(kw, row_text):
-                    extracted[key] = val
-                    break
+        assign_matches(extracted, row_text, val)
 
     return extracted
 
@@ -347,34 +564,45 @@ def parse_image(file_bytes: bytes) -> dict:
 # Entry point
 # ==========================================================
 
-def parse_financial_file(file, filename):
-    if isinstance(file, bytes):
-        file_bytes = file
+def parse_financial_file(file, filename, progress=None):
+    """
+    file: bytes, an UploadHandle or a readable file object.
+    progress: optional callable(pages_done, pages_total), reported per PDF page.
+    """
+    if isinstance(file, (bytes, UploadHandle)):
+        source = file
     else:
-        file_bytes = file.read()
+        source = file.read()
 
     filename_lower = (filename or "").lower()
+    skipped_pages = []
 
     if filename_lower.endswith(".pdf"):
-        extracted = parse_pdf_tables(file_bytes)
+        extracted, page_texts, skipped_pages = parse_pdf_tables(source, progress=progress)
         if not extracted:
-            extracted = parse_pdf_text(file_bytes)
+            if is_probably_scanned_text(page_texts):
+                # No text layer: OCR the pages and read them like an image
+                extracted = parse_ocr_pages(
+                    ocr_pdf_pages(source, progress=progress, ocr=ocr_page_words, empty=[])
+                )
+            else:
+                extracted = parse_pdf_text("\n".join(page_texts))
 
     elif filename_lower.endswith(".xlsx") or filename_lower.endswith(".xls"):
-        extracted = parse_excel(file_bytes)
+        extracted = parse_excel(source)
 
     elif filename_lower.endswith(".csv"):
-        extracted = parse_csv(file_bytes)
+        extracted = parse_csv(source)
 
     elif filename_lower.endswith(".jpg") or filename_lower.endswith(".jpeg") or filename_lower.endswith(".png"):
-        extracted = parse_image(file_bytes)
+        extracted = parse_image(source)
 
     else:
         extracted = {}
 
     extracted = normalize_wc_inputs(extracted)
     calculations = calculate_financial_metrics(extracted)
-    return {"inputs": extracted, "calculations": calculations}
+    return {"inputs": extracted, "calculations": calculations, "skipped_pages": skipped_pages}
 
 
 # ==========================================================
@@ -14,3 +14,11 @@ WC_REQUIRED_INPUT_FIELDS = [
     "tax",
 ]
 
+
+# Extracted fields calculate_wc_logic reads beyond the
+# required ones (it estimates cogs when missing)
+WC_SERVICE_INPUT_FIELDS = [
+    "cogs",
+    "other_current_assets",
+    "other_current_liabilities",
+]
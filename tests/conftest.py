@@ -0,0 +1,34 @@
+import os
+import tempfile
+
+# Point the engines at a throwaway SQLite file before any
+# module imports core.database
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
+
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def client():
+    """CAM router app with the autosave flusher running."""
+    from routers.cam_router import router as cam_router
+    from services.autosave_buffer import start_autosave_flusher, stop_autosave_flusher
+    from services.cam_service import ensure_cam_schema
+
+    ensure_cam_schema()
+
+    @asynccontextmanager
+    async def lifespan(app):
+        start_autosave_flusher()
+        yield
+        await stop_autosave_flusher()
+
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(cam_router)
+
+    with TestClient(app) as c:
+        yield c
@@ -0,0 +1,47 @@
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+import pytest
+from reportlab.pdfgen import canvas
+
+import services.banking_parser as banking_parser
+from benchmarks.generators import bank_statement_pdf
+from services.banking_parser import parse_banking_file, parse_banking_file_sharded
+
+
+def _blank_pdf() -> bytes:
+    buf = BytesIO()
+    pdf = canvas.Canvas(buf)
+    pdf.showPage()
+    pdf.save()
+    return buf.getvalue()
+
+
+def test_unreadable_pdf_is_no_transactions():
+    assert parse_banking_file(b"not a pdf") == []
+
+
+def test_ocr_fallback_failure_propagates(monkeypatch):
+
+    def no_poppler(*args, **kwargs):
+        raise RuntimeError("pdf2image not available (install pdf2image + poppler-utils).")
+
+    monkeypatch.setattr(banking_parser, "is_probably_scanned_pdf", lambda source: True)
+    monkeypatch.setattr(banking_parser, "ocr_pdf_pages", no_poppler)
+
+    with pytest.raises(RuntimeError, match="pdf2image"):
+        parse_banking_file(_blank_pdf())
+
+
+def test_crashed_shard_propagates(monkeypatch):
+
+    async def fake_run_in_pool(func, *args, **kwargs):
+        if func is banking_parser.count_pdf_pages:
+            return 4
+        raise BrokenProcessPool("worker died")
+
+    monkeypatch.setattr(banking_parser, "run_in_pool", fake_run_in_pool)
+
+    with pytest.raises(BrokenProcessPool):
+        asyncio.run(parse_banking_file_sharded(bank_statement_pdf(pages=4), shard_size=2))
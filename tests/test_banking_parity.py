@@ -0,0 +1,43 @@
+import pytest
+
+from benchmarks.generators import transactions
+from services.banking_service import analyze_banking
+from tests.banking_service_reference import analyze_banking as reference_analyze_banking
+
+
+@pytest.mark.parametrize("count,seed", [(1, 0), (2, 1), (7, 2), (250, 3), (1000, 4), (5000, 5)])
+def test_generated_statements_match_reference(count, seed):
+    txns = transactions(count, seed=seed)
+
+    assert analyze_banking(txns) == reference_analyze_banking(txns)
+
+
+def test_average_balance_rounds_like_reference():
+    # Exact mean is 44631.575 (rounds to .57 here); fmean gives
+    # 44631.575000000004, which rounds to .58
+    balances = [
+        7806.47, 38361.42, 66538.86, 28719.03, 50289.66, 90412.91,
+        10731.86, 85241.54, 9688.8, 38022.81, 90444.33, 19321.21,
+    ]
+    txns = [
+        {"date": "01/01/24", "description": "", "credit": 0, "debit": 0, "balance": b}
+        for b in balances
+    ]
+
+    assert analyze_banking(txns) == reference_analyze_banking(txns)
+
+
+def test_messy_values_match_reference():
+    txns = [
+        {"date": "01/01/24", "description": "SALARY ACME", "credit": "52,000", "debit": None, "balance": "1000"},
+        {"date": None, "description": None, "credit": 0, "debit": 250.5, "balance": -749.5},
+        {"date": "not a date", "description": "NEFT RETURN", "credit": 10, "debit": 0, "balance": "bad"},
+        {"date": "15-02-2024", "description": "UPI/123/Shop", "credit": 0, "debit": 99.99, "balance": -849.49},
+        {"description": "EMI HDFC", "debit": 5000},
+    ]
+
+    assert analyze_banking(txns) == reference_analyze_banking(txns)
+
+
+def test_empty_matches_reference():
+    assert analyze_banking([]) == reference_analyze_banking([])
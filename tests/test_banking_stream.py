@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from benchmarks.generators import bank_statement_pdf
+from core.executor import shutdown_pool
+from core.uploads import stage_bytes
+from services.banking_parser import (
+    finalize_transactions,
+    flush_stream,
+    merge_stream_page,
+    new_stream_state,
+    parse_banking_file,
+    parse_date,
+    stream_banking_transactions,
+)
+
+
+def _txn(date, balance, description):
+    return {"date": date, "description": description, "debit": 0, "credit": 1.0, "balance": balance}
+
+
+def _stream(pages):
+    state = new_stream_state()
+    out = []
+    for page_txns in pages:
+        out.extend(merge_stream_page(state, [dict(t) for t in page_txns]))
+    return out + flush_stream(state)
+
+
+def test_stream_keeps_the_same_duplicate_as_finalize():
+    pages = [
+        # table row, then the text-fallback copy of it on the same page
+        [_txn("01/01/24", 100.0, "table"), _txn("02/01/24", 200.0, "table"),
+         _txn("01/01/24", 100.0, "text")],
+        # copy carried over onto the next page
+        [_txn("02/01/24", 200.0, "carried"), _txn("03/01/24", 300.0, "table")],
+        [_txn("04/01/24", 400.0, "table"), _txn("04/01/24", 400.0, "text")],
+    ]
+
+    streamed = _stream(pages)
+    finalized = finalize_transactions([dict(t) for page in pages for t in page])
+
+    assert [t["description"] for t in streamed] == ["text", "carried", "table", "text"]
+    assert sorted(streamed, key=lambda t: parse_date(t["date"])) == finalized
+
+
+@pytest.fixture
+def statement():
+    upload = stage_bytes(bank_statement_pdf(pages=7, txns_per_page=10))
+    yield upload
+    upload.remove()
+    shutdown_pool()
+
+
+def test_pooled_stream_matches_parse_banking_file(statement):
+
+    async def collect():
+        return [txn async for txn in stream_banking_transactions(statement, shard_size=2)]
+
+    streamed = asyncio.run(collect())
+
+    assert streamed
+    assert sorted(streamed, key=lambda t: parse_date(t["date"])) == parse_banking_file(statement)
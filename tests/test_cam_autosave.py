@@ -0,0 +1,29 @@
+from services.autosave_buffer import autosave_stats
+
+
+def test_buffered_autosave_of_missing_report_is_404(client):
+    before = autosave_stats()["saves"]
+
+    response = client.put("/cam/autosave/99999", json={"remarks": "x"})
+
+    assert response.status_code == 404
+    assert autosave_stats()["saves"] == before
+
+
+def test_buffered_autosave_of_deleted_report_is_404(client):
+    report_id = client.post("/cam/create", json={"customer_name": "Acme"}).json()["report_id"]
+    assert client.delete(f"/cam/{report_id}").status_code == 200
+
+    response = client.put(f"/cam/autosave/{report_id}", json={"remarks": "x"})
+
+    assert response.status_code == 404
+
+
+def test_buffered_autosave_is_queued_and_visible_on_read(client):
+    report_id = client.post("/cam/create", json={"customer_name": "Acme"}).json()["report_id"]
+
+    response = client.put(f"/cam/autosave/{report_id}", json={"remarks": "buffered"})
+
+    assert response.status_code == 200
+    assert response.json()["pending"] is True
+    assert client.get(f"/cam/{report_id}").json()["remarks"] == "buffered"
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+from sqlalchemy import update
+
+from core.database import AsyncSessionLocal, SessionLocal
+from models.cam import CAMReport
+from services.cam_service import VersionConflict, commit_versioned, ensure_cam_schema, get_cam_report
+
+
+WRITES = [
+    ("put", "/cam/autosave/{}", {"remarks": "mine"}),
+    ("patch", "/cam/autosave/{}", {"remarks": "mine"}),
+    ("post", "/cam/submit/{}", {"remarks": "mine"}),
+]
+
+
+def _create(client):
+    created = client.post("/cam/create", json={"customer_name": "Acme"}).json()
+    return created["report_id"], created["version"]
+
+
+@pytest.mark.parametrize("method,path,body", WRITES, ids=["put", "patch", "submit"])
+def test_stale_version_is_409_with_current_version(client, method, path, body):
+    report_id, version = _create(client)
+    saved = client.put(f"/cam/autosave/{report_id}", json={"remarks": "theirs", "version": version})
+    assert saved.status_code == 200
+
+    response = client.request(method.upper(), path.format(report_id), json={**body, "version": version})
+
+    assert response.status_code == 409
+    assert response.json()["detail"]["version"] == saved.json()["version"] == version + 1
+    assert client.get(f"/cam/{report_id}").json()["remarks"] == "theirs"
+
+
+@pytest.mark.parametrize("method,path,body", WRITES, ids=["put", "patch", "submit"])
+def test_current_version_is_accepted(client, method, path, body):
+    report_id, version = _create(client)
+
+    response = client.request(method.upper(), path.format(report_id), json={**body, "version": version})
+
+    assert response.status_code == 200
+    assert response.json()["version"] == version + 1
+
+
+@pytest.mark.parametrize("method,path,body", WRITES, ids=["put", "patch", "submit"])
+def test_missing_report_is_404_not_409(client, method, path, body):
+    response = client.request(method.upper(), path.format(99999), json={**body, "version": 1})
+
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("method,path,body", WRITES, ids=["put", "patch", "submit"])
+def test_deleted_report_is_404_not_409(client, method, path, body):
+    report_id, version = _create(client)
+    assert client.delete(f"/cam/{report_id}").status_code == 200
+
+    response = client.request(method.upper(), path.format(report_id), json={**body, "version": version})
+
+    assert response.status_code == 404
+
+
+def test_concurrent_writer_raises_version_conflict():
+    ensure_cam_schema()
+    db = SessionLocal()
+    report = CAMReport(customer_name="Acme")
+    db.add(report)
+    db.commit()
+    report_id = report.id
+
+    async def run():
+        async with AsyncSessionLocal() as session:
+            loaded = await get_cam_report(report_id, session)
+            loaded.remarks = "mine"
+
+            # Another writer commits between our read and our flush
+            db.execute(
+                update(CAMReport)
+                .where(CAMReport.id == report_id)
+                .values(remarks="theirs", version=CAMReport.version + 1)
+            )
+            db.commit()
+
+            with pytest.raises(VersionConflict) as exc:
+                await commit_versioned(loaded, session)
+            return exc.value.current_version
+
+    try:
+        assert asyncio.run(run()) == 2
+        db.expire_all()
+        assert db.get(CAMReport, report_id).remarks == "theirs"
+    finally:
+        db.close()
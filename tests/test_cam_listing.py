@@ -0,0 +1,88 @@
+import asyncio
+import base64
+from datetime import datetime
+
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql
+
+from core.database import AsyncSessionLocal, SessionLocal
+from models.cam import CAMReport
+from services.cam_service import ensure_cam_schema, like_prefix, list_cam_reports
+
+NAMES = ["50% Foods", "500 Foods", "A_b Traders", "AXb Traders", "C/D Mills", "C/DX Mills", "CD Mills"]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def reports():
+    ensure_cam_schema()
+    db = SessionLocal()
+    db.execute(delete(CAMReport))
+    db.add_all([CAMReport(customer_name=name) for name in NAMES])
+    db.commit()
+    db.close()
+
+
+def _names(prefix):
+
+    async def run():
+        async with AsyncSessionLocal() as db:
+            rows, _ = await list_cam_reports(db, limit=50, customer_prefix=prefix)
+            return sorted(r.customer_name for r in rows)
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("prefix,expected", [
+    ("50%", ["50% Foods"]),
+    ("50", ["50% Foods", "500 Foods"]),
+    ("A_", ["A_b Traders"]),
+    ("C/D", ["C/D Mills", "C/DX Mills"]),
+    ("C/D ", ["C/D Mills"]),
+])
+def test_prefix_treats_wildcards_literally(prefix, expected):
+    assert _names(prefix) == expected
+
+
+def test_prefix_is_bound_as_one_value():
+    query = select(CAMReport.id).where(CAMReport.customer_name.like(like_prefix("50%_a"), escape="/"))
+    compiled = query.compile(dialect=postgresql.dialect())
+
+    assert "||" not in str(compiled)
+    assert list(compiled.params.values()) == ["50/%/_a%"]
+
+
+def test_keyset_pages_through_rows_sharing_created_at(client):
+    created_at = datetime(2024, 1, 1, 12, 0, 0)
+    db = SessionLocal()
+    rows = [CAMReport(customer_name=f"Keyset {n}", created_at=created_at) for n in range(7)]
+    db.add_all(rows)
+    db.commit()
+    expected = sorted((r.id for r in rows), reverse=True)
+    db.close()
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"customer_name": "Keyset ", "limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/cam/list", params=params).json()
+        seen += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == expected
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor",
+    base64.urlsafe_b64encode(b"[1]").decode(),
+    base64.urlsafe_b64encode(b'["yesterday", 1]').decode(),
+])
+def test_invalid_cursor_is_400(client, cursor):
+    response = client.get("/cam/list", params={"cursor": cursor})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
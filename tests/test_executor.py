@@ -0,0 +1,86 @@
+import asyncio
+import os
+import signal
+import time
+
+import pytest
+
+import core.executor as executor
+from core.executor import ParserTimeoutError, run_in_pool, shutdown_pool, start_pool
+
+
+def spin(seconds):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        pass
+    return os.getpid()
+
+
+def spin_and_swallow(seconds):
+    try:
+        return spin(seconds)
+    except Exception:
+        return "swallowed"
+
+
+def ignore_alarm_and_sleep(seconds):
+    # Stands in for a parse stuck in native code
+    signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+    time.sleep(seconds)
+    return os.getpid()
+
+
+@pytest.fixture
+def pool():
+    shutdown_pool()
+    start_pool(1)
+    yield
+    shutdown_pool()
+
+
+def test_timeout_stops_the_parse_and_frees_the_worker(pool):
+
+    async def run():
+        with pytest.raises(ParserTimeoutError):
+            await run_in_pool(spin, 30, timeout=0.3)
+        start = time.monotonic()
+        pid = await run_in_pool(spin, 0, timeout=5)
+        return pid, time.monotonic() - start
+
+    pid, elapsed = asyncio.run(run())
+
+    assert elapsed < 1
+    assert pid != os.getpid()
+
+
+def test_broad_except_in_the_parser_cannot_swallow_the_timeout(pool):
+    with pytest.raises(ParserTimeoutError):
+        asyncio.run(run_in_pool(spin_and_swallow, 30, timeout=0.3))
+
+
+def test_time_waiting_for_a_worker_does_not_count(pool):
+
+    async def run():
+        return await asyncio.gather(
+            run_in_pool(spin, 0.6, timeout=1.0),
+            run_in_pool(spin, 0.6, timeout=1.0),
+        )
+
+    assert len(asyncio.run(run())) == 2
+
+
+def test_worker_ignoring_the_alarm_is_killed(pool, monkeypatch):
+    monkeypatch.setattr(executor, "HUNG_WORKER_GRACE", 0.3)
+
+    async def run():
+        first = await run_in_pool(spin, 0, timeout=5)
+        start = time.monotonic()
+        with pytest.raises(ParserTimeoutError):
+            await run_in_pool(ignore_alarm_and_sleep, 30, timeout=0.3)
+        elapsed = time.monotonic() - start
+        return first, elapsed, await run_in_pool(spin, 0, timeout=5)
+
+    first, elapsed, after = asyncio.run(run())
+
+    assert elapsed < 3
+    assert after != first
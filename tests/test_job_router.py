@@ -0,0 +1,54 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+
+from core.database import SessionLocal
+from models.job import ParseJob
+from routers.job_router import job_router
+from services.job_service import ensure_job_schema
+
+
+@pytest.fixture
+def jobs():
+    ensure_job_schema()
+    db = SessionLocal()
+    db.execute(delete(ParseJob))
+    db.commit()
+    db.close()
+
+    app = FastAPI()
+    app.include_router(job_router)
+    return TestClient(app)
+
+
+def _queued():
+    db = SessionLocal()
+    try:
+        return db.query(ParseJob).count()
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize("filename,content_type", [
+    ("statement.csv", "text/csv"),
+    ("statement.xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    ("statement", "application/octet-stream"),
+])
+def test_banking_job_rejects_non_pdf(jobs, filename, content_type):
+    response = jobs.post("/jobs/banking", files={"file": (filename, b"date,amount\n", content_type)})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Only PDF bank statements are supported"
+    assert _queued() == 0
+
+
+@pytest.mark.parametrize("filename,content_type", [
+    ("statement.PDF", "application/octet-stream"),
+    ("statement", "application/pdf"),
+])
+def test_banking_job_accepts_pdf(jobs, filename, content_type):
+    response = jobs.post("/jobs/banking", files={"file": (filename, b"%PDF-1.4\n", content_type)})
+
+    assert response.status_code == 202
+    assert _queued() == 1
@@ -0,0 +1,101 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import delete
+
+from core.config import JOB_STALE_AFTER
+from core.database import SessionLocal
+from models.job import ParseJob
+from services.job_service import (
+    WORKER_ID,
+    _now,
+    ensure_job_schema,
+    heartbeat_running_jobs,
+    requeue_running_jobs,
+    requeue_stale_jobs,
+    start_job_workers,
+    stop_job_workers,
+    submit_job,
+)
+
+
+@pytest.fixture
+def db():
+    ensure_job_schema()
+    session = SessionLocal()
+    session.execute(delete(ParseJob))
+    session.commit()
+    yield session
+    session.close()
+
+
+def _running(db, job_id, worker_id, heartbeat_age):
+    db.add(ParseJob(
+        id=job_id,
+        kind="wc",
+        file_hash=job_id,
+        status="running",
+        worker_id=worker_id,
+        heartbeat_at=None if heartbeat_age is None else _now() - timedelta(seconds=heartbeat_age),
+    ))
+    db.commit()
+
+
+def _statuses(db):
+    db.expire_all()
+    return {job.id: job.status for job in db.query(ParseJob)}
+
+
+def test_startup_requeue_leaves_other_live_instances_alone(db):
+    _running(db, "mine", WORKER_ID, 1)
+    _running(db, "other-live", "other-host-1", 1)
+    _running(db, "other-dead", "other-host-2", JOB_STALE_AFTER + 30)
+    _running(db, "legacy", None, None)
+
+    assert requeue_stale_jobs() == 2
+
+    assert _statuses(db) == {
+        "mine": "running",
+        "other-live": "running",
+        "other-dead": "queued",
+        "legacy": "queued",
+    }
+
+
+def test_shutdown_requeue_only_touches_own_jobs(db):
+    _running(db, "mine", WORKER_ID, 1)
+    _running(db, "other-live", "other-host-1", 1)
+
+    requeue_running_jobs()
+
+    assert _statuses(db) == {"mine": "queued", "other-live": "running"}
+
+
+def test_stopping_workers_requeues_own_running_jobs(db):
+    _running(db, "mine", WORKER_ID, 1)
+    _running(db, "other-live", "other-host-1", 1)
+
+    async def run():
+        start_job_workers(1)
+        await stop_job_workers()
+
+    asyncio.run(run())
+
+    assert _statuses(db) == {"mine": "queued", "other-live": "running"}
+
+
+def test_heartbeat_keeps_own_job_from_going_stale(db):
+    _running(db, "mine", WORKER_ID, JOB_STALE_AFTER + 30)
+
+    heartbeat_running_jobs()
+
+    assert requeue_stale_jobs() == 0
+    assert _statuses(db) == {"mine": "running"}
+
+
+def test_same_bytes_with_another_extension_is_a_new_job(db):
+    first = submit_job("wc", "fs.csv", b"Inventories,100\n", db)
+
+    assert submit_job("wc", "retry.CSV", b"Inventories,100\n", db).id == first.id
+    assert submit_job("wc", "fs.txt", b"Inventories,100\n", db).id != first.id
@@ -0,0 +1,131 @@
+import pytest
+
+from utils.json_patch import PatchError, PatchTestFailed, apply_json_patch, apply_patch, merge_patch
+
+
+DOC = {"a": {"b": 1, "c": [1, 2, 3]}, "d": "x"}
+
+
+@pytest.mark.parametrize("ops,expected", [
+    ([{"op": "add", "path": "/a/e", "value": 5}], {"a": {"b": 1, "c": [1, 2, 3], "e": 5}, "d": "x"}),
+    ([{"op": "add", "path": "/a/c/1", "value": 9}], {"a": {"b": 1, "c": [1, 9, 2, 3]}, "d": "x"}),
+    ([{"op": "add", "path": "/a/c/-", "value": 9}], {"a": {"b": 1, "c": [1, 2, 3, 9]}, "d": "x"}),
+    ([{"op": "add", "path": "/a/c/3", "value": 9}], {"a": {"b": 1, "c": [1, 2, 3, 9]}, "d": "x"}),
+    ([{"op": "remove", "path": "/a/b"}], {"a": {"c": [1, 2, 3]}, "d": "x"}),
+    ([{"op": "remove", "path": "/a/c/0"}], {"a": {"b": 1, "c": [2, 3]}, "d": "x"}),
+    ([{"op": "replace", "path": "/d", "value": "y"}], {"a": {"b": 1, "c": [1, 2, 3]}, "d": "y"}),
+    ([{"op": "replace", "path": "/a/c/2", "value": 0}], {"a": {"b": 1, "c": [1, 2, 0]}, "d": "x"}),
+    ([{"op": "move", "from": "/a/b", "path": "/b"}], {"a": {"c": [1, 2, 3]}, "d": "x", "b": 1}),
+    ([{"op": "move", "from": "/a/c/0", "path": "/a/c/-"}], {"a": {"b": 1, "c": [2, 3, 1]}, "d": "x"}),
+    ([{"op": "copy", "from": "/a/c", "path": "/e"}], {"a": {"b": 1, "c": [1, 2, 3]}, "d": "x", "e": [1, 2, 3]}),
+    ([{"op": "test", "path": "/a/c", "value": [1, 2, 3]}], DOC),
+    ([{"op": "replace", "path": "", "value": [1]}], [1]),
+])
+def test_operations(ops, expected):
+    assert apply_json_patch(DOC, ops) == expected
+
+
+def test_input_document_is_not_modified():
+    doc = {"a": {"c": [1]}}
+
+    patched = apply_json_patch(doc, [
+        {"op": "add", "path": "/a/c/-", "value": 2},
+        {"op": "copy", "from": "/a", "path": "/b"},
+    ])
+    patched["b"]["c"].append(3)
+
+    assert doc == {"a": {"c": [1]}}
+    assert patched["a"]["c"] == [1, 2]
+
+
+@pytest.mark.parametrize("op", [
+    {"op": "add", "path": "/a/c/4", "value": 9},
+    {"op": "remove", "path": "/a/c/3"},
+    {"op": "replace", "path": "/a/c/-", "value": 9},
+    {"op": "remove", "path": "/a/c/-"},
+    {"op": "replace", "path": "/a/c/01", "value": 9},
+    {"op": "remove", "path": "/a/missing"},
+    {"op": "replace", "path": "/missing", "value": 9},
+    {"op": "add", "path": "/a/b/x", "value": 9},
+    {"op": "add", "path": "a", "value": 9},
+    {"op": "remove", "path": ""},
+    {"op": "move", "from": "/a", "path": "/a/x"},
+    {"op": "add", "path": "/a"},
+    {"op": "copy", "path": "/a"},
+    {"op": "frobnicate", "path": "/a"},
+])
+def test_invalid_operations_raise_patch_error(op):
+    with pytest.raises(PatchError):
+        apply_json_patch(DOC, [op])
+
+
+def test_pointer_escapes():
+    doc = {"a/b": 1, "m~n": 2, "~1": 3}
+
+    patched = apply_json_patch(doc, [
+        {"op": "replace", "path": "/a~1b", "value": 10},
+        {"op": "replace", "path": "/m~0n", "value": 20},
+        # ~01 is "~1" literally, not "/"
+        {"op": "replace", "path": "/~01", "value": 30},
+    ])
+
+    assert patched == {"a/b": 10, "m~n": 20, "~1": 30}
+
+
+def test_failed_test_op_raises_and_applies_nothing():
+    with pytest.raises(PatchTestFailed) as exc:
+        apply_json_patch(DOC, [
+            {"op": "replace", "path": "/d", "value": "y"},
+            {"op": "test", "path": "/a/b", "value": 2},
+        ])
+
+    assert isinstance(exc.value, PatchError)
+    assert DOC["d"] == "x"
+
+
+def test_merge_patch_null_removes_and_objects_merge():
+    target = {"a": {"b": 1, "c": 2}, "d": [1, 2], "e": 1}
+
+    patched = merge_patch(target, {"a": {"b": None, "x": 3}, "d": [3], "e": None, "missing": None})
+
+    assert patched == {"a": {"c": 2, "x": 3}, "d": [3]}
+    assert target == {"a": {"b": 1, "c": 2}, "d": [1, 2], "e": 1}
+
+
+def test_apply_patch_dispatches_on_patch_type():
+    assert apply_patch({"a": 1}, [{"op": "remove", "path": "/a"}]) == {}
+    assert apply_patch({"a": 1}, {"a": None}) == {}
+
+    with pytest.raises(PatchError):
+        apply_patch({"a": 1}, "a")
+
+
+def test_noop_patch_changes_nothing_and_keeps_version(client):
+    created = client.post("/cam/create", json={"customer_name": "Acme", "wc_data": {"x": 1}}).json()
+    report_id, version = created["report_id"], created["version"]
+
+    response = client.patch(f"/cam/autosave/{report_id}", json={
+        "wc_data": [{"op": "test", "path": "/x", "value": 1}],
+        "customer_name": "Acme",
+        "version": version,
+    })
+
+    assert response.status_code == 200
+    assert response.json()["changed"] == []
+    assert response.json()["version"] == version
+    assert client.get(f"/cam/{report_id}").json()["version"] == version
+
+
+def test_patch_changes_only_touched_columns(client):
+    created = client.post("/cam/create", json={"customer_name": "Acme", "wc_data": {"x": 1}}).json()
+    report_id, version = created["report_id"], created["version"]
+
+    response = client.patch(f"/cam/autosave/{report_id}", json={
+        "wc_data": {"x": None, "y": 2},
+        "customer_name": "Acme",
+        "version": version,
+    })
+
+    assert response.json()["changed"] == ["wc_data"]
+    assert response.json()["version"] == version + 1
+    assert client.get(f"/cam/{report_id}").json()["wc_data"] == {"y": 2}
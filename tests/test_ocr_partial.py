@@ -0,0 +1,46 @@
+import asyncio
+
+from PIL import Image
+
+import services.ocr_pipeline as ocr_pipeline
+import services.parse_cache as parse_cache_module
+from core.executor import mark_incomplete, shutdown_pool, track_incomplete
+from services.parse_cache import MemoryLRUCache, TieredCache, cached_parse
+
+
+def timed_out_ocr(img, timeout, dpi):
+    raise RuntimeError("Tesseract process timeout")
+
+
+def test_failed_page_is_empty_and_marks_the_task_incomplete(monkeypatch):
+    monkeypatch.setattr(ocr_pipeline, "pdf_page_to_image", lambda *a, **k: Image.new("L", (10, 10)))
+
+    with track_incomplete() as task:
+        result = ocr_pipeline.ocr_pdf_page(b"%PDF", 1, ocr=timed_out_ocr, empty=[])
+
+    assert result == ([], {})
+    assert task["incomplete"]
+
+
+def parse_with_failed_page(source):
+    mark_incomplete()
+    return {"inputs": {"inventory": 1}}
+
+
+def parse_complete(source):
+    return {"inputs": {"inventory": 1}}
+
+
+def test_partial_pool_results_are_not_cached(monkeypatch):
+    monkeypatch.setattr(parse_cache_module, "parse_cache", TieredCache([MemoryLRUCache(1024 * 1024)]))
+
+    async def run(func, source):
+        return await cached_parse(func, source, parser="test", version="1")
+
+    try:
+        assert asyncio.run(run(parse_with_failed_page, b"partial")) == {"inputs": {"inventory": 1}}
+        assert asyncio.run(run(parse_complete, b"complete")) == {"inputs": {"inventory": 1}}
+    finally:
+        shutdown_pool()
+
+    assert parse_cache_module.parse_cache.stats()["tiers"]["MemoryLRUCache"]["entries"] == 1
@@ -0,0 +1,28 @@
+import asyncio
+import os
+
+from PIL import Image
+
+from core.executor import run_in_pool, shutdown_pool
+from services.ocr_engine import _record, ocr_worker_stats, pool_ocr_stats
+
+
+def record_pages(pages):
+    img = Image.new("L", (100, 50))
+    for _ in range(pages):
+        _record(img, 0.01)
+    return os.getpid()
+
+
+def test_pool_worker_ocr_stats_reach_the_parent():
+    try:
+        worker_pid = asyncio.run(run_in_pool(record_pages, 3))
+    finally:
+        shutdown_pool()
+
+    workers = pool_ocr_stats()["workers"]
+    reported = {name: s for name, s in workers.items() if name.startswith(f"{worker_pid}/")}
+
+    assert worker_pid != os.getpid()
+    assert sum(s["pages"] for s in reported.values()) == 3
+    assert ocr_worker_stats()["workers"] == {}
@@ -0,0 +1,69 @@
+import asyncio
+import threading
+
+import services.parse_cache as parse_cache_module
+from services.parse_cache import DiskCache, MemoryLRUCache, TieredCache, cached_parse
+
+
+class RecordingDiskCache(DiskCache):
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.threads = []
+
+    def get(self, key):
+        self.threads.append(threading.get_ident())
+        return super().get(key)
+
+    def set(self, key, value):
+        self.threads.append(threading.get_ident())
+        return super().set(key, value)
+
+
+async def parse(source):
+    return {"rows": len(source)}
+
+
+def _run(source):
+
+    async def run():
+        return threading.get_ident(), await cached_parse(parse, source, parser="test", version="1")
+
+    return asyncio.run(run())
+
+
+def test_disk_tier_runs_off_the_event_loop(tmp_path, monkeypatch):
+    disk = RecordingDiskCache(str(tmp_path), 1024 * 1024)
+    monkeypatch.setattr(parse_cache_module, "parse_cache", TieredCache([MemoryLRUCache(1024), disk]))
+
+    loop_thread, first = _run(b"abc")
+
+    assert first == {"rows": 3}
+    assert disk.threads and loop_thread not in disk.threads
+    assert disk.stats()["entries"] == 1
+
+
+def test_memory_only_cache_stays_inline(monkeypatch):
+    monkeypatch.setattr(parse_cache_module, "parse_cache", TieredCache([MemoryLRUCache(1024)]))
+
+    assert not parse_cache_module.parse_cache.blocking
+    assert _run(b"abcd")[1] == {"rows": 4}
+    assert _run(b"abcd")[1] == {"rows": 4}
+    assert parse_cache_module.parse_cache.stats()["hits"] == 1
+
+
+def test_empty_results_are_not_cached(monkeypatch):
+    monkeypatch.setattr(parse_cache_module, "parse_cache", TieredCache([MemoryLRUCache(1024)]))
+    calls = []
+
+    async def parse_nothing(source):
+        calls.append(source)
+        return []
+
+    async def run():
+        return await cached_parse(parse_nothing, b"scan", parser="test", version="1")
+
+    assert asyncio.run(run()) == []
+    assert asyncio.run(run()) == []
+    assert len(calls) == 2
+    assert parse_cache_module.parse_cache.stats()["tiers"]["MemoryLRUCache"]["entries"] == 0
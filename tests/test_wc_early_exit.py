@@ -0,0 +1,194 @@
+from io import BytesIO
+
+import pandas as pd
+import pytest
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Table, TableStyle
+
+import services.wc_parser as wc_parser
+from services.wc_parser import EXTRACTION_TARGETS, parse_financial_file
+from services.wc_service import calculate_wc_logic
+
+
+# Rows hitting every required WC field the dictionary can produce
+TARGET_ROWS = [
+    ["Total current assets", 400000],
+    ["Total current liabilities", 250000],
+    ["Inventories", 125000],
+    ["Trade receivables", 80000],
+    ["Trade payables", 60000],
+    ["Cash and cash equivalents", 15000],
+    ["Short-term borrowings", 30000],
+    ["Revenue from operations", 900000],
+    ["Other income", 12000],
+    ["Other expenses", 610000],
+    ["Finance costs", 3200],
+    ["Depreciation and amortisation expense", 8000],
+]
+
+# Fields calculate_wc_logic reads that are not required fields
+SERVICE_ROWS = [
+    ["Cost of goods sold", 540000],
+    ["Other current assets", 4000],
+    ["Other current liabilities", 7000],
+]
+
+BALANCE_SHEET_ROWS = TARGET_ROWS[:7] + SERVICE_ROWS[1:]
+PNL_ROWS = TARGET_ROWS[7:] + SERVICE_ROWS[:1]
+
+# Dictionary row (loan_emi) that is no extraction target
+TRAILING_ROW = ["Loan repayment", 5000]
+
+
+def _csv(rows) -> bytes:
+    return pd.DataFrame(rows).to_csv(header=False, index=False).encode()
+
+
+def _xlsx(sheets: dict) -> bytes:
+    buf = BytesIO()
+    with pd.ExcelWriter(buf, engine="openpyxl") as writer:
+        for name, rows in sheets.items():
+            pd.DataFrame(rows).to_excel(writer, sheet_name=name, header=False, index=False)
+    return buf.getvalue()
+
+
+def _pdf(rows, notes) -> bytes:
+    """Balance sheet table on page 1, then one page per notes table or paragraph."""
+    styles = getSampleStyleSheet()
+    elements = [
+        Paragraph("Balance Sheet as at 31 March 2024 (Rs. in thousands)", styles["Normal"]),
+        Table([["Particulars", "2024"]] + rows, style=TableStyle([("GRID", (0, 0), (-1, -1), 0.5, "black")])),
+    ]
+    for n, note in enumerate(notes, start=1):
+        elements.append(PageBreak())
+        elements.append(Paragraph(f"Note {n} - Significant accounting policies", styles["Heading2"]))
+        if isinstance(note, str):
+            elements.extend(Paragraph(note, styles["Normal"]) for _ in range(20))
+        else:
+            elements.append(Table(note, style=TableStyle([("GRID", (0, 0), (-1, -1), 0.5, "black")])))
+
+    buf = BytesIO()
+    SimpleDocTemplate(buf, pagesize=A4, invariant=1).build(elements)
+    return buf.getvalue()
+
+
+def _parse_both(content: bytes, filename: str, monkeypatch):
+    early = parse_financial_file(content, filename)
+    monkeypatch.setattr(wc_parser, "WC_EARLY_EXIT", False)
+    full = parse_financial_file(content, filename)
+    return early, full
+
+
+def _rows_read(monkeypatch):
+    """Row texts parse_financial_table matches against the dictionary."""
+    seen = []
+    assign = wc_parser.assign_matches
+
+    def recording(result, row_text, value):
+        seen.append(row_text)
+        assign(result, row_text, value)
+
+    monkeypatch.setattr(wc_parser, "assign_matches", recording)
+    return seen
+
+
+def test_targets_cover_every_field_wc_service_reads():
+    for field in ("cogs", "other_current_assets", "other_current_liabilities"):
+        assert field in EXTRACTION_TARGETS
+
+
+def test_csv_keeps_non_target_row_after_last_target(monkeypatch):
+    early, full = _parse_both(_csv(TARGET_ROWS + SERVICE_ROWS), "tb.csv", monkeypatch)
+
+    assert early["inputs"]["cogs"] == 540000
+    assert early["inputs"] == full["inputs"]
+    assert calculate_wc_logic(early) == calculate_wc_logic(full)
+
+
+def test_excel_reads_second_sheet_with_only_non_target_fields(monkeypatch):
+    content = _xlsx({"Statements": TARGET_ROWS, "Schedules": SERVICE_ROWS})
+    early, full = _parse_both(content, "fs.xlsx", monkeypatch)
+
+    for field in ("cogs", "other_current_assets", "other_current_liabilities"):
+        assert field in early["inputs"]
+    assert early["inputs"] == full["inputs"]
+
+
+@pytest.mark.parametrize("filename", ["tb.csv", "fs.xlsx"])
+def test_early_exit_still_stops_once_everything_is_found(filename):
+    rows = TARGET_ROWS + SERVICE_ROWS + [["Inventories", 1]]
+    content = _csv(rows) if filename.endswith(".csv") else _xlsx({"Sheet1": rows})
+
+    result = parse_financial_file(content, filename)
+
+    assert result["inputs"]["inventory"] == 125000
+
+
+def test_targets_follow_the_statements_present():
+    assert wc_parser.targets_for(set()) == EXTRACTION_TARGETS
+    assert "annual_sales" not in wc_parser.targets_for({"balance_sheet"})
+    assert "inventory" not in wc_parser.targets_for({"pnl"})
+
+    # One stray P&L word does not make a balance sheet a P&L
+    assert wc_parser.statement_kinds({"inventory", "payables", "depreciation"}) == {"balance_sheet"}
+
+
+@pytest.mark.parametrize("rows", [BALANCE_SHEET_ROWS, PNL_ROWS], ids=["balance_sheet", "pnl"])
+def test_single_statement_csv_stops_after_its_own_targets(rows, monkeypatch):
+    content = _csv(rows + [TRAILING_ROW])
+    seen = _rows_read(monkeypatch)
+
+    early = parse_financial_file(content, "fs.csv")
+    assert "loan repayment 5000" not in seen
+
+    monkeypatch.setattr(wc_parser, "WC_EARLY_EXIT", False)
+    full = parse_financial_file(content, "fs.csv")
+    assert full["inputs"].pop("loan_emi") == 5000
+    assert early["inputs"] == full["inputs"]
+
+
+@pytest.mark.parametrize("rows", [BALANCE_SHEET_ROWS, PNL_ROWS], ids=["balance_sheet", "pnl"])
+def test_single_statement_excel_skips_other_sheets(rows, monkeypatch):
+    content = _xlsx({"Statement": rows, "Notes": [TRAILING_ROW]})
+    seen = _rows_read(monkeypatch)
+
+    early = parse_financial_file(content, "fs.xlsx")
+
+    assert "loan repayment 5000" not in seen
+    assert "loan_emi" not in early["inputs"]
+
+
+def test_combined_document_still_waits_for_both_statements(monkeypatch):
+    # Each statement on its own sheet
+    content = _xlsx({"BS": BALANCE_SHEET_ROWS, "PL": PNL_ROWS})
+    early, full = _parse_both(content, "fs.xlsx", monkeypatch)
+
+    assert early["inputs"]["annual_sales"] == 900000
+    assert early["inputs"] == full["inputs"]
+
+
+NOTE_TEXT = (
+    "Revenue from operations is recognised when control passes. Depreciation is "
+    "charged on a straight line basis. Interest income is accrued over time."
+)
+
+
+def test_balance_sheet_pdf_does_not_read_notes_pages(monkeypatch):
+    content = _pdf(BALANCE_SHEET_ROWS, [NOTE_TEXT] * 3)
+    early, full = _parse_both(content, "bs.pdf", monkeypatch)
+
+    assert early["skipped_pages"] == [2, 3, 4]
+    assert early["inputs"]["inventory"] == 125000 * 1000
+    assert early["inputs"] == full["inputs"]
+
+
+def test_pdf_falls_back_to_notes_when_statement_coverage_is_low(monkeypatch):
+    # Only the totals on the face; the breakdown sits in a note
+    content = _pdf(BALANCE_SHEET_ROWS[:2], [NOTE_TEXT, BALANCE_SHEET_ROWS[2:]])
+    early, full = _parse_both(content, "bs.pdf", monkeypatch)
+
+    # The note has no unit line; the narrative page is never needed
+    assert early["inputs"]["inventory"] == 125000
+    assert early["skipped_pages"] == [2]
+    assert early["inputs"] == full["inputs"]
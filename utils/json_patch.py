@@ -0,0 +1,210 @@
+import copy
+
+
+# ==========================================================
+# JSON PATCH (RFC 6902) AND MERGE PATCH (RFC 7396)
+# apply_patch takes either form: a list of operations is a
+# JSON Patch, an object is a Merge Patch. The input document
+# is never modified; a new document is returned.
+# ==========================================================
+
+class PatchError(ValueError):
+    """Malformed patch, or a path that does not exist."""
+
+
+class PatchTestFailed(PatchError):
+    """A JSON Patch "test" operation did not match."""
+
+
+# ==========================================================
+# MERGE PATCH
+# ==========================================================
+
+def merge_patch(target, patch):
+
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+
+    result = dict(target) if isinstance(target, dict) else {}
+
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = merge_patch(result.get(key), value)
+
+    return result
+
+
+# ==========================================================
+# JSON POINTER (RFC 6901)
+# ==========================================================
+
+def _tokens(pointer):
+
+    if not isinstance(pointer, str):
+        raise PatchError(f"Invalid path: {pointer!r}")
+
+    if pointer == "":
+        return []
+
+    if not pointer.startswith("/"):
+        raise PatchError(f"Invalid path: {pointer}")
+
+    return [t.replace("~1", "/").replace("~0", "~") for t in pointer[1:].split("/")]
+
+
+def _index(container, token, allow_end=False):
+
+    if allow_end and token == "-":
+        return len(container)
+
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise PatchError(f"Invalid array index: {token}")
+
+    i = int(token)
+    limit = len(container) + (1 if allow_end else 0)
+    if i >= limit:
+        raise PatchError(f"Array index out of range: {token}")
+
+    return i
+
+
+def _resolve(doc, tokens):
+
+    node = doc
+    for token in tokens:
+        if isinstance(node, dict):
+            if token not in node:
+                raise PatchError(f"Path not found: /{'/'.join(tokens)}")
+            node = node[token]
+        elif isinstance(node, list):
+            node = node[_index(node, token)]
+        else:
+            raise PatchError(f"Path not found: /{'/'.join(tokens)}")
+
+    return node
+
+
+# ==========================================================
+# OPERATIONS
+# Each takes the document and returns it, since an op on
+# the root path ("") replaces the whole document.
+# ==========================================================
+
+def _add(doc, tokens, value):
+
+    if not tokens:
+        return value
+
+    parent = _resolve(doc, tokens[:-1])
+    key = tokens[-1]
+
+    if isinstance(parent, dict):
+        parent[key] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, key, allow_end=True), value)
+    else:
+        raise PatchError(f"Cannot add to /{'/'.join(tokens)}")
+
+    return doc
+
+
+def _remove(doc, tokens):
+
+    if not tokens:
+        raise PatchError("Cannot remove the document root")
+
+    parent = _resolve(doc, tokens[:-1])
+    key = tokens[-1]
+
+    if isinstance(parent, dict):
+        if key not in parent:
+            raise PatchError(f"Path not found: /{'/'.join(tokens)}")
+        del parent[key]
+    elif isinstance(parent, list):
+        del parent[_index(parent, key)]
+    else:
+        raise PatchError(f"Path not found: /{'/'.join(tokens)}")
+
+    return doc
+
+
+def _replace(doc, tokens, value):
+
+    if not tokens:
+        return value
+
+    _resolve(doc, tokens)
+    parent = _resolve(doc, tokens[:-1])
+    key = tokens[-1]
+
+    if isinstance(parent, list):
+        parent[_index(parent, key)] = value
+    else:
+        parent[key] = value
+
+    return doc
+
+
+def apply_json_patch(doc, operations):
+
+    if not isinstance(operations, list):
+        raise PatchError("JSON Patch must be a list of operations")
+
+    doc = copy.deepcopy(doc)
+
+    for op in operations:
+        if not isinstance(op, dict) or "op" not in op or "path" not in op:
+            raise PatchError(f"Invalid operation: {op!r}")
+
+        name = op["op"]
+        tokens = _tokens(op["path"])
+
+        if name in ("add", "replace", "test") and "value" not in op:
+            raise PatchError(f"'{name}' needs a value")
+
+        if name in ("move", "copy") and "from" not in op:
+            raise PatchError(f"'{name}' needs a from path")
+
+        if name == "add":
+            doc = _add(doc, tokens, copy.deepcopy(op["value"]))
+
+        elif name == "remove":
+            doc = _remove(doc, tokens)
+
+        elif name == "replace":
+            doc = _replace(doc, tokens, copy.deepcopy(op["value"]))
+
+        elif name == "move":
+            source = _tokens(op["from"])
+            if tokens[:len(source)] == source and tokens != source:
+                raise PatchError("Cannot move a value into one of its children")
+            value = _resolve(doc, source)
+            doc = _remove(doc, source)
+            doc = _add(doc, tokens, value)
+
+        elif name == "copy":
+            value = copy.deepcopy(_resolve(doc, _tokens(op["from"])))
+            doc = _add(doc, tokens, value)
+
+        elif name == "test":
+            if _resolve(doc, tokens) != op["value"]:
+                raise PatchTestFailed(f"Test failed at {op['path']}")
+
+        else:
+            raise PatchError(f"Unknown operation: {name}")
+
+    return doc
+
+
+def apply_patch(doc, patch):
+    """List -> JSON Patch, object -> Merge Patch."""
+
+    if isinstance(patch, list):
+        return apply_json_patch(doc, patch)
+
+    if isinstance(patch, dict):
+        return merge_patch(doc, patch)
+
+    raise PatchError("Patch must be a JSON Patch list or a Merge Patch object")